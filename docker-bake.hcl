@@ -0,0 +1,162 @@
+# Generated by `make bake-file` from the image hierarchy, don't edit it manually
+
+variable "REGISTRY" {
+  default = "quay.io"
+}
+
+variable "OWNER" {
+  default = "jupyter"
+}
+
+variable "ROOT_IMAGE" {
+  default = "default_root_image"
+}
+
+variable "PYTHON_VERSION" {
+  default = "3.13"
+}
+
+group "default" {
+  targets = [
+    "docker-stacks-foundation",
+    "base-notebook",
+    "minimal-notebook",
+    "scipy-notebook",
+    "r-notebook",
+    "julia-notebook",
+    "tensorflow-notebook",
+    "pytorch-notebook",
+    "datascience-notebook",
+    "pyspark-notebook",
+    "all-spark-notebook",
+  ]
+}
+
+target "docker-stacks-foundation" {
+  context = "images/docker-stacks-foundation"
+  tags = ["${REGISTRY}/${OWNER}/docker-stacks-foundation"]
+  args = {
+    ROOT_IMAGE = "${ROOT_IMAGE}"
+    PYTHON_VERSION = "${PYTHON_VERSION}"
+  }
+}
+
+target "base-notebook" {
+  context = "images/base-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/docker-stacks-foundation" = "target:docker-stacks-foundation"
+  }
+  tags = ["${REGISTRY}/${OWNER}/base-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "minimal-notebook" {
+  context = "images/minimal-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/base-notebook" = "target:base-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/minimal-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "scipy-notebook" {
+  context = "images/scipy-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/minimal-notebook" = "target:minimal-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/scipy-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "r-notebook" {
+  context = "images/r-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/minimal-notebook" = "target:minimal-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/r-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "julia-notebook" {
+  context = "images/julia-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/minimal-notebook" = "target:minimal-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/julia-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "tensorflow-notebook" {
+  context = "images/tensorflow-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/scipy-notebook" = "target:scipy-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/tensorflow-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "pytorch-notebook" {
+  context = "images/pytorch-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/scipy-notebook" = "target:scipy-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/pytorch-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "datascience-notebook" {
+  context = "images/datascience-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/scipy-notebook" = "target:scipy-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/datascience-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "pyspark-notebook" {
+  context = "images/pyspark-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/scipy-notebook" = "target:scipy-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/pyspark-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
+
+target "all-spark-notebook" {
+  context = "images/all-spark-notebook"
+  contexts = {
+    "${REGISTRY}/${OWNER}/pyspark-notebook" = "target:pyspark-notebook"
+  }
+  tags = ["${REGISTRY}/${OWNER}/all-spark-notebook"]
+  args = {
+    REGISTRY = "${REGISTRY}"
+    OWNER = "${OWNER}"
+  }
+}
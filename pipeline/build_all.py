@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import functools
+import logging
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tabulate import tabulate
+
+from pipeline.build_cache import BuildCache, write_cache_report
+from pipeline.images_graph import get_build_memory_estimate, get_parent_image
+from pipeline.scheduler import Task, TaskResult, get_critical_path, run_tasks
+from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+from tagging.utils.buildkit_progress import (
+    BuildStep,
+    get_pull_duration,
+    parse_build_steps,
+)
+from tagging.utils.get_platform import get_platform
+from tagging.utils.get_prefix import DEFAULT_VARIANT
+from tagging.utils.git_helper import GitHelper
+from tagging.utils.telemetry import get_telemetry_path, record_telemetry
+
+LOGGER = logging.getLogger(__name__)
+
+IMAGES_DIR = Path(__file__).parent.parent.resolve() / "images"
+
+_OUTPUT_LOCK = threading.Lock()
+
+# Container CLIs which build with BuildKit and support its options, e.g. `--progress`,
+# unlike podman or Apple's container framework
+BUILDKIT_CLIS = ("docker", "buildx")
+
+
+def is_buildkit_cli(container_cli: str) -> bool:
+    return Path(container_cli).name in BUILDKIT_CLIS
+
+
+@dataclass(frozen=True)
+class BuildConfig:
+    registry: str
+    owner: str
+    container_cli: str = "docker"
+    # The same defaults as in the Makefile
+    root_image: str = "default_root_image"
+    python_version: str = "3.13"
+    build_options: list[str] = field(default_factory=list)
+    cache: BuildCache | None = None
+    # Where the build cache reports are written, usually the directory with the tags files
+    report_dir: Path | None = None
+    telemetry_dir: Path | None = None
+
+    def full_image(self, image: str) -> str:
+        return f"{self.registry}/{self.owner}/{image}"
+
+    @property
+    def buildkit(self) -> bool:
+        return is_buildkit_cli(self.container_cli)
+
+
+def run_prefixed(command: list[str], prefix: str) -> list[str]:
+    """Runs the command and streams its output, each line starts with the prefix,
+    so the output of the concurrent commands can be told apart.
+    Returns the output lines"""
+    output = []
+    with subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env={**os.environ, "DOCKER_BUILDKIT": "1"},
+    ) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            output.append(line)
+            with _OUTPUT_LOCK:
+                sys.stdout.write(f"[{prefix}] {line}")
+                sys.stdout.flush()
+    if process.returncode != 0:
+        raise RuntimeError(f"`{shlex.join(command)}` exited with {process.returncode}")
+    return output
+
+
+def get_build_command(config: BuildConfig, image: str, platform: str) -> list[str]:
+    """The same command as the `build/%` Makefile target,
+    with line-oriented progress if the CLI supports it"""
+    return [
+        config.container_cli,
+        "build",
+        *config.build_options,
+        *([] if config.cache is None else config.cache.build_options(image, platform)),
+        *(["--progress", "plain"] if config.buildkit else []),
+        "--tag",
+        config.full_image(image),
+        str(IMAGES_DIR / image),
+        "--build-arg",
+        f"REGISTRY={config.registry}",
+        "--build-arg",
+        f"OWNER={config.owner}",
+        "--build-arg",
+        f"ROOT_IMAGE={config.root_image}",
+        "--build-arg",
+        f"PYTHON_VERSION={config.python_version}",
+    ]
+
+
+def record_image_telemetry(
+    config: BuildConfig,
+    image: str,
+    *,
+    phases: dict[str, float],
+    steps: list[BuildStep] | None = None,
+) -> None:
+    if config.telemetry_dir is None:
+        return
+    platform = get_platform()
+    record_telemetry(
+        get_telemetry_path(
+            config.telemetry_dir,
+            platform=platform,
+            variant=DEFAULT_VARIANT,
+            image=image,
+            commit_hash_tag=GitHelper.commit_hash_tag(),
+        ),
+        image=image,
+        platform=platform,
+        variant=DEFAULT_VARIANT,
+        phases=phases,
+        steps=steps,
+    )
+
+
+def build_image(config: BuildConfig, image: str) -> None:
+    platform = get_platform()
+    if config.cache is not None:
+        config.cache.prepare(image, platform)
+    start = time.monotonic()
+    output = run_prefixed(
+        get_build_command(config, image, platform), prefix=f"build/{image}"
+    )
+    elapsed = time.monotonic() - start
+    if config.cache is not None:
+        config.cache.finalize(image, platform)
+    if config.report_dir is not None:
+        write_cache_report(config.report_dir, image, output, platform=platform)
+    steps = parse_build_steps(output)
+    record_image_telemetry(
+        config,
+        image,
+        phases={"pull": get_pull_duration(steps), "build": elapsed},
+        steps=steps,
+    )
+
+
+def get_build_tasks(config: BuildConfig, images: list[str]) -> list[Task]:
+    tasks = []
+    for image in images:
+        parent_image = get_parent_image(image, images)
+        tasks.append(
+            Task(
+                name=image,
+                run=functools.partial(build_image, config, image),
+                dependencies=[] if parent_image is None else [parent_image],
+                memory=get_build_memory_estimate(image),
+            )
+        )
+    return tasks
+
+
+def format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}m {seconds:04.1f}s"
+
+
+def format_summary(tasks: list[Task], results: dict[str, TaskResult]) -> str:
+    table = tabulate(
+        [
+            [
+                task.name,
+                results[task.name].status,
+                format_seconds(results[task.name].waited),
+                format_seconds(results[task.name].duration),
+                format_seconds(results[task.name].finished_at),
+            ]
+            for task in tasks
+        ],
+        headers=["Task", "Status", "Waited", "Duration", "Finished at"],
+        tablefmt="github",
+    )
+    critical_path = get_critical_path(tasks, results)
+    finished_at = [
+        result.finished_at
+        for result in results.values()
+        if result.finished_at is not None
+    ]
+    wall_time = max(finished_at, default=0.0)
+    serial_time = sum(
+        result.duration for result in results.values() if result.duration is not None
+    )
+    critical_time = sum(results[name].duration or 0.0 for name in critical_path)
+    return "\n".join(
+        [
+            table,
+            "",
+            f"Critical path: {' -> '.join(critical_path)}",
+            f"Critical path time: {format_seconds(critical_time)}",
+            f"Wall-clock time: {format_seconds(wall_time)}",
+            f"Sum of task times: {format_seconds(serial_time)}",
+        ]
+    )
+
+
+def get_default_memory_budget() -> float | None:
+    """Physical memory of the machine in GB, if it can be determined"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 10**9
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def add_build_arguments(arg_parser: argparse.ArgumentParser) -> None:
+    arg_parser.add_argument(
+        "--container-cli",
+        default="docker",
+        help="Container engine to build the images with",
+    )
+    arg_parser.add_argument(
+        "--root-image",
+        default="default_root_image",
+        help="Root image of docker-stacks-foundation",
+    )
+    arg_parser.add_argument(
+        "--python-version",
+        default="3.13",
+        help="Python version of docker-stacks-foundation",
+    )
+    arg_parser.add_argument(
+        "--build-options",
+        default="",
+        help="Additional options passed to the build command",
+    )
+    cache_group = arg_parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--build-cache-dir",
+        help="Directory to export the build cache to and import it from",
+    )
+    cache_group.add_argument(
+        "--build-cache-registry",
+        help="Registry with the owner to export the build cache to and import it from, "
+        "for example, localhost:5000/jupyter",
+    )
+
+
+def get_build_config(
+    args: argparse.Namespace, report_dir: Path | None, telemetry_dir: Path | None
+) -> BuildConfig:
+    cache = None
+    if args.build_cache_dir:
+        cache = BuildCache(kind="local", location=args.build_cache_dir)
+    elif args.build_cache_registry:
+        cache = BuildCache(kind="registry", location=args.build_cache_registry)
+    if cache is not None and not is_buildkit_cli(args.container_cli):
+        LOGGER.warning(
+            f"Container CLI: {args.container_cli} doesn't support the BuildKit cache, "
+            "building without it"
+        )
+        cache = None
+    return BuildConfig(
+        registry=args.registry,
+        owner=args.owner,
+        container_cli=args.container_cli,
+        root_image=args.root_image,
+        python_version=args.python_version,
+        build_options=shlex.split(args.build_options),
+        cache=cache,
+        report_dir=report_dir,
+        telemetry_dir=telemetry_dir,
+    )
+
+
+def build_all(
+    config: BuildConfig,
+    images: list[str],
+    *,
+    jobs: int,
+    memory_budget: float | None,
+) -> bool:
+    """Builds each image as soon as its parent is built.
+    Returns whether all the images were built"""
+    LOGGER.info(
+        f"Building images: {images} with jobs: {jobs}, memory budget: {memory_budget}GB"
+    )
+    tasks = get_build_tasks(config, images)
+    results = run_tasks(tasks, jobs=jobs, memory_budget=memory_budget)
+    print(format_summary(tasks, results))
+    return all(result.status == "succeeded" for result in results.values())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--registry",
+        required=True,
+        choices=["docker.io", "quay.io"],
+        help="Image registry",
+    )
+    arg_parser.add_argument(
+        "--owner",
+        required=True,
+        help="Owner of the image",
+    )
+    arg_parser.add_argument(
+        "--image",
+        dest="images",
+        action="append",
+        choices=ALL_IMAGES,
+        help="Image to build, can be repeated, all the images are built by default. "
+        "Parents which are not listed are expected to exist already",
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Maximum number of builds running at the same time",
+    )
+    arg_parser.add_argument(
+        "--memory-budget",
+        type=float,
+        default=get_default_memory_budget(),
+        help="Memory in GB the concurrent builds have to fit into, "
+        "the physical memory by default",
+    )
+    add_build_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--report-dir",
+        type=Path,
+        help="Directory to write the build cache reports to",
+    )
+    arg_parser.add_argument(
+        "--telemetry-dir",
+        type=Path,
+        help="Directory to write the build telemetry files to",
+    )
+    args = arg_parser.parse_args()
+
+    config = get_build_config(
+        args, report_dir=args.report_dir, telemetry_dir=args.telemetry_dir
+    )
+    # Builds are listed in the order of the hierarchy
+    images = [image for image in ALL_IMAGES if not args.images or image in args.images]
+    if not build_all(config, images, jobs=args.jobs, memory_budget=args.memory_budget):
+        sys.exit(1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import dataclasses
+import datetime
+import json
+import logging
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from tagging.utils.buildkit_progress import parse_build_steps
+from tagging.utils.get_platform import get_platform
+from tagging.utils.get_prefix import get_file_prefix_for_platform
+from tagging.utils.git_helper import GitHelper
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BuildCache:
+    """BuildKit cache exported after each build and imported by the next one.
+    Exporting the cache needs a builder with the `docker-container` driver
+    or the containerd image store"""
+
+    kind: Literal["local", "registry"]
+    # Directory for the local cache, registry host with the owner for the registry cache,
+    # for example, `localhost:5000/jupyter`
+    location: str
+
+    def local_dir(self, image: str, platform: str) -> Path:
+        return Path(self.location) / platform / image
+
+    def registry_ref(self, image: str, platform: str) -> str:
+        return f"{self.location}/{image}:buildcache-{platform}"
+
+    def build_options(self, image: str, platform: str) -> list[str]:
+        if self.kind == "registry":
+            ref = self.registry_ref(image, platform)
+            return [
+                "--cache-from",
+                f"type=registry,ref={ref}",
+                "--cache-to",
+                f"type=registry,ref={ref},mode=max",
+            ]
+
+        cache_dir = self.local_dir(image, platform)
+        options = []
+        if (cache_dir / "index.json").exists():
+            options += ["--cache-from", f"type=local,src={cache_dir}"]
+        # The local cache isn't garbage collected, so it's written anew and replaces the old one
+        options += ["--cache-to", f"type=local,dest={cache_dir}-new,mode=max"]
+        return options
+
+    def prepare(self, image: str, platform: str) -> None:
+        """Removes the cache left behind by a failed build,
+        otherwise the new cache would be written on top of it and keep its old blobs"""
+        if self.kind != "local":
+            return
+        cache_dir = self.local_dir(image, platform)
+        shutil.rmtree(cache_dir.with_name(f"{cache_dir.name}-new"), ignore_errors=True)
+
+    def finalize(self, image: str, platform: str) -> None:
+        """Replaces the old local cache with the exported one"""
+        if self.kind != "local":
+            return
+        cache_dir = self.local_dir(image, platform)
+        new_cache_dir = cache_dir.with_name(f"{cache_dir.name}-new")
+        if not new_cache_dir.exists():
+            LOGGER.warning(f"Build cache wasn't exported to: {new_cache_dir}")
+            return
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        new_cache_dir.rename(cache_dir)
+        LOGGER.info(f"Build cache of image: {image} saved to: {cache_dir}")
+
+
+def get_cache_report(
+    image: str, platform: str, build_output: list[str]
+) -> dict[str, Any]:
+    steps = parse_build_steps(build_output)
+    cached_steps = sum(step.cached for step in steps)
+    return {
+        "image": image,
+        "platform": platform,
+        "build_timestamp": datetime.datetime.now(datetime.UTC)
+        .isoformat(timespec="seconds")
+        .replace("+00:00", "Z"),
+        "commit_hash": GitHelper.commit_hash(),
+        "cached_steps": cached_steps,
+        "total_steps": len(steps),
+        "hit_rate": round(cached_steps / len(steps), 3) if steps else None,
+        "uncached_duration": round(
+            sum(step.duration or 0.0 for step in steps if not step.cached), 1
+        ),
+        "steps": [dataclasses.asdict(step) for step in steps],
+    }
+
+
+def write_cache_report(
+    tags_dir: Path,
+    image: str,
+    build_output: list[str],
+    *,
+    platform: str | None = None,
+    variant: str = "default",
+) -> Path:
+    """The report is saved next to the tags file of the image"""
+    platform = platform or get_platform()
+    report = get_cache_report(image, platform, build_output)
+    file_prefix = get_file_prefix_for_platform(platform=platform, variant=variant)
+    path = tags_dir / f"{file_prefix}-{image}-build-cache.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    LOGGER.info(
+        f"Build cache of image: {image}, cached steps: "
+        f"{report['cached_steps']}/{report['total_steps']}, "
+        f"uncached duration: {report['uncached_duration']}s, report: {path}"
+    )
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser(
+        description="Writes the build cache report from a saved `--progress plain` output"
+    )
+    arg_parser.add_argument(
+        "build_log",
+        type=Path,
+        help="File with the build output",
+    )
+    arg_parser.add_argument(
+        "--image",
+        required=True,
+        help="Short image name",
+    )
+    arg_parser.add_argument(
+        "--tags-dir",
+        required=True,
+        type=Path,
+        help="Directory with the tags files, the report is saved there",
+    )
+    arg_parser.add_argument(
+        "--variant",
+        default="default",
+        help="Variant tag prefix",
+    )
+    args = arg_parser.parse_args()
+
+    write_cache_report(
+        args.tags_dir,
+        args.image,
+        args.build_log.read_text().splitlines(),
+        variant=args.variant,
+    )
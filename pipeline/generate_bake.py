@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import logging
+import re
+from pathlib import Path
+
+from pipeline.build_all import IMAGES_DIR
+from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+
+LOGGER = logging.getLogger(__name__)
+
+REPOSITORY_ROOT = IMAGES_DIR.parent
+BAKE_FILE = REPOSITORY_ROOT / "docker-bake.hcl"
+
+# The build arguments of the `build/%` Makefile target, with their defaults
+BAKE_VARIABLES = {
+    "REGISTRY": "quay.io",
+    "OWNER": "jupyter",
+    "ROOT_IMAGE": "default_root_image",
+    "PYTHON_VERSION": "3.13",
+}
+# For example, `ARG BASE_IMAGE=$REGISTRY/$OWNER/scipy-notebook`
+DOCKERFILE_ARG = re.compile(r"^ARG (\w+)(?:=(\S*))?", re.MULTILINE)
+
+
+def get_dockerfile_args(image: str) -> dict[str, str]:
+    dockerfile = (IMAGES_DIR / image / "Dockerfile").read_text()
+    return {match[1]: match[2] or "" for match in DOCKERFILE_ARG.finditer(dockerfile)}
+
+
+def image_ref(image: str) -> str:
+    return f"${{REGISTRY}}/${{OWNER}}/{image}"
+
+
+def get_target(image: str) -> str:
+    dockerfile_args = get_dockerfile_args(image)
+    parent_image = ALL_IMAGES[image].parent_image
+    lines = [
+        f'target "{image}" {{',
+        f'  context = "images/{image}"',
+    ]
+    if parent_image is not None:
+        base_image = dockerfile_args.get("BASE_IMAGE")
+        assert (
+            base_image == f"$REGISTRY/$OWNER/{parent_image}"
+        ), f"Unexpected base image of: {image}: {base_image}"
+        # The parent is consumed from its target, and not pulled from the registry
+        lines += [
+            "  contexts = {",
+            f'    "{image_ref(parent_image)}" = "target:{parent_image}"',
+            "  }",
+        ]
+    lines += [
+        f'  tags = ["{image_ref(image)}"]',
+        "  args = {",
+        *(
+            f'    {variable} = "${{{variable}}}"'
+            for variable in BAKE_VARIABLES
+            if variable in dockerfile_args
+        ),
+        "  }",
+        "}",
+    ]
+    return "\n".join(lines)
+
+
+def generate_bake_file() -> str:
+    variables = [
+        f'variable "{variable}" {{\n  default = "{default}"\n}}'
+        for variable, default in BAKE_VARIABLES.items()
+    ]
+    targets = ",\n".join(f'    "{image}"' for image in ALL_IMAGES)
+    group = f'group "default" {{\n  targets = [\n{targets},\n  ]\n}}'
+    return (
+        "\n\n".join(
+            [
+                "# Generated by `make bake-file` from the image hierarchy, don't edit it manually",
+                *variables,
+                group,
+                *(get_target(image) for image in ALL_IMAGES),
+            ]
+        )
+        + "\n"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--output",
+        type=Path,
+        default=BAKE_FILE,
+        help="Bake file to write",
+    )
+    arg_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check that the bake file is up to date",
+    )
+    args = arg_parser.parse_args()
+
+    bake_file = generate_bake_file()
+    if args.check:
+        assert (
+            args.output.read_text() == bake_file
+        ), f"{args.output} is outdated, run `make bake-file`"
+    else:
+        LOGGER.info(f"Writing bake file: {args.output}")
+        args.output.write_text(bake_file)
@@ -0,0 +1,47 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+
+# Rough peak memory of an image build in GB, dominated by the `mamba install` solves.
+# These are estimates and they only need to be good enough to avoid swapping
+BUILD_MEMORY_ESTIMATES = {
+    "docker-stacks-foundation": 1.0,
+    "base-notebook": 1.5,
+    "minimal-notebook": 1.0,
+    "scipy-notebook": 4.0,
+    "r-notebook": 3.0,
+    "julia-notebook": 3.0,
+    "tensorflow-notebook": 5.0,
+    "pytorch-notebook": 5.0,
+    "datascience-notebook": 5.0,
+    "pyspark-notebook": 2.0,
+    "all-spark-notebook": 3.0,
+}
+DEFAULT_BUILD_MEMORY_ESTIMATE = 2.0
+
+
+def get_parent_image(image: str, images: list[str]) -> str | None:
+    """Parent of the image, if the parent is one of the images being processed.
+    Otherwise, the parent is expected to exist locally or in the registry"""
+    parent_image = ALL_IMAGES[image].parent_image
+    return parent_image if parent_image in images else None
+
+
+def get_children(image: str) -> list[str]:
+    return [
+        child
+        for child, description in ALL_IMAGES.items()
+        if description.parent_image == image
+    ]
+
+
+def get_descendants(image: str) -> list[str]:
+    descendants = []
+    for child in get_children(image):
+        descendants.append(child)
+        descendants += get_descendants(child)
+    return descendants
+
+
+def get_build_memory_estimate(image: str) -> float:
+    return BUILD_MEMORY_ESTIMATES.get(image, DEFAULT_BUILD_MEMORY_ESTIMATE)
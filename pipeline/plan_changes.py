@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import dataclasses
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+
+import docker
+
+from pipeline.images_graph import get_descendants
+from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+from tagging.utils.get_manifest_digest import get_manifest_digest
+from tagging.utils.git_helper import GitHelper
+from tests.hierarchy.get_test_dirs import IMAGE_SPECIFIC_TESTS_DIR, get_test_dirs
+
+LOGGER = logging.getLogger(__name__)
+
+# Changes in these paths might affect how every image is built
+SHARED_BUILD_PATHS = ("Makefile", ".github/", "pipeline/", "requirements-dev.txt")
+# Changes in these paths might affect how every image is tested and tagged
+SHARED_TEST_PATHS = ("tagging/", "tests/")
+# Documentation doesn't affect the images
+IGNORED_FILENAMES = ("README.md",)
+
+
+@dataclass(frozen=True)
+class ChangePlan:
+    changed_files: list[str]
+    # Images are listed in the order of the hierarchy
+    build: list[str]
+    test: list[str]
+    # Unchanged images, the previous build is used for them
+    retag: list[str]
+
+    def make_targets(self) -> list[str]:
+        return [f"build/{image}" for image in self.build] + [
+            f"test/{image}" for image in self.test
+        ]
+
+
+def _image_dir_name(path: PurePosixPath, root: str) -> str | None:
+    """For `<root>/<image>/...` paths returns the image"""
+    parts = path.parts
+    root_parts = PurePosixPath(root).parts
+    if len(parts) > len(root_parts) + 1 and parts[: len(root_parts)] == root_parts:
+        image = parts[len(root_parts)]
+        return image if image in ALL_IMAGES else None
+    return None
+
+
+def plan_changes(changed_files: list[str]) -> ChangePlan:
+    """An image is rebuilt if its directory changed, and it is tested
+    if it's rebuilt or any of its test dirs changed.
+    Descendants are affected by the changes of their ancestors"""
+    changed_images: set[str] = set()
+    changed_test_dirs: set[str] = set()
+    rebuild_all = retest_all = False
+
+    for changed_file in changed_files:
+        path = PurePosixPath(changed_file)
+        if path.name in IGNORED_FILENAMES:
+            continue
+        if image := _image_dir_name(path, "images"):
+            changed_images.add(image)
+        elif image := _image_dir_name(path, "tests/by_image"):
+            changed_test_dirs.add(image)
+        elif changed_file.startswith(SHARED_BUILD_PATHS):
+            LOGGER.info(f"Shared file changed: {changed_file}, all images are affected")
+            rebuild_all = True
+        elif changed_file.startswith(SHARED_TEST_PATHS):
+            LOGGER.info(f"Shared test file changed: {changed_file}")
+            retest_all = True
+
+    build = set(ALL_IMAGES) if rebuild_all else set(changed_images)
+    for image in changed_images:
+        build.update(get_descendants(image))
+
+    test = set(ALL_IMAGES) if retest_all else set(build)
+    for image in ALL_IMAGES:
+        if any(
+            test_dir.relative_to(IMAGE_SPECIFIC_TESTS_DIR).parts[0] in changed_test_dirs
+            for test_dir in get_test_dirs(image)
+        ):
+            test.add(image)
+
+    return ChangePlan(
+        changed_files=changed_files,
+        build=[image for image in ALL_IMAGES if image in build],
+        test=[image for image in ALL_IMAGES if image in test],
+        retag=[image for image in ALL_IMAGES if image not in build],
+    )
+
+
+def retag_unchanged(registry: str, owner: str, plan: ChangePlan) -> dict[str, str]:
+    """Pulls the previous build of each unchanged image by its digest
+    and tags it as if it was built locally, so children and tests use exactly that build.
+    Returns the digest references used"""
+    docker_client = docker.from_env()
+    digest_refs = {}
+    for image in plan.retag:
+        full_image = f"{registry}/{owner}/{image}"
+        digest = get_manifest_digest(f"{full_image}:latest")
+        LOGGER.info(f"Retagging: {full_image} from digest: {digest}")
+        pulled_image = docker_client.images.pull(full_image, tag=digest)
+        pulled_image.tag(full_image, "latest")
+        digest_refs[image] = f"{full_image}@{digest}"
+    return digest_refs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--base-ref",
+        default="origin/main",
+        help="Git ref the changes are calculated against",
+    )
+    arg_parser.add_argument(
+        "--changed-file",
+        dest="changed_files",
+        action="append",
+        help="Changed file, can be repeated, overrides the git diff against the base ref",
+    )
+    arg_parser.add_argument(
+        "--format",
+        choices=["json", "make"],
+        default="json",
+        help="Print the plan as JSON or as a list of Makefile targets",
+    )
+    arg_parser.add_argument(
+        "--retag",
+        action="store_true",
+        help="Pull and tag the previous builds of the unchanged images",
+    )
+    arg_parser.add_argument(
+        "--registry",
+        default="quay.io",
+        choices=["docker.io", "quay.io"],
+        help="Image registry, used with --retag",
+    )
+    arg_parser.add_argument(
+        "--owner",
+        default="jupyter",
+        help="Owner of the image, used with --retag",
+    )
+    args = arg_parser.parse_args()
+
+    changed_files = args.changed_files or GitHelper.changed_files(args.base_ref)
+    plan = plan_changes(changed_files)
+    LOGGER.info(f"Images to build: {plan.build}, to test: {plan.test}")
+    if args.format == "make":
+        print(" ".join(plan.make_targets()))
+    else:
+        print(json.dumps(dataclasses.asdict(plan), indent=2))
+
+    if args.retag:
+        retag_unchanged(args.registry, args.owner, plan)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import functools
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from pipeline.build_all import (
+    BuildConfig,
+    add_build_arguments,
+    build_image,
+    format_summary,
+    get_build_config,
+    get_default_memory_budget,
+    record_image_telemetry,
+    run_prefixed,
+)
+from pipeline.images_graph import get_build_memory_estimate, get_parent_image
+from pipeline.scheduler import Task, run_tasks
+from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+
+LOGGER = logging.getLogger(__name__)
+
+# Tests start containers, while the hooks mostly wait for the docker daemon
+TEST_MEMORY_ESTIMATE = 2.0
+HOOK_MEMORY_ESTIMATE = 1.0
+
+
+@dataclass(frozen=True)
+class HookConfig:
+    """Arguments of the `hook/%` Makefile target"""
+
+    output_dir: Path
+    repository: str
+    variant: str = "default"
+    cache_dir: Path | None = None
+
+
+def test_image(config: BuildConfig, image: str) -> None:
+    command = [
+        sys.executable,
+        "-m",
+        "tests.run_tests",
+        "--registry",
+        config.registry,
+        "--owner",
+        config.owner,
+        "--image",
+        image,
+    ]
+    start = time.monotonic()
+    run_prefixed(command, prefix=f"test/{image}")
+    record_image_telemetry(config, image, phases={"test": time.monotonic() - start})
+
+
+def run_hooks(config: BuildConfig, hook_config: HookConfig, image: str) -> None:
+    command = [
+        sys.executable,
+        "-m",
+        "tagging.apps.post_build",
+        "--registry",
+        config.registry,
+        "--owner",
+        config.owner,
+        "--image",
+        image,
+        "--variant",
+        hook_config.variant,
+        "--tags-dir",
+        str(hook_config.output_dir / "tags"),
+        "--hist-lines-dir",
+        str(hook_config.output_dir / "hist_lines"),
+        "--manifests-dir",
+        str(hook_config.output_dir / "manifests"),
+        "--repository",
+        hook_config.repository,
+    ]
+    if hook_config.cache_dir is not None:
+        command += ["--cache-dir", str(hook_config.cache_dir)]
+    if config.telemetry_dir is not None:
+        command += ["--telemetry-dir", str(config.telemetry_dir)]
+    run_prefixed(command, prefix=f"hook/{image}")
+
+
+def get_pipeline_tasks(
+    config: BuildConfig, hook_config: HookConfig | None, images: list[str]
+) -> list[Task]:
+    """Tasks named after the Makefile targets: `build/<image>`, `test/<image>` and `hook/<image>`.
+    The children are built right after their parent is built, without waiting for its tests.
+    If the tests of an image fail, everything of its children, which hasn't started yet, is skipped
+    """
+    tasks = []
+    for image in images:
+        parent_image = get_parent_image(image, images)
+        parent_build = [] if parent_image is None else [f"build/{parent_image}"]
+        parent_test = [] if parent_image is None else [f"test/{parent_image}"]
+        tasks += [
+            Task(
+                name=f"build/{image}",
+                run=functools.partial(build_image, config, image),
+                dependencies=parent_build,
+                blocked_by=parent_test,
+                memory=get_build_memory_estimate(image),
+            ),
+            Task(
+                name=f"test/{image}",
+                run=functools.partial(test_image, config, image),
+                dependencies=[f"build/{image}"],
+                blocked_by=parent_test,
+                memory=TEST_MEMORY_ESTIMATE,
+            ),
+        ]
+        if hook_config is not None:
+            tasks.append(
+                Task(
+                    name=f"hook/{image}",
+                    run=functools.partial(run_hooks, config, hook_config, image),
+                    dependencies=[f"test/{image}"],
+                    memory=HOOK_MEMORY_ESTIMATE,
+                )
+            )
+    return tasks
+
+
+def run_pipeline(
+    config: BuildConfig,
+    hook_config: HookConfig | None,
+    images: list[str],
+    *,
+    jobs: int,
+    memory_budget: float | None,
+) -> bool:
+    """Builds, tests and runs the post-build hooks of each image as soon as possible.
+    Returns whether all the tasks succeeded"""
+    LOGGER.info(
+        f"Running pipeline for images: {images} with jobs: {jobs}, "
+        f"memory budget: {memory_budget}GB"
+    )
+    tasks = get_pipeline_tasks(config, hook_config, images)
+    results = run_tasks(tasks, jobs=jobs, memory_budget=memory_budget)
+    print(format_summary(tasks, results))
+    return all(result.status == "succeeded" for result in results.values())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--registry",
+        required=True,
+        choices=["docker.io", "quay.io"],
+        help="Image registry",
+    )
+    arg_parser.add_argument(
+        "--owner",
+        required=True,
+        help="Owner of the image",
+    )
+    arg_parser.add_argument(
+        "--image",
+        dest="images",
+        action="append",
+        choices=ALL_IMAGES,
+        help="Image to process, can be repeated, all the images are processed by default. "
+        "Parents which are not listed are expected to exist already",
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Maximum number of tasks running at the same time",
+    )
+    arg_parser.add_argument(
+        "--memory-budget",
+        type=float,
+        default=get_default_memory_budget(),
+        help="Memory in GB the concurrent tasks have to fit into, "
+        "the physical memory by default",
+    )
+    add_build_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--no-hooks",
+        action="store_true",
+        help="Only build and test the images",
+    )
+    arg_parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("/tmp/jupyter"),
+        help="Directory for the tags, history lines, manifests and telemetry of the hooks",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Directory to cache the tags and manifest pieces calculated by the hooks in, "
+        "nothing is cached by default",
+    )
+    arg_parser.add_argument(
+        "--repository",
+        help="Repository name on GitHub, <owner>/docker-stacks by default",
+    )
+    arg_parser.add_argument(
+        "--variant",
+        default="default",
+        help="Variant tag prefix",
+    )
+    args = arg_parser.parse_args()
+
+    # Build cache reports are written next to the tags files
+    config = get_build_config(
+        args,
+        report_dir=args.output_dir / "tags",
+        telemetry_dir=args.output_dir / "telemetry",
+    )
+    hook_config = (
+        None
+        if args.no_hooks
+        else HookConfig(
+            output_dir=args.output_dir,
+            repository=args.repository or f"{args.owner}/docker-stacks",
+            variant=args.variant,
+            cache_dir=args.cache_dir,
+        )
+    )
+    images = [image for image in ALL_IMAGES if not args.images or image in args.images]
+    if not run_pipeline(
+        config,
+        hook_config,
+        images,
+        jobs=args.jobs,
+        memory_budget=args.memory_budget,
+    ):
+        sys.exit(1)
@@ -0,0 +1,166 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import functools
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Literal
+
+LOGGER = logging.getLogger(__name__)
+
+TaskStatus = Literal["pending", "running", "succeeded", "failed", "skipped"]
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    run: Callable[[], None]
+    dependencies: list[str] = field(default_factory=list)
+    # Tasks which don't have to finish before this one starts,
+    # but if any of them fails, this task is skipped, when it hasn't started yet
+    blocked_by: list[str] = field(default_factory=list)
+    # In GB, the tasks which run at the same time have to fit into the memory budget
+    memory: float = 0.0
+
+
+@dataclass
+class TaskResult:
+    name: str
+    status: TaskStatus = "pending"
+    # Seconds since the start of the run
+    ready_at: float | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def waited(self) -> float | None:
+        """Time spent waiting for a free slot after the dependencies finished"""
+        if self.ready_at is None or self.started_at is None:
+            return None
+        return self.started_at - self.ready_at
+
+
+def _get_dependents(
+    tasks: dict[str, Task], *, include_blocked: bool = False
+) -> dict[str, list[str]]:
+    dependents: dict[str, list[str]] = {name: [] for name in tasks}
+    for task in tasks.values():
+        dependencies = task.dependencies
+        if include_blocked:
+            dependencies = dependencies + task.blocked_by
+        for dependency in dependencies:
+            assert dependency in tasks, f"Unknown dependency: {dependency}"
+            dependents[dependency].append(task.name)
+    return dependents
+
+
+def _get_priorities(tasks: dict[str, Task]) -> dict[str, int]:
+    """The number of tasks on the longest chain starting with the task.
+    Starting long chains first shortens the total time, and a task always
+    has a higher priority than the tasks depending on it"""
+    dependents = _get_dependents(tasks)
+
+    @functools.cache
+    def chain_length(name: str) -> int:
+        return 1 + max((chain_length(child) for child in dependents[name]), default=0)
+
+    return {name: chain_length(name) for name in tasks}
+
+
+def run_tasks(
+    tasks: list[Task], *, jobs: int, memory_budget: float | None = None
+) -> dict[str, TaskResult]:
+    """Runs each task as soon as all its dependencies succeed.
+    At most `jobs` tasks run at the same time, and their memory has to fit into the budget,
+    except a single task, which always runs, even if it doesn't fit.
+    When a task fails, all the tasks depending on it or blocked by it are skipped"""
+    by_name = {task.name: task for task in tasks}
+    dependents = _get_dependents(by_name, include_blocked=True)
+    priorities = _get_priorities(by_name)
+    results = {name: TaskResult(name) for name in by_name}
+    pending = sorted(by_name, key=lambda name: -priorities[name])
+    running: dict[Future[None], str] = {}
+    start = time.monotonic()
+
+    def skip_dependents(name: str) -> None:
+        for dependent in dependents[name]:
+            if results[dependent].status == "pending":
+                LOGGER.warning(f"Skipping: {dependent}, because {name} didn't succeed")
+                results[dependent].status = "skipped"
+                pending.remove(dependent)
+                skip_dependents(dependent)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            now = time.monotonic() - start
+            used_memory = sum(by_name[name].memory for name in running.values())
+            for name in list(pending):
+                task = by_name[name]
+                if any(
+                    results[dependency].status != "succeeded"
+                    for dependency in task.dependencies
+                ):
+                    continue
+                result = results[name]
+                if result.ready_at is None:
+                    result.ready_at = now
+                if len(running) >= jobs:
+                    continue
+                if (
+                    running
+                    and memory_budget is not None
+                    and used_memory + task.memory > memory_budget
+                ):
+                    # Smaller tasks might still fit
+                    continue
+
+                LOGGER.info(f"Starting: {name}")
+                pending.remove(name)
+                result.status = "running"
+                result.started_at = now
+                used_memory += task.memory
+                running[executor.submit(task.run)] = name
+
+            assert running, f"Tasks can't be started: {pending}"
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = results[name]
+                result.finished_at = time.monotonic() - start
+                exception = future.exception()
+                if exception is None:
+                    LOGGER.info(f"Finished: {name} in {result.duration:.1f}s")
+                    result.status = "succeeded"
+                else:
+                    LOGGER.error(f"Failed: {name}: {exception}")
+                    result.status = "failed"
+                    result.error = str(exception)
+                    skip_dependents(name)
+
+    return results
+
+
+def get_critical_path(tasks: list[Task], results: dict[str, TaskResult]) -> list[str]:
+    """The chain of tasks which determined the total time:
+    starting from the last finished task, each step goes to its latest finished dependency
+    """
+    by_name = {task.name: task for task in tasks}
+    finished = [result for result in results.values() if result.finished_at is not None]
+    if not finished:
+        return []
+
+    current = max(finished, key=lambda result: result.finished_at or 0.0).name
+    path = [current]
+    while dependencies := by_name[current].dependencies:
+        current = max(dependencies, key=lambda name: results[name].finished_at or 0.0)
+        path.append(current)
+    return path[::-1]
@@ -0,0 +1,72 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import pytest  # type: ignore
+
+from pipeline.plan_changes import plan_changes
+from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+
+SCIPY_AND_DESCENDANTS = [
+    "scipy-notebook",
+    "tensorflow-notebook",
+    "pytorch-notebook",
+    "datascience-notebook",
+    "pyspark-notebook",
+    "all-spark-notebook",
+]
+BASE_AND_DESCENDANTS = [
+    "base-notebook",
+    "minimal-notebook",
+    "scipy-notebook",
+    "r-notebook",
+    "julia-notebook",
+    "tensorflow-notebook",
+    "pytorch-notebook",
+    "datascience-notebook",
+    "pyspark-notebook",
+    "all-spark-notebook",
+]
+
+
+@pytest.mark.parametrize(
+    "changed_files,build,test",
+    [
+        (
+            ["images/scipy-notebook/Dockerfile"],
+            SCIPY_AND_DESCENDANTS,
+            SCIPY_AND_DESCENDANTS,
+        ),
+        # The tests of an image also run for its descendants, nothing is rebuilt
+        (
+            ["tests/by_image/base-notebook/test_container_options.py"],
+            [],
+            BASE_AND_DESCENDANTS,
+        ),
+        (
+            [
+                "images/r-notebook/Dockerfile",
+                "tests/by_image/julia-notebook/test_julia.py",
+            ],
+            ["r-notebook"],
+            ["r-notebook", "julia-notebook"],
+        ),
+        (["README.md", "images/base-notebook/README.md", "docs/index.md"], [], []),
+        (["tagging/apps/apply_tags.py"], [], list(ALL_IMAGES)),
+        (["Makefile"], list(ALL_IMAGES), list(ALL_IMAGES)),
+        ([], [], []),
+    ],
+)
+def test_plan_changes(
+    changed_files: list[str], build: list[str], test: list[str]
+) -> None:
+    plan = plan_changes(changed_files)
+    assert plan.build == build
+    assert plan.test == test
+    assert plan.retag == [image for image in ALL_IMAGES if image not in build]
+
+
+def test_make_targets() -> None:
+    plan = plan_changes(["images/all-spark-notebook/Dockerfile"])
+    assert plan.make_targets() == [
+        "build/all-spark-notebook",
+        "test/all-spark-notebook",
+    ]
@@ -0,0 +1,101 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import functools
+
+import pytest  # type: ignore
+
+from pipeline.scheduler import (
+    Task,
+    TaskResult,
+    _get_priorities,
+    get_critical_path,
+    run_tasks,
+)
+
+
+def _noop() -> None:
+    pass
+
+
+def _fail() -> None:
+    raise RuntimeError("Build failed")
+
+
+def _tasks(dependencies: dict[str, list[str]]) -> list[Task]:
+    return [
+        Task(name=name, run=_noop, dependencies=task_dependencies)
+        for name, task_dependencies in dependencies.items()
+    ]
+
+
+@pytest.mark.parametrize(
+    "dependencies,expected",
+    [
+        ({"a": []}, {"a": 1}),
+        ({"a": [], "b": ["a"], "c": ["b"]}, {"a": 3, "b": 2, "c": 1}),
+        # The longest chain wins, not the number of dependents
+        (
+            {"a": [], "b": ["a"], "c": ["a"], "d": ["a"], "e": [], "f": ["e"]},
+            {"a": 2, "b": 1, "c": 1, "d": 1, "e": 2, "f": 1},
+        ),
+        (
+            {"a": [], "b": ["a"], "c": ["b"], "d": ["a", "c"]},
+            {"a": 4, "b": 3, "c": 2, "d": 1},
+        ),
+    ],
+)
+def test_priorities(
+    dependencies: dict[str, list[str]], expected: dict[str, int]
+) -> None:
+    assert (
+        _get_priorities({task.name: task for task in _tasks(dependencies)}) == expected
+    )
+
+
+def test_longest_chain_starts_first() -> None:
+    started: list[str] = []
+    tasks = [
+        Task(name=name, run=functools.partial(started.append, name), dependencies=deps)
+        for name, deps in {"short": [], "long": [], "long-child": ["long"]}.items()
+    ]
+    results = run_tasks(tasks, jobs=1)
+    assert started[0] == "long"
+    assert all(result.status == "succeeded" for result in results.values())
+
+
+def test_failure_skips_dependents() -> None:
+    tasks = [
+        Task(name="base", run=_fail),
+        Task(name="child", run=_noop, dependencies=["base"]),
+        Task(name="grandchild", run=_noop, dependencies=["child"]),
+        Task(name="tests", run=_noop, blocked_by=["base"]),
+        Task(name="other", run=_noop),
+    ]
+    results = run_tasks(tasks, jobs=1)
+    assert {name: result.status for name, result in results.items()} == {
+        "base": "failed",
+        "child": "skipped",
+        "grandchild": "skipped",
+        # Blocked tasks have lower priority, so they haven't started yet
+        "tests": "skipped",
+        "other": "succeeded",
+    }
+    assert results["base"].error == "Build failed"
+
+
+@pytest.mark.parametrize(
+    "finished_at,expected",
+    [
+        ({}, []),
+        ({"a": 1.0, "b": 2.0, "c": 3.0, "d": 4.0}, ["a", "c", "d"]),
+        ({"a": 1.0, "b": 5.0, "c": 3.0, "d": 4.0}, ["a", "b"]),
+        # `d` depends on both, the later one is on the path
+        ({"a": 1.0, "b": 3.5, "c": 3.0, "d": 4.0}, ["a", "b", "d"]),
+    ],
+)
+def test_critical_path(finished_at: dict[str, float], expected: list[str]) -> None:
+    tasks = _tasks({"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]})
+    results = {task.name: TaskResult(task.name) for task in tasks}
+    for name, time in finished_at.items():
+        results[name].finished_at = time
+    assert get_critical_path(tasks, results) == expected
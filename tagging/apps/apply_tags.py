@@ -2,32 +2,175 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
-import plumbum
+import docker
+import requests
 
 from tagging.apps.common_cli_arguments import common_arguments_parser
 from tagging.apps.config import Config
+from tagging.utils.digest_ledger import DigestLedger
+from tagging.utils.digest_resolver import get_digest_ref
 from tagging.utils.get_prefix import get_file_prefix_for_platform
-
-docker = plumbum.local["docker"]
+from tagging.utils.git_helper import GitHelper
+from tagging.utils.registry_client import (
+    ManifestNotFoundError,
+    RegistryError,
+    get_registry_client,
+)
+from tagging.utils.telemetry import get_telemetry_path, record_telemetry
 
 LOGGER = logging.getLogger(__name__)
 
+# For example, `x86_64-latest: digest: sha256:... size: 1234`
+PUSHED_DIGEST = re.compile(r"digest: (sha256:[0-9a-f]+)")
 
-def apply_tags(config: Config) -> None:
-    LOGGER.info(f"Tagging image: {config.image}")
 
+@dataclass(frozen=True)
+class PushResult:
+    tag: str
+    digest: str
+    pushed_layers: int
+    existing_layers: int
+    elapsed: float
+
+
+def apply_tags_in_process(
+    docker_client: docker.DockerClient, image: str, tags: list[str]
+) -> None:
+    LOGGER.info(f"Tagging image: {image}")
+    docker_image = docker_client.images.get(image)
+    for tag in tags:
+        LOGGER.info(f"Applying tag: {tag}")
+        repository, _, tag_name = tag.rpartition(":")
+        assert docker_image.tag(repository, tag_name), f"Failed to apply tag: {tag}"
+    LOGGER.info(f"All tags applied to image: {image}")
+
+
+def push_tag(docker_client: docker.DockerClient, tag: str) -> PushResult:
+    LOGGER.info(f"Pushing tag: {tag}")
+    start = time.perf_counter()
+    repository, _, tag_name = tag.rpartition(":")
+    # The last status of each layer tells whether it was uploaded
+    layer_statuses: dict[str, str] = {}
+    digest = ""
+    for line in docker_client.images.push(
+        repository, tag=tag_name, stream=True, decode=True
+    ):
+        if "error" in line:
+            raise RuntimeError(f"Failed to push tag: {tag}: {line['error']}")
+        if "id" in line and "status" in line:
+            layer_statuses[line["id"]] = line["status"]
+        elif match := PUSHED_DIGEST.search(line.get("status", "")):
+            digest = match[1]
+    statuses = list(layer_statuses.values())
+    result = PushResult(
+        tag=tag,
+        digest=digest,
+        pushed_layers=statuses.count("Pushed"),
+        existing_layers=statuses.count("Layer already exists"),
+        elapsed=time.perf_counter() - start,
+    )
+    LOGGER.info(f"Pushed tag: {tag} in {result.elapsed:.2f} seconds")
+    return result
+
+
+def push_tags(
+    docker_client: docker.DockerClient, tags: list[str], max_workers: int
+) -> list[PushResult]:
+    """Pushes the first tag alone, so its layers are uploaded only once,
+    and then the rest of the tags concurrently, which only upload the manifests"""
+    if not tags:
+        LOGGER.info("No tags to push")
+        return []
+    first_tag, *other_tags = tags
+    results = [push_tag(docker_client, first_tag)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results += executor.map(lambda tag: push_tag(docker_client, tag), other_tags)
+
+    for result in results:
+        LOGGER.info(
+            f"Tag: {result.tag} pushed layers: {result.pushed_layers} "
+            f"existing layers: {result.existing_layers} "
+            f"time: {result.elapsed:.2f} seconds"
+        )
+    total_pushed = sum(result.pushed_layers for result in results)
+    LOGGER.info(f"Pushed {len(results)} tags, uploaded {total_pushed} layers")
+    return results
+
+
+def get_registry_layers_size(tag: str, digest: str) -> int | None:
+    """The size of the compressed layers of the pushed image, as stored in the registry"""
+    # The size is only recorded to the telemetry, so failing to get it doesn't fail the push
+    try:
+        manifest, _ = get_registry_client().get_manifest(get_digest_ref(tag, digest))
+        layers_size: int = sum(layer["size"] for layer in manifest.get("layers", []))
+    except (
+        RegistryError,
+        ManifestNotFoundError,
+        requests.RequestException,
+        ValueError,
+        KeyError,
+    ) as e:
+        LOGGER.warning(f"Failed to get the compressed size of: {tag}: {e!r}")
+        return None
+    return layers_size
+
+
+def record_push_telemetry(
+    config: Config, telemetry_dir: Path, results: list[PushResult], elapsed: float
+) -> None:
+    layers_size = (
+        get_registry_layers_size(results[0].tag, results[0].digest)
+        if results and results[0].digest
+        else None
+    )
+    record_telemetry(
+        get_telemetry_path(
+            telemetry_dir,
+            platform=config.platform,
+            variant=config.variant,
+            image=config.image,
+            commit_hash_tag=GitHelper.commit_hash_tag(),
+        ),
+        image=config.image,
+        platform=config.platform,
+        variant=config.variant,
+        phases={"push": elapsed},
+        sizes={} if layers_size is None else {"registry_layers": layers_size},
+    )
+
+
+def apply_tags(config: Config) -> None:
     file_prefix = get_file_prefix_for_platform(
         platform=config.platform, variant=config.variant
     )
     filename = f"{file_prefix}-{config.image}.txt"
     tags = (config.tags_dir / filename).read_text().splitlines()
 
-    for tag in tags:
-        LOGGER.info(f"Applying tag: {tag}")
-        docker["tag", config.full_image(), tag] & plumbum.FG
-
-    LOGGER.info(f"All tags applied to image: {config.image}")
+    docker_client = docker.from_env()
+    apply_tags_in_process(docker_client, config.full_image(), tags)
+    if config.push:
+        start = time.perf_counter()
+        results = push_tags(docker_client, tags, config.max_registry_workers)
+        if config.telemetry_dir is not None:
+            record_push_telemetry(
+                config, config.telemetry_dir, results, time.perf_counter() - start
+            )
+        # `merge_tags` and `calculate_image_ref` don't need to inspect these tags
+        ledger = DigestLedger(config.tags_dir, GitHelper.commit_hash_tag())
+        image_id = docker_client.images.get(config.full_image()).id
+        for result in results:
+            if result.digest:
+                ledger.record_tag_digest(result.tag, result.digest, image_id)
+        if results and results[0].digest:
+            ledger.record_platform_digest(
+                filename.removesuffix(".txt"), results[0].digest, image_id
+            )
 
 
 if __name__ == "__main__":
@@ -40,5 +183,8 @@ if __name__ == "__main__":
         variant=True,
         platform=True,
         tags_dir=True,
+        registry_workers=True,
+        push=True,
+        telemetry=True,
     )
     apply_tags(config)
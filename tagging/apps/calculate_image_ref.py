@@ -4,13 +4,17 @@
 import logging
 import os
 
+import docker
 from tenacity import RetryError
 
 from tagging.apps.common_cli_arguments import common_arguments_parser
 from tagging.apps.config import Config
 from tagging.apps.merge_tags import read_local_tags_from_files
-from tagging.utils.get_manifest_digest import ManifestNotFoundError, get_manifest_digest
+from tagging.utils.digest_ledger import DigestLedger, get_local_image_id
+from tagging.utils.digest_resolver import DigestResolver
 from tagging.utils.get_prefix import get_file_prefix_for_platform
+from tagging.utils.git_helper import GitHelper
+from tagging.utils.registry_client import ManifestNotFoundError
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,8 +33,14 @@ def get_tag_to_sign(config: Config) -> str:
 
 def calculate_image_ref(config: Config, push_to_registry: bool) -> str | None:
     tag = get_tag_to_sign(config)
+    # The digest is usually known from `merge_tags` or `apply_tags --push`
+    resolver = DigestResolver(
+        DigestLedger(config.tags_dir, GitHelper.commit_hash_tag())
+    )
+    # The digest recorded for a platform tag is only used if it was pushed from the local image
+    image_id = get_local_image_id(docker.from_env(), tag)
     try:
-        digest = get_manifest_digest(tag)
+        digest = resolver.get_digest(tag, image_id)
     except (ManifestNotFoundError, RetryError):
         # The tag might not exist in the registry yet if the image is new
         if push_to_registry:
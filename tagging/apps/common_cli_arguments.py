@@ -19,6 +19,12 @@ def common_arguments_parser(
     hist_lines_dir: bool = False,
     manifests_dir: bool = False,
     repository: bool = False,
+    cache: bool = False,
+    snapshot_manifests: bool = False,
+    delta_manifests: bool = False,
+    registry_workers: bool = False,
+    push: bool = False,
+    telemetry: bool = False,
 ) -> Config:
     """Parse the requested common CLI arguments and return the corresponding Config"""
 
@@ -84,6 +90,50 @@ def common_arguments_parser(
             required=True,
             help="Repository name on GitHub",
         )
+    if cache:
+        parser.add_argument(
+            "--cache-dir",
+            required=False,
+            type=Path,
+            help="Directory for the results cache (the cache is disabled if not set)",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Don't read from the results cache, but still refresh it",
+        )
+    if snapshot_manifests:
+        parser.add_argument(
+            "--snapshot-manifests",
+            action="store_true",
+            help="Read package metadata files instead of running package managers",
+        )
+    if delta_manifests:
+        parser.add_argument(
+            "--delta-manifests",
+            action="store_true",
+            help="Only list the packages which differ from the parent image's manifest",
+        )
+    if registry_workers:
+        parser.add_argument(
+            "--max-registry-workers",
+            type=int,
+            default=Config.max_registry_workers,
+            help="Maximum number of concurrent registry operations of each kind",
+        )
+    if push:
+        parser.add_argument(
+            "--push",
+            action="store_true",
+            help="Push the tags to the registry",
+        )
+    if telemetry:
+        parser.add_argument(
+            "--telemetry-dir",
+            required=False,
+            type=Path,
+            help="Directory for the build telemetry files (telemetry isn't recorded if not set)",
+        )
     args = parser.parse_args()
     if platform or platform_optional:
         args.platform = unify_aarch64(args.platform)
@@ -18,5 +18,16 @@ class Config:
 
     repository: str = ""
 
+    cache_dir: Path | None = None
+    no_cache: bool = False
+
+    snapshot_manifests: bool = False
+    delta_manifests: bool = False
+
+    max_registry_workers: int = 8
+    push: bool = False
+
+    telemetry_dir: Path | None = None
+
     def full_image(self) -> str:
         return f"{self.registry}/{self.owner}/{self.image}"
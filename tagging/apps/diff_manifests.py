@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import dataclasses
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from tagging.manifests.manifest_interface import PackageRecord
+from tagging.utils.load_manifest import LoadedManifest, load_manifest
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ManifestDiff:
+    old_manifest: str
+    new_manifest: str
+    image_size_delta: int | None
+    added_tags: list[str]
+    removed_tags: list[str]
+    added: list[PackageRecord]
+    removed: list[PackageRecord]
+    # Pairs of old and new records
+    upgraded: list[tuple[PackageRecord, PackageRecord]]
+    downgraded: list[tuple[PackageRecord, PackageRecord]]
+
+
+def version_key(version: str) -> tuple[list[tuple[int, int, str]], str]:
+    """Natural order of versions: `1.10` is newer than `1.9`.
+    It's not exact for every versioning scheme, but it's good enough for a report"""
+    parts = [
+        (1, int(part), "") if part.isdigit() else (0, 0, part)
+        for part in re.findall(r"\d+|[a-zA-Z]+", version)
+    ]
+    # The end is newer than a letter part, so `2.0.0rc1` is older than `2.0.0`,
+    # but older than a number part, so `1.0` is older than `1.0.1`
+    parts.append((0, 1, ""))
+    # The version itself breaks the ties, so the order is total
+    return parts, version
+
+
+def diff_manifests(
+    old_manifest: LoadedManifest,
+    new_manifest: LoadedManifest,
+    *,
+    old_name: str,
+    new_name: str,
+) -> ManifestDiff:
+    # An ecosystem is only compared if both manifests list it completely
+    skipped_ecosystems = (
+        old_manifest.skipped_ecosystems | new_manifest.skipped_ecosystems
+    )
+    old_packages = {
+        key: package
+        for key, package in old_manifest.packages.items()
+        if package.ecosystem not in skipped_ecosystems
+    }
+    new_packages = {
+        key: package
+        for key, package in new_manifest.packages.items()
+        if package.ecosystem not in skipped_ecosystems
+    }
+
+    upgraded = []
+    downgraded = []
+    for key in sorted(old_packages.keys() & new_packages.keys()):
+        old, new = old_packages[key], new_packages[key]
+        if old.version == new.version:
+            continue
+        if version_key(new.version) > version_key(old.version):
+            upgraded.append((old, new))
+        else:
+            downgraded.append((old, new))
+
+    image_size_delta = (
+        None
+        if old_manifest.image_size_bytes is None
+        or new_manifest.image_size_bytes is None
+        else new_manifest.image_size_bytes - old_manifest.image_size_bytes
+    )
+
+    # The tags are only compared if both manifests list all of them
+    old_tags: set[str] = set()
+    new_tags: set[str] = set()
+    if old_manifest.tags is not None and new_manifest.tags is not None:
+        old_tags, new_tags = set(old_manifest.tags), set(new_manifest.tags)
+
+    return ManifestDiff(
+        old_manifest=old_name,
+        new_manifest=new_name,
+        image_size_delta=image_size_delta,
+        added_tags=sorted(new_tags - old_tags),
+        removed_tags=sorted(old_tags - new_tags),
+        added=[
+            new_packages[key]
+            for key in sorted(new_packages.keys() - old_packages.keys())
+        ],
+        removed=[
+            old_packages[key]
+            for key in sorted(old_packages.keys() - new_packages.keys())
+        ],
+        upgraded=upgraded,
+        downgraded=downgraded,
+    )
+
+
+def format_size_delta(size_delta: int) -> str:
+    # The same decimal units as `docker images`
+    for unit, unit_size in [("GB", 10**9), ("MB", 10**6), ("kB", 10**3)]:
+        if abs(size_delta) >= unit_size:
+            return f"{size_delta / unit_size:+.2f}{unit}"
+    return f"{size_delta:+d}B"
+
+
+def format_diff(diff: ManifestDiff) -> str:
+    lines = [f"## `{diff.old_manifest}` -> `{diff.new_manifest}`", ""]
+    if diff.image_size_delta is not None:
+        lines.append(f"Image size delta: {format_size_delta(diff.image_size_delta)}")
+        lines.append("")
+
+    def add_list(title: str, items: list[str]) -> None:
+        if items:
+            lines.extend([f"{title}:", "", *(f"- {item}" for item in items), ""])
+
+    add_list("Added tags", [f"`{tag}`" for tag in diff.added_tags])
+    add_list("Removed tags", [f"`{tag}`" for tag in diff.removed_tags])
+    add_list(
+        "Added packages",
+        [f"{new.ecosystem} `{new.name}` {new.version}" for new in diff.added],
+    )
+    add_list(
+        "Removed packages",
+        [f"{old.ecosystem} `{old.name}` {old.version}" for old in diff.removed],
+    )
+    add_list(
+        "Upgraded packages",
+        [
+            f"{old.ecosystem} `{old.name}` {old.version} -> {new.version}"
+            for old, new in diff.upgraded
+        ],
+    )
+    add_list(
+        "Downgraded packages",
+        [
+            f"{old.ecosystem} `{old.name}` {old.version} -> {new.version}"
+            for old, new in diff.downgraded
+        ],
+    )
+    return "\n".join(lines)
+
+
+def diff_manifest_files(manifest_files: list[Path]) -> list[ManifestDiff]:
+    """Diffs each manifest with the next one, every file is parsed only once"""
+    assert len(manifest_files) >= 2, "At least two manifests are needed"
+    diffs = []
+    for old_file, new_file in zip(manifest_files, manifest_files[1:]):
+        LOGGER.info(f"Diffing manifests: {old_file} and {new_file}")
+        diffs.append(
+            diff_manifests(
+                load_manifest(old_file),
+                load_manifest(new_file),
+                old_name=old_file.name,
+                new_name=new_file.name,
+            )
+        )
+    return diffs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "manifests",
+        nargs="+",
+        type=Path,
+        help="Markdown or JSON manifest files, from the oldest to the newest",
+    )
+    arg_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the differences as JSON",
+    )
+    args = arg_parser.parse_args()
+
+    diffs = diff_manifest_files(args.manifests)
+    if args.json:
+        print(json.dumps([dataclasses.asdict(diff) for diff in diffs], indent=2))
+    else:
+        print("\n".join(format_diff(diff) for diff in diffs))
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from tagging.utils.delta_manifest import expand_json_manifest, render_expanded_manifest
+
+LOGGER = logging.getLogger(__name__)
+
+
+def expand_manifest(json_manifest_file: Path, *, output_json: bool) -> str:
+    """Renders the Markdown manifest of a delta manifest, using the JSON manifests of its parents"""
+    LOGGER.info(f"Expanding manifest: {json_manifest_file}")
+    json_manifest = expand_json_manifest(json_manifest_file)
+    if output_json:
+        return json.dumps(json_manifest, separators=(",", ":"))
+    return render_expanded_manifest(json_manifest)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "manifest",
+        type=Path,
+        help="JSON manifest file, the manifests of the parent images should be next to it",
+    )
+    arg_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the expanded JSON manifest instead of Markdown",
+    )
+    args = arg_parser.parse_args()
+
+    print(expand_manifest(args.manifest, output_json=args.json))
@@ -3,18 +3,24 @@
 # Distributed under the terms of the Modified BSD License.
 import logging
 import os
+from concurrent.futures import Executor, ThreadPoolExecutor
 
-import plumbum
+import docker
 from tenacity import RetryError
 
 from tagging.apps.common_cli_arguments import common_arguments_parser
 from tagging.apps.config import Config
-from tagging.utils.get_manifest_digest import ManifestNotFoundError, get_manifest_digest
+from tagging.utils.create_manifest_list import create_manifest_list
+from tagging.utils.digest_ledger import DigestLedger, get_local_image_id
+from tagging.utils.digest_resolver import (
+    DigestResolver,
+    get_digest_ref,
+    get_representative_tags,
+)
 from tagging.utils.get_platform import ALL_PLATFORMS
 from tagging.utils.get_prefix import get_file_prefix_for_platform
 from tagging.utils.git_helper import GitHelper
-
-docker = plumbum.local["docker"]
+from tagging.utils.registry_client import ManifestNotFoundError
 
 LOGGER = logging.getLogger(__name__)
 
@@ -44,42 +50,107 @@ def read_local_tags_from_files(config: Config) -> dict[str, set[str]]:
     return local_platforms_per_tag
 
 
-def find_platform_tags(
-    merged_tag: str, local_platforms: set[str], push_to_registry: bool
-) -> list[str]:
-    platform_tags = []
+def inspect_platform_tag(
+    resolver: DigestResolver,
+    platform_tag: str,
+    image_id: str | None,
+    push_to_registry: bool,
+) -> str | None:
+    LOGGER.info(f"Trying to inspect: {platform_tag} in the registry")
+    try:
+        digest = resolver.get_digest(platform_tag, image_id)
+        LOGGER.info(f"Tag {platform_tag} found successfully")
+        return digest
+    except ManifestNotFoundError as e:
+        if push_to_registry:
+            raise RuntimeError(
+                f"Tag: {platform_tag} is declared in a local tags file, "
+                f"but doesn't exist in the registry. "
+                f"Merging the tags of this platform would silently drop it."
+            ) from e
+        LOGGER.warning(f"Manifest for tag {platform_tag} doesn't exist")
+    except RetryError as e:
+        if push_to_registry:
+            raise RuntimeError(
+                f"Failed to inspect manifest for tag: {platform_tag}. "
+                f"Not merging the tags of this platform "
+                f"to avoid pushing incomplete manifest lists."
+            ) from e
+        LOGGER.warning(f"Failed to inspect manifest for tag {platform_tag}")
+    return None
 
-    for platform in sorted(local_platforms):
-        image, _, tag = merged_tag.rpartition(":")
-        platform_tag = f"{image}:{platform}-{tag}"
-        LOGGER.info(f"Trying to inspect: {platform_tag} in the registry")
-        try:
-            get_manifest_digest(platform_tag)
-            platform_tags.append(platform_tag)
-            LOGGER.info(f"Tag {platform_tag} found successfully")
-        except ManifestNotFoundError as e:
-            if push_to_registry:
-                raise RuntimeError(
-                    f"Tag: {platform_tag} is declared in a local tags file, "
-                    f"but doesn't exist in the registry. "
-                    f"Merging tag: {merged_tag} would silently drop this platform."
-                ) from e
-            LOGGER.warning(f"Manifest for tag {platform_tag} doesn't exist")
-        except RetryError as e:
-            if push_to_registry:
-                raise RuntimeError(
-                    f"Failed to inspect manifest for tag: {platform_tag}. "
-                    f"Not merging tag: {merged_tag} "
-                    f"to avoid pushing an incomplete manifest list."
-                ) from e
-            LOGGER.warning(f"Failed to inspect manifest for tag {platform_tag}")
-
-    return platform_tags
 
+def get_platform_image(config: Config, platform: str) -> str:
+    file_prefix = get_file_prefix_for_platform(
+        platform=platform, variant=config.variant
+    )
+    return f"{file_prefix}-{config.image}"
 
-def merge_tags(
-    merged_tag: str, local_platforms: set[str], push_to_registry: bool
-) -> None:
+
+def resolve_platform_digest(
+    config: Config,
+    docker_client: docker.DockerClient,
+    ledger: DigestLedger,
+    resolver: DigestResolver,
+    platform: str,
+    representative_tag: str,
+    push_to_registry: bool,
+) -> str | None:
+    platform_image = get_platform_image(config, platform)
+    # The platform image only exists locally if it was built on this machine
+    image_id = get_local_image_id(docker_client, representative_tag)
+    digest = ledger.get_platform_digest(platform_image, image_id)
+    if digest is not None:
+        LOGGER.info(
+            f"Using known digest: {digest} for platform image: {platform_image}"
+        )
+        return digest
+    return inspect_platform_tag(
+        resolver, representative_tag, image_id, push_to_registry
+    )
+
+
+def resolve_platform_digests(
+    config: Config,
+    local_platforms_per_tag: dict[str, set[str]],
+    push_to_registry: bool,
+    docker_client: docker.DockerClient,
+    ledger: DigestLedger,
+    executor: Executor,
+) -> dict[str, str]:
+    """Inspects one representative tag per platform, instead of every platform tag.
+    Platforms without a digest are omitted"""
+    resolver = DigestResolver(ledger)
+    representative_tags = get_representative_tags(local_platforms_per_tag)
+    platforms = sorted(representative_tags)
+    # All platforms are inspected concurrently,
+    # `map` raises the error of the first failed platform in the sorted order
+    digests = executor.map(
+        lambda platform: resolve_platform_digest(
+            config,
+            docker_client,
+            ledger,
+            resolver,
+            platform,
+            representative_tags[platform],
+            push_to_registry,
+        ),
+        platforms,
+    )
+    return {
+        platform: digest
+        for platform, digest in zip(platforms, digests)
+        if digest is not None
+    }
+
+
+def get_platform_refs(
+    merged_tag: str,
+    local_platforms: set[str],
+    platform_digests: dict[str, str],
+    push_to_registry: bool,
+) -> list[str]:
+    """Digest references of the platform images to merge, empty if the tag is skipped"""
     LOGGER.info(f"Trying to merge tag: {merged_tag}")
 
     # Commit SHA tags are only pushed to the registry from the default branch,
@@ -89,10 +160,15 @@ def merge_tags(
             f"Not running merge for tag: {merged_tag} "
             "as it's a commit SHA tag and it wasn't pushed to registry"
         )
-        return
+        return []
 
-    platform_tags = find_platform_tags(merged_tag, local_platforms, push_to_registry)
-    if not platform_tags:
+    # Manifest lists are built from digest references, which are the same for all tags
+    platform_refs = [
+        get_digest_ref(merged_tag, platform_digests[platform])
+        for platform in sorted(local_platforms)
+        if platform in platform_digests
+    ]
+    if not platform_refs:
         if push_to_registry:
             raise RuntimeError(
                 f"No platform tags found for merged tag: {merged_tag}, "
@@ -102,37 +178,99 @@ def merge_tags(
         LOGGER.info(
             f"Not running merge for tag: {merged_tag} as no platform tags found"
         )
-        return
-
-    args = [
-        "buildx",
-        "imagetools",
-        "create",
-        *platform_tags,
-        "--tag",
-        merged_tag,
-    ]
-    if not push_to_registry:
-        args.append("--dry-run")
+    return platform_refs
+
+
+def group_merged_tags(
+    local_platforms_per_tag: dict[str, set[str]],
+    platform_digests: dict[str, str],
+    push_to_registry: bool,
+) -> dict[tuple[str, ...], list[str]]:
+    """Groups the merged tags by the platform images they consist of,
+    so each distinct manifest list is only created once"""
+    merged_tags_per_refs: dict[tuple[str, ...], list[str]] = {}
+    for merged_tag, local_platforms in local_platforms_per_tag.items():
+        platform_refs = get_platform_refs(
+            merged_tag, local_platforms, platform_digests, push_to_registry
+        )
+        if platform_refs:
+            merged_tags_per_refs.setdefault(tuple(platform_refs), []).append(merged_tag)
+    return merged_tags_per_refs
+
+
+def merge_tags(
+    platform_refs: tuple[str, ...],
+    merged_tags: list[str],
+    push_to_registry: bool,
+    resolver: DigestResolver,
+) -> None:
+    LOGGER.info(f"Merging tags: {merged_tags} from: {platform_refs}")
+    output, digest = create_manifest_list(
+        list(platform_refs), merged_tags, push_to_registry=push_to_registry
+    )
+    if push_to_registry and digest is not None:
+        for merged_tag in merged_tags:
+            resolver.record_digest(merged_tag, digest)
+    # Merges run concurrently, so the output is logged instead of being printed directly
+    if output:
+        LOGGER.info(f"Manifest list for tags: {merged_tags}\n{output}")
+    for merged_tag in merged_tags:
+        if push_to_registry:
+            LOGGER.info(f"Pushed merged tag: {merged_tag}")
+        else:
+            LOGGER.info(f"Skipped push for tag: {merged_tag}")
 
-    LOGGER.info(f"Running command: {' '.join(args)}")
-    docker[args] & plumbum.FG
-    if push_to_registry:
-        LOGGER.info(f"Pushed merged tag: {merged_tag}")
-    else:
-        LOGGER.info(f"Skipped push for tag: {merged_tag}")
+
+def merge_all_tags(
+    config: Config,
+    local_platforms_per_tag: dict[str, set[str]],
+    push_to_registry: bool,
+) -> None:
+    """Resolves the platform digests, and then creates each distinct manifest list concurrently,
+    running at most `max_registry_workers` registry operations at once.
+    The digests are taken from the digest ledger, and the pushed ones are recorded to it
+    """
+    docker_client = docker.from_env()
+    ledger = DigestLedger(config.tags_dir, GitHelper.commit_hash_tag())
+    resolver = DigestResolver(ledger)
+    with ThreadPoolExecutor(max_workers=config.max_registry_workers) as executor:
+        platform_digests = resolve_platform_digests(
+            config,
+            local_platforms_per_tag,
+            push_to_registry,
+            docker_client,
+            ledger,
+            executor,
+        )
+        merged_tags_per_refs = group_merged_tags(
+            local_platforms_per_tag, platform_digests, push_to_registry
+        )
+        futures = [
+            executor.submit(
+                merge_tags, platform_refs, merged_tags, push_to_registry, resolver
+            )
+            for platform_refs, merged_tags in merged_tags_per_refs.items()
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            # The same as the sequential merge, no new merges start after a failure
+            executor.shutdown(cancel_futures=True)
+            raise
 
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
-    config = common_arguments_parser(image=True, variant=True, tags_dir=True)
+    config = common_arguments_parser(
+        image=True, variant=True, tags_dir=True, registry_workers=True
+    )
     push_to_registry = os.environ.get("PUSH_TO_REGISTRY", "false").lower() == "true"
 
     LOGGER.info(f"Merging tags for image: {config.image}")
 
     local_platforms_per_tag = read_local_tags_from_files(config)
-    for tag, local_platforms in local_platforms_per_tag.items():
-        merge_tags(tag, local_platforms, push_to_registry)
+    merge_all_tags(config, local_platforms_per_tag, push_to_registry)
 
     LOGGER.info(f"Successfully merged tags for image: {config.image}")
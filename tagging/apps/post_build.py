@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import logging
+
+import docker
+
+from tagging.apps.apply_tags import apply_tags_in_process
+from tagging.apps.common_cli_arguments import common_arguments_parser
+from tagging.apps.config import Config
+from tagging.apps.write_manifest import (
+    BUILD_TIMESTAMP,
+    calculate_all,
+    get_manifest_filename,
+    write_build_history_line,
+    write_manifest,
+)
+from tagging.apps.write_tags_file import get_tags_from_values, write_tags
+from tagging.utils.git_helper import GitHelper
+
+LOGGER = logging.getLogger(__name__)
+
+
+def post_build(config: Config) -> None:
+    """Does the same as `write_tags_file`, `write_manifest` and `apply_tags` apps,
+    but runs a single container and calculates the tags only once"""
+    LOGGER.info(f"Running post-build hooks for image: {config.image}")
+
+    docker_client = docker.from_env()
+    tag_values, manifest_pieces = calculate_all(config, docker_client)
+
+    tags = get_tags_from_values(config, tag_values)
+    write_tags(config, tags)
+
+    filename = get_manifest_filename(config)
+    write_build_history_line(config, tag_values, filename)
+    write_manifest(
+        config,
+        tag_values,
+        manifest_pieces,
+        filename=filename,
+        commit_hash_tag=GitHelper.commit_hash_tag(),
+    )
+
+    apply_tags_in_process(docker_client, config.full_image(), tags)
+
+    LOGGER.info(f"Post-build hooks finished for image: {config.image}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    LOGGER.info(f"Current build timestamp: {BUILD_TIMESTAMP}")
+
+    config = common_arguments_parser(
+        registry=True,
+        owner=True,
+        image=True,
+        variant=True,
+        tags_dir=True,
+        hist_lines_dir=True,
+        manifests_dir=True,
+        repository=True,
+        cache=True,
+        snapshot_manifests=True,
+        delta_manifests=True,
+        telemetry=True,
+    )
+    post_build(config)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import logging
+from pathlib import Path
+
+from tagging.utils.buildkit_progress import get_pull_duration, parse_build_steps
+from tagging.utils.get_platform import get_platform
+from tagging.utils.git_helper import GitHelper
+from tagging.utils.telemetry import (
+    TELEMETRY_PHASES,
+    get_telemetry_path,
+    record_telemetry,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+def parse_phase(value: str) -> tuple[str, float]:
+    phase, _, seconds = value.partition("=")
+    if phase not in TELEMETRY_PHASES:
+        raise argparse.ArgumentTypeError(f"Unknown phase: {phase}")
+    return phase, float(seconds)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser(
+        description="Records the build telemetry measured outside of the tagging apps"
+    )
+    arg_parser.add_argument(
+        "--image",
+        required=True,
+        help="Short image name",
+    )
+    arg_parser.add_argument(
+        "--variant",
+        required=True,
+        help="Variant tag prefix",
+    )
+    arg_parser.add_argument(
+        "--telemetry-dir",
+        required=True,
+        type=Path,
+        help="Directory for the build telemetry files",
+    )
+    arg_parser.add_argument(
+        "--phase",
+        dest="phases",
+        action="append",
+        default=[],
+        type=parse_phase,
+        help=f"Duration of a phase in seconds, e.g. build=123.4, phases: {TELEMETRY_PHASES}",
+    )
+    arg_parser.add_argument(
+        "--build-log",
+        type=Path,
+        help="BuildKit `--progress plain` output, the durations of the steps are recorded",
+    )
+    arg_parser.add_argument(
+        "--compressed-image",
+        type=Path,
+        help="`docker save` output compressed with zstd, its size is recorded as `archive_zstd`",
+    )
+    args = arg_parser.parse_args()
+
+    phases = dict(args.phases)
+    steps = None
+    if args.build_log is not None:
+        steps = parse_build_steps(args.build_log.read_text().splitlines())
+        phases.setdefault("pull", get_pull_duration(steps))
+    sizes = {}
+    if args.compressed_image is not None:
+        sizes["archive_zstd"] = args.compressed_image.stat().st_size
+
+    platform = get_platform()
+    record_telemetry(
+        get_telemetry_path(
+            args.telemetry_dir,
+            platform=platform,
+            variant=args.variant,
+            image=args.image,
+            commit_hash_tag=GitHelper.commit_hash_tag(),
+        ),
+        image=args.image,
+        platform=platform,
+        variant=args.variant,
+        phases=phases,
+        steps=steps,
+        sizes=sizes,
+    )
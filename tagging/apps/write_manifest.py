@@ -1,19 +1,46 @@
 #!/usr/bin/env python3
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import dataclasses
 import datetime
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
+import docker
 from docker.models.containers import Container
 
 from tagging.apps.common_cli_arguments import common_arguments_parser
 from tagging.apps.config import Config
-from tagging.hierarchy.get_manifests import get_manifests
-from tagging.hierarchy.get_taggers import get_taggers
-from tagging.manifests.build_info import BuildInfoConfig, build_info_manifest
+from tagging.apps.write_tags_file import (
+    calculate_tag_values,
+    get_tags_from_values,
+    tag_values_cache_key,
+)
+from tagging.hierarchy.get_manifests import get_manifests, need_running_container
+from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+from tagging.manifests.build_info import (
+    BuildInfo,
+    BuildInfoConfig,
+    build_info_piece,
+    get_build_info,
+)
+from tagging.manifests.manifest_interface import ManifestInterface, MarkdownPiece
+from tagging.utils.delta_manifest import (
+    expand_json_manifest,
+    find_parent_manifest,
+    get_delta_json_manifest,
+    package_changes_piece,
+    parent_image_piece,
+)
 from tagging.utils.docker_runner import DockerRunner
+from tagging.utils.get_platform import get_platform
 from tagging.utils.get_prefix import get_file_prefix, get_tag_prefix
 from tagging.utils.git_helper import GitHelper
+from tagging.utils.results_cache import ResultsCache
+from tagging.utils.telemetry import get_telemetry_path, record_telemetry
 
 LOGGER = logging.getLogger(__name__)
 
@@ -24,14 +51,14 @@ BUILD_TIMESTAMP = (
     .replace("+00:00", "Z")
 )
 MARKDOWN_LINE_BREAK = "<br />"
+MAX_MANIFEST_WORKERS = 4
 
 
-def get_build_history_line(config: Config, container: Container, filename: str) -> str:
+def get_build_history_line(config: Config, tag_values: list[str], filename: str) -> str:
     LOGGER.info(f"Calculating build history line for image: {config.image}")
 
-    taggers = get_taggers(config.image)
     tags_prefix = get_tag_prefix(config.variant)
-    all_tags = [tags_prefix + "-" + tagger(container) for tagger in taggers]
+    all_tags = [tags_prefix + "-" + tag_value for tag_value in tag_values]
 
     date_column = f"`{BUILD_TIMESTAMP}`"
     image_column = MARKDOWN_LINE_BREAK.join(
@@ -52,37 +79,58 @@ def get_build_history_line(config: Config, container: Container, filename: str)
 
 
 def write_build_history_line(
-    config: Config, container: Container, filename: str
+    config: Config, tag_values: list[str], filename: str
 ) -> None:
     LOGGER.info(f"Writing tags for image: {config.image}")
 
     path = config.hist_lines_dir / f"{filename}.txt"
     path.parent.mkdir(parents=True, exist_ok=True)
-    build_history_line = get_build_history_line(config, container, filename)
+    build_history_line = get_build_history_line(config, tag_values, filename)
     path.write_text(build_history_line)
 
     LOGGER.info(f"Build history line written to: {path}")
 
 
-def get_manifest(config: Config, container: Container, commit_hash_tag: str) -> str:
-    LOGGER.info(f"Calculating manifest file for image: {config.image}")
+def calculate_manifest_piece(
+    manifest: ManifestInterface, container: Container
+) -> MarkdownPiece:
+    start = time.perf_counter()
+    piece = manifest(container)
+    elapsed = time.perf_counter() - start
+    LOGGER.info(f"Manifest: {manifest.__name__} calculated in {elapsed:.2f} seconds")
+    return piece
+
 
-    manifests = get_manifests(config.image)
+def calculate_manifest_pieces(
+    config: Config, container: Container
+) -> list[MarkdownPiece]:
+    manifests = get_manifests(config.image, snapshot=config.snapshot_manifests)
     manifest_names = [manifest.__name__ for manifest in manifests]
     LOGGER.info(f"Using manifests: {manifest_names}")
 
-    build_info_config = BuildInfoConfig(
-        registry=config.registry,
-        owner=config.owner,
-        image=config.image,
-        repository=config.repository,
-        build_timestamp=BUILD_TIMESTAMP,
-    )
+    # Manifests mostly wait for slow commands in the container, so they run concurrently
+    # `map` returns the pieces in the order of the manifests, keeping the output deterministic
+    with ThreadPoolExecutor(max_workers=MAX_MANIFEST_WORKERS) as executor:
+        return list(
+            executor.map(
+                lambda manifest: calculate_manifest_piece(manifest, container),
+                manifests,
+            )
+        )
+
+
+def get_manifest(
+    config: Config,
+    build_info: BuildInfo,
+    manifest_pieces: list[MarkdownPiece],
+    commit_hash_tag: str,
+) -> str:
+    LOGGER.info(f"Calculating manifest file for image: {config.image}")
 
     markdown_pieces = [
         f"# Build manifest for image: {config.image}:{commit_hash_tag}",
-        build_info_manifest(build_info_config).get_str(),
-        *(manifest(container).get_str() for manifest in manifests),
+        build_info_piece(build_info).get_str(),
+        *(piece.get_str() for piece in manifest_pieces),
     ]
     markdown_content = "\n\n".join(markdown_pieces) + "\n"
 
@@ -90,31 +138,196 @@ def get_manifest(config: Config, container: Container, commit_hash_tag: str) ->
     return markdown_content
 
 
+def get_json_manifest(
+    config: Config,
+    build_info: BuildInfo,
+    tag_values: list[str],
+    manifest_pieces: list[MarkdownPiece],
+) -> dict[str, Any]:
+    """The same data as the Markdown manifest, but the package lists are records instead of text"""
+    return {
+        "image": config.image,
+        "variant": config.variant,
+        "build_info": dataclasses.asdict(build_info),
+        "tags": get_tags_from_values(config, tag_values),
+        "packages": [
+            dataclasses.asdict(package)
+            for piece in manifest_pieces
+            for package in piece.packages
+        ],
+        # The sections without the package lists, so delta manifests can be expanded
+        "pieces": [
+            {
+                "title": piece.title,
+                "sections": piece.info_sections(),
+                "ecosystems": list(
+                    dict.fromkeys(package.ecosystem for package in piece.packages)
+                ),
+            }
+            for piece in manifest_pieces
+        ],
+        "skipped_ecosystems": sorted(
+            {
+                ecosystem
+                for piece in manifest_pieces
+                for ecosystem in piece.skipped_ecosystems
+            }
+        ),
+    }
+
+
+def get_delta_manifest_pieces(
+    manifest_pieces: list[MarkdownPiece],
+    delta_json_manifest: dict[str, Any],
+    expanded_parent: dict[str, Any],
+) -> list[MarkdownPiece]:
+    """The package lists are replaced with the package changes,
+    the other sections describe the image itself (e.g., its layers), so they are kept"""
+    info_pieces = [
+        MarkdownPiece(title=piece.title, sections=piece.info_sections())
+        for piece in manifest_pieces
+        if piece.info_sections()
+    ]
+    return [
+        parent_image_piece(delta_json_manifest),
+        package_changes_piece(delta_json_manifest, expanded_parent),
+        *info_pieces,
+    ]
+
+
 def write_manifest(
-    config: Config, container: Container, *, filename: str, commit_hash_tag: str
+    config: Config,
+    tag_values: list[str],
+    manifest_pieces: list[MarkdownPiece],
+    *,
+    filename: str,
+    commit_hash_tag: str,
 ) -> None:
     LOGGER.info(f"Writing manifest file for image: {config.image}")
 
+    build_info = get_build_info(
+        BuildInfoConfig(
+            registry=config.registry,
+            owner=config.owner,
+            image=config.image,
+            repository=config.repository,
+            build_timestamp=BUILD_TIMESTAMP,
+        )
+    )
+
+    json_manifest = get_json_manifest(config, build_info, tag_values, manifest_pieces)
+    parent_manifest = (
+        find_parent_manifest(
+            ALL_IMAGES[config.image].parent_image,
+            variant=config.variant,
+            manifests_dir=config.manifests_dir,
+            commit_hash_tag=commit_hash_tag,
+        )
+        if config.delta_manifests
+        else None
+    )
+    if parent_manifest is not None:
+        LOGGER.info(f"Writing delta manifest, parent manifest: {parent_manifest}")
+        expanded_parent = expand_json_manifest(parent_manifest)
+        json_manifest = get_delta_json_manifest(
+            json_manifest, parent_manifest, expanded_parent
+        )
+        manifest_pieces = get_delta_manifest_pieces(
+            manifest_pieces, json_manifest, expanded_parent
+        )
+
     path = config.manifests_dir / f"{filename}.md"
     path.parent.mkdir(parents=True, exist_ok=True)
-    manifest = get_manifest(config, container, commit_hash_tag)
+    manifest = get_manifest(config, build_info, manifest_pieces, commit_hash_tag)
     path.write_text(manifest)
-
     LOGGER.info(f"Manifest file written to: {path}")
 
+    json_path = config.manifests_dir / f"{filename}.json"
+    json_path.write_text(json.dumps(json_manifest, separators=(",", ":")) + "\n")
+    LOGGER.info(f"JSON manifest file written to: {json_path}")
+
+    if config.telemetry_dir is not None:
+        platform = get_platform()
+        record_telemetry(
+            get_telemetry_path(
+                config.telemetry_dir,
+                platform=platform,
+                variant=config.variant,
+                image=config.image,
+                commit_hash_tag=commit_hash_tag,
+            ),
+            image=config.image,
+            platform=platform,
+            variant=config.variant,
+            sizes={"uncompressed": build_info.image_size_bytes},
+        )
 
-def write_all(config: Config) -> None:
-    LOGGER.info(f"Writing all files for image: {config.image}")
 
+def get_manifest_filename(config: Config) -> str:
     file_prefix = get_file_prefix(config.variant)
     commit_hash_tag = GitHelper.commit_hash_tag()
-    filename = f"{file_prefix}-{config.image}-{commit_hash_tag}"
+    return f"{file_prefix}-{config.image}-{commit_hash_tag}"
+
 
-    with DockerRunner(config.full_image()) as container:
-        write_build_history_line(config, container, filename)
-        write_manifest(
-            config, container, filename=filename, commit_hash_tag=commit_hash_tag
+def calculate_all(
+    config: Config, docker_client: docker.DockerClient | None = None
+) -> tuple[list[str], list[MarkdownPiece]]:
+    """Returns the tag values and the manifest pieces, using one container for both"""
+    docker_client = docker_client or docker.from_env()
+    image_id = docker_client.images.get(config.full_image()).id
+    cache = ResultsCache(config.cache_dir, bypass=config.no_cache)
+    tag_values_key = tag_values_cache_key(config, cache, image_id)
+    tag_values = cache.load(tag_values_key)
+    manifest_pieces_key = cache.key(
+        image_id,
+        "manifests",
+        config.image,
+        str(config.snapshot_manifests),
+    )
+    cached_pieces = cache.load(manifest_pieces_key)
+    manifest_pieces = (
+        None
+        if cached_pieces is None
+        else [MarkdownPiece.from_dict(piece) for piece in cached_pieces]
+    )
+
+    # The container is only created if some of the values are not cached,
+    # and it's not started if only snapshot manifests need to be calculated
+    if tag_values is None or manifest_pieces is None:
+        start = tag_values is None or need_running_container(
+            get_manifests(config.image, snapshot=config.snapshot_manifests)
         )
+        with DockerRunner(
+            config.full_image(), docker_client, shell_session=start, start=start
+        ) as container:
+            if tag_values is None:
+                tag_values = calculate_tag_values(config, container)
+                cache.store(tag_values_key, tag_values)
+            if manifest_pieces is None:
+                manifest_pieces = calculate_manifest_pieces(config, container)
+                cache.store(
+                    manifest_pieces_key,
+                    [dataclasses.asdict(piece) for piece in manifest_pieces],
+                )
+
+    return tag_values, manifest_pieces
+
+
+def write_all(config: Config) -> None:
+    LOGGER.info(f"Writing all files for image: {config.image}")
+
+    commit_hash_tag = GitHelper.commit_hash_tag()
+    filename = get_manifest_filename(config)
+    tag_values, manifest_pieces = calculate_all(config)
+
+    write_build_history_line(config, tag_values, filename)
+    write_manifest(
+        config,
+        tag_values,
+        manifest_pieces,
+        filename=filename,
+        commit_hash_tag=commit_hash_tag,
+    )
 
     LOGGER.info(f"All files written for image: {config.image}")
 
@@ -131,5 +344,9 @@ if __name__ == "__main__":
         hist_lines_dir=True,
         manifests_dir=True,
         repository=True,
+        cache=True,
+        snapshot_manifests=True,
+        delta_manifests=True,
+        telemetry=True,
     )
     write_all(config)
@@ -1,53 +1,96 @@
 #!/usr/bin/env python3
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import datetime
 import logging
 
+import docker
+from docker.models.containers import Container
+
 from tagging.apps.common_cli_arguments import common_arguments_parser
 from tagging.apps.config import Config
 from tagging.hierarchy.get_taggers import get_taggers
+from tagging.taggers.probe_commands import get_probe_commands
 from tagging.utils.docker_runner import DockerRunner
 from tagging.utils.get_prefix import get_file_prefix, get_tag_prefix
+from tagging.utils.git_helper import GitHelper
+from tagging.utils.results_cache import ResultsCache
+from tagging.utils.version_probe import run_probe
 
 LOGGER = logging.getLogger(__name__)
 
 
-def get_tags(config: Config) -> list[str]:
-    LOGGER.info(f"Calculating tags for image: {config.image}")
+def tag_values_cache_key(config: Config, cache: ResultsCache, image_id: str) -> str:
+    # The commit and date taggers don't depend on the image,
+    # so their inputs are part of the key
+    today = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d")
+    return cache.key(
+        image_id, "tag_values", config.image, GitHelper.commit_hash(), today
+    )
+
 
+def calculate_tag_values(config: Config, container: Container) -> list[str]:
     taggers = get_taggers(config.image)
+    run_probe(container, get_probe_commands(taggers))
+    tag_values = []
+    for tagger in taggers:
+        tagger_name = tagger.__name__
+        tag_value = tagger(container)
+        LOGGER.info(
+            f"Calculated tag, tagger_name: {tagger_name} tag_value: {tag_value}"
+        )
+        tag_values.append(tag_value)
+    return tag_values
+
+
+def get_tags_from_values(config: Config, tag_values: list[str]) -> list[str]:
     tags_prefix = get_tag_prefix(config.variant)
     tags = [f"{config.full_image()}:{tags_prefix}-latest"]
-    with DockerRunner(config.full_image()) as container:
-        for tagger in taggers:
-            tagger_name = tagger.__name__
-            tag_value = tagger(container)
-            LOGGER.info(
-                f"Calculated tag, tagger_name: {tagger_name} tag_value: {tag_value}"
-            )
-            tags.append(f"{config.full_image()}:{tags_prefix}-{tag_value}")
+    for tag_value in tag_values:
+        tags.append(f"{config.full_image()}:{tags_prefix}-{tag_value}")
+    return tags
+
+
+def get_tags(config: Config) -> list[str]:
+    LOGGER.info(f"Calculating tags for image: {config.image}")
+
+    docker_client = docker.from_env()
+    image_id = docker_client.images.get(config.full_image()).id
+    cache = ResultsCache(config.cache_dir, bypass=config.no_cache)
+    cache_key = tag_values_cache_key(config, cache, image_id)
+    tag_values = cache.load(cache_key)
+    if tag_values is None:
+        with DockerRunner(
+            config.full_image(), docker_client, shell_session=True
+        ) as container:
+            tag_values = calculate_tag_values(config, container)
+        cache.store(cache_key, tag_values)
+    tags = get_tags_from_values(config, tag_values)
 
     LOGGER.info(f"Tags calculated for image: {config.image}")
     return tags
 
 
-def write_tags_file(config: Config) -> None:
+def write_tags(config: Config, tags: list[str]) -> None:
     LOGGER.info(f"Writing tags for image: {config.image}")
 
     file_prefix = get_file_prefix(config.variant)
     filename = f"{file_prefix}-{config.image}.txt"
     path = config.tags_dir / filename
     path.parent.mkdir(parents=True, exist_ok=True)
-    tags = get_tags(config)
     path.write_text("\n".join(tags))
 
     LOGGER.info(f"Tags written to: {path}")
 
 
+def write_tags_file(config: Config) -> None:
+    write_tags(config, get_tags(config))
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     config = common_arguments_parser(
-        registry=True, owner=True, image=True, variant=True, tags_dir=True
+        registry=True, owner=True, image=True, variant=True, tags_dir=True, cache=True
     )
     write_tags_file(config)
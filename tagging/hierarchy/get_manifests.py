@@ -1,12 +1,45 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 from tagging.hierarchy.images_hierarchy import ALL_IMAGES
+from tagging.manifests.apt_packages import (
+    apt_packages_manifest,
+    apt_packages_snapshot_manifest,
+)
+from tagging.manifests.conda_environment import (
+    conda_environment_manifest,
+    conda_environment_snapshot_manifest,
+)
+from tagging.manifests.image_layers import image_layers_manifest
 from tagging.manifests.manifest_interface import ManifestInterface
+from tagging.manifests.r_packages import (
+    r_packages_manifest,
+    r_packages_snapshot_manifest,
+)
 
+# Manifests which read the package metadata files instead of running commands,
+# so they also work with containers which were never started
+SNAPSHOT_MANIFESTS: dict[ManifestInterface, ManifestInterface] = {
+    # Reads the image, and not the container
+    image_layers_manifest: image_layers_manifest,
+    conda_environment_manifest: conda_environment_snapshot_manifest,
+    apt_packages_manifest: apt_packages_snapshot_manifest,
+    r_packages_manifest: r_packages_snapshot_manifest,
+}
 
-def get_manifests(image: str | None) -> list[ManifestInterface]:
+
+def get_manifests(
+    image: str | None, *, snapshot: bool = False
+) -> list[ManifestInterface]:
     if image is None:
         return []
     image_description = ALL_IMAGES[image]
     parent_manifests = get_manifests(image_description.parent_image)
-    return parent_manifests + image_description.manifests
+    manifests = parent_manifests + image_description.manifests
+    if snapshot:
+        return [SNAPSHOT_MANIFESTS.get(manifest, manifest) for manifest in manifests]
+    return manifests
+
+
+def need_running_container(manifests: list[ManifestInterface]) -> bool:
+    snapshot_manifests = SNAPSHOT_MANIFESTS.values()
+    return any(manifest not in snapshot_manifests for manifest in manifests)
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 
 from tagging.manifests.apt_packages import apt_packages_manifest
 from tagging.manifests.conda_environment import conda_environment_manifest
+from tagging.manifests.image_layers import image_layers_manifest
 from tagging.manifests.julia_packages import julia_packages_manifest
 from tagging.manifests.manifest_interface import ManifestInterface
 from tagging.manifests.r_packages import r_packages_manifest
@@ -34,7 +35,11 @@ ALL_IMAGES = {
             versions.mamba_tagger,
             versions.conda_tagger,
         ],
-        manifests=[conda_environment_manifest, apt_packages_manifest],
+        manifests=[
+            conda_environment_manifest,
+            apt_packages_manifest,
+            image_layers_manifest,
+        ],
     ),
     "base-notebook": ImageDescription(
         parent_image="docker-stacks-foundation",
@@ -1,13 +1,78 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import re
+
 from docker.models.containers import Container
+from tabulate import tabulate
+
+from tagging.manifests.manifest_interface import MarkdownPiece, PackageRecord
+from tagging.utils.container_files import iter_container_files
+from tagging.utils.quoted_output import quoted_output, quoted_text
+
+DPKG_STATUS_FILE = "/var/lib/dpkg/status"
+APT_LIST_CMD = "apt list --installed"
+# For example, `adduser/noble,now 3.137ubuntu1 all [installed]`
+APT_LIST_LINE = re.compile(r"^(\S+?)/\S+ (\S+) (\S+)(?: \[.*\])?$")
+
 
-from tagging.manifests.manifest_interface import MarkdownPiece
-from tagging.utils.quoted_output import quoted_output
+def parse_apt_list(output: str) -> list[PackageRecord]:
+    """Parses the `apt list --installed` output, other lines are skipped"""
+    packages = []
+    for line in output.splitlines():
+        if match := APT_LIST_LINE.match(line):
+            name, version, arch = match.groups()
+            packages.append(
+                PackageRecord(ecosystem="apt", name=name, version=version, arch=arch)
+            )
+    return packages
 
 
 def apt_packages_manifest(container: Container) -> MarkdownPiece:
+    apt_list = quoted_output(container, APT_LIST_CMD)
+    return MarkdownPiece(
+        title="## Apt Packages",
+        sections=[apt_list],
+        packages=parse_apt_list(apt_list),
+    )
+
+
+def _parse_dpkg_status(status: str) -> list[PackageRecord]:
+    packages = []
+    for paragraph in status.split("\n\n"):
+        fields = {}
+        for line in paragraph.splitlines():
+            # Continuation lines of multiline fields start with a space
+            if line[:1].isspace() or ":" not in line:
+                continue
+            key, _, value = line.partition(":")
+            fields[key] = value.strip()
+        # For example, `Status: install ok installed`
+        if fields.get("Status", "").endswith(" installed"):
+            packages.append(
+                PackageRecord(
+                    ecosystem="apt",
+                    name=fields["Package"],
+                    version=fields["Version"],
+                    arch=fields["Architecture"],
+                )
+            )
+    return sorted(packages, key=lambda package: package.name)
+
+
+def apt_packages_snapshot_manifest(container: Container) -> MarkdownPiece:
+    """Reads the dpkg database instead of running `apt`"""
+    _, status = next(
+        iter_container_files(container, DPKG_STATUS_FILE, lambda name: True)
+    )
+    packages = _parse_dpkg_status(status.decode())
+    packages_table = tabulate(
+        [[package.name, package.version, package.arch] for package in packages],
+        headers=["Package", "Version", "Architecture"],
+        tablefmt="plain",
+        disable_numparse=True,
+    )
     return MarkdownPiece(
         title="## Apt Packages",
-        sections=[quoted_output(container, "apt list --installed")],
+        sections=[quoted_text(DPKG_STATUS_FILE, packages_table)],
+        packages=packages,
     )
@@ -1,7 +1,8 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import json
 import textwrap
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import plumbum
 
@@ -25,31 +26,76 @@ class BuildInfoConfig:
         return f"{self.registry}/{self.owner}/{self.image}"
 
 
-def build_info_manifest(config: BuildInfoConfig) -> MarkdownPiece:
-    """BuildInfo doesn't fall under common interface, and we run it separately"""
+@dataclass(frozen=True)
+class BuildInfo:
+    build_timestamp: str
+    docker_image: str
+    image_id: str
+    image_size: str
+    image_size_bytes: int
+    commit_hash: str
+    commit_url: str
+    commit_message: str
+    # Non-empty layers from the bottom one, with `size` in bytes and `created_by`,
+    # the size checks of the tests compare the new images with them
+    layers: list[dict[str, int | str]] = field(default_factory=list)
+
+
+def get_layer_sizes(image: str) -> list[dict[str, int | str]]:
+    # `docker history` lists the layers from the top one, including the empty ones
+    history = docker[
+        "history",
+        image,
+        "--no-trunc",
+        "--human=false",
+        "--format",
+        "{{.Size}}\t{{json .CreatedBy}}",
+    ]()
+    layers: list[dict[str, int | str]] = []
+    for line in reversed(history.splitlines()):
+        size, _, created_by = line.partition("\t")
+        if int(size) > 0:
+            layers.append({"size": int(size), "created_by": json.loads(created_by)})
+    return layers
+
+
+def get_build_info(config: BuildInfoConfig) -> BuildInfo:
     commit_hash = GitHelper.commit_hash()
     commit_hash_tag = GitHelper.commit_hash_tag()
-    commit_message = GitHelper.commit_message()
 
     # Unfortunately, `docker images` doesn't work when specifying `docker.io` as registry
     fixed_registry = config.registry + "/" if config.registry != "docker.io" else ""
+    latest_image = f"{fixed_registry}{config.owner}/{config.image}:latest"
 
-    image_size = docker[
-        "images",
-        f"{fixed_registry}{config.owner}/{config.image}:latest",
-        "--format",
-        "{{.Size}}",
-    ]().rstrip()
-
-    build_info = textwrap.dedent(f"""\
-        - Build timestamp: {config.build_timestamp}
-        - Docker image: `{config.full_image()}:{commit_hash_tag}`
-        - Docker image size: {image_size}
-        - Git commit SHA: [{commit_hash}](https://github.com/{config.repository}/commit/{commit_hash})
+    image_size = docker["images", latest_image, "--format", "{{.Size}}"]().rstrip()
+    image_id, image_size_bytes = docker[
+        "image", "inspect", latest_image, "--format", "{{.Id}} {{.Size}}"
+    ]().split()
+
+    return BuildInfo(
+        build_timestamp=config.build_timestamp,
+        docker_image=f"{config.full_image()}:{commit_hash_tag}",
+        image_id=image_id,
+        image_size=image_size,
+        image_size_bytes=int(image_size_bytes),
+        commit_hash=commit_hash,
+        commit_url=f"https://github.com/{config.repository}/commit/{commit_hash}",
+        commit_message=GitHelper.commit_message(),
+        layers=get_layer_sizes(latest_image),
+    )
+
+
+def build_info_piece(build_info: BuildInfo) -> MarkdownPiece:
+    build_info_text = textwrap.dedent(f"""\
+        - Build timestamp: {build_info.build_timestamp}
+        - Docker image: `{build_info.docker_image}`
+        - Docker image ID: `{build_info.image_id}`
+        - Docker image size: {build_info.image_size}
+        - Git commit SHA: [{build_info.commit_hash}]({build_info.commit_url})
         - Git commit message:
 
         ```text
         {{message}}
-        ```""").format(message=commit_message)
+        ```""").format(message=build_info.commit_message)
 
-    return MarkdownPiece(title="## Build Info", sections=[build_info])
+    return MarkdownPiece(title="## Build Info", sections=[build_info_text])
@@ -1,19 +1,113 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import json
+import re
+
 from docker.models.containers import Container
+from tabulate import tabulate
 
-from tagging.manifests.manifest_interface import MarkdownPiece
+from tagging.manifests.manifest_interface import MarkdownPiece, PackageRecord
+from tagging.utils.container_files import get_container_env, iter_container_files
 from tagging.utils.docker_runner import DockerRunner
-from tagging.utils.quoted_output import quoted_output
+from tagging.utils.quoted_output import quoted_output, quoted_text
+
+CONDA_SUBDIRS = ("noarch", "linux-64", "linux-aarch64")
+MAMBA_LIST_CMD = "mamba list"
+# Separator lines of the `mamba list` table
+TABLE_SEPARATOR = re.compile(r"^[\s─-]+$")
+
+
+def _package_record(name: str, version: str, build: str, channel: str) -> PackageRecord:
+    # Packages installed by `pip` are listed with the `pypi` channel
+    ecosystem = "pip" if channel == "pypi" else "conda"
+    return PackageRecord(
+        ecosystem=ecosystem, name=name, version=version, build=build, channel=channel
+    )
+
+
+def parse_mamba_list(output: str) -> list[PackageRecord]:
+    """Parses the `mamba list` (or `conda list`) table, the header is skipped"""
+    packages: list[PackageRecord] = []
+    in_table = False
+    for line in output.splitlines():
+        columns = line.lstrip("# ").split()
+        if columns[:2] == ["Name", "Version"]:
+            in_table = True
+            continue
+        if not in_table or not columns or TABLE_SEPARATOR.match(line):
+            continue
+        if columns[0] == "```":
+            break
+        if len(columns) < 3:
+            continue
+        name, version, build, *channel = columns
+        packages.append(_package_record(name, version, build, "".join(channel[:1])))
+    return packages
 
 
 def conda_environment_manifest(container: Container) -> MarkdownPiece:
+    mamba_list = quoted_output(container, MAMBA_LIST_CMD)
     return MarkdownPiece(
         title="## Python Packages",
         sections=[
             DockerRunner.exec_cmd(container, "python --version"),
             quoted_output(container, "conda info"),
             quoted_output(container, "mamba info"),
-            quoted_output(container, "mamba list"),
+            mamba_list,
+        ],
+        packages=parse_mamba_list(mamba_list),
+    )
+
+
+def _channel_name(channel: str) -> str:
+    # For example, `https://conda.anaconda.org/conda-forge/linux-64` -> `conda-forge`
+    channel = channel.removeprefix("https://conda.anaconda.org/")
+    name, _, subdir = channel.rpartition("/")
+    return name if subdir in CONDA_SUBDIRS else channel
+
+
+def conda_environment_snapshot_manifest(container: Container) -> MarkdownPiece:
+    """Reads the conda package metadata instead of running `mamba`"""
+    conda_meta_dir = get_container_env(container)["CONDA_DIR"] + "/conda-meta"
+    metadata = (
+        json.loads(content)
+        for _, content in iter_container_files(
+            container, conda_meta_dir, lambda name: name.endswith(".json")
+        )
+    )
+    packages = sorted(
+        (
+            _package_record(
+                package["name"],
+                package["version"],
+                package.get("build", ""),
+                _channel_name(package.get("channel", "")),
+            )
+            for package in metadata
+        ),
+        key=lambda package: package.name,
+    )
+    python_version = next(
+        package.version for package in packages if package.name == "python"
+    )
+    # The Markdown table is rendered from the package records
+    packages_table = tabulate(
+        [
+            [package.name, package.version, package.build, package.channel]
+            for package in packages
+        ],
+        headers=["Name", "Version", "Build", "Channel"],
+        tablefmt="plain",
+        # Versions are strings, `1.10` must not become `1.1`
+        disable_numparse=True,
+    )
+    return MarkdownPiece(
+        title="## Python Packages",
+        sections=[
+            f"Python {python_version}",
+            "Packages installed with `pip` are not listed, as they have no conda metadata.",
+            quoted_text(f"{conda_meta_dir}/*.json", packages_table),
         ],
+        packages=packages,
+        skipped_ecosystems=["pip"],
     )
@@ -0,0 +1,207 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import io
+import json
+import logging
+import re
+import tarfile
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from docker.models.containers import Container
+from docker.models.images import Image
+from tabulate import tabulate
+
+from tagging.manifests.manifest_interface import MarkdownPiece
+from tagging.utils.container_files import ChunksReader
+
+LOGGER = logging.getLogger(__name__)
+
+# Members of the saved image up to this size are read into memory,
+# these are the JSON files and the small layers
+SMALL_MEMBER_SIZE = 1024 * 1024
+LARGEST_DIRS_COUNT = 3
+INSTRUCTION_MAX_LENGTH = 80
+WHITEOUT_PREFIX = ".wh."
+OPAQUE_WHITEOUT = ".wh..wh..opq"
+
+
+@dataclass
+class LayerFiles:
+    # Sizes of the files added by the layer, directories are skipped
+    files: dict[str, int] = field(default_factory=dict)
+    # Paths of the lower layers removed by the layer, ending with `/` for the opaque directories
+    removed: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class LayerStats:
+    instruction: str
+    size: int
+    # Bytes of the lower layers hidden by this layer, when it writes the same files again
+    # (for example, `fix-permissions` or `chown`) or deletes them
+    rewritten: int
+    largest_dirs: list[tuple[str, int]]
+
+
+def _read_layer(archive: tarfile.TarFile) -> LayerFiles:
+    layer = LayerFiles()
+    for member in archive:
+        path = member.name.removeprefix("./")
+        directory, _, name = path.rpartition("/")
+        if name == OPAQUE_WHITEOUT:
+            layer.removed.append(f"{directory}/")
+        elif name.startswith(WHITEOUT_PREFIX):
+            layer.removed.append(
+                f"{directory}/{name.removeprefix(WHITEOUT_PREFIX)}".lstrip("/")
+            )
+        elif not member.isdir():
+            layer.files[path] = member.size if member.isreg() else 0
+    return layer
+
+
+def read_saved_image(
+    image: Image,
+) -> tuple[dict[str, LayerFiles], dict[str, Any]]:
+    """Streams `docker save` output without storing it, the layers aren't extracted.
+    Returns the files of the layers and the JSON files, both by the archive member name
+    """
+    LOGGER.info(f"Streaming layers of image: {image.id}")
+    layers: dict[str, LayerFiles] = {}
+    json_files: dict[str, Any] = {}
+    reader = io.BufferedReader(ChunksReader(image.save()))
+    with tarfile.open(fileobj=reader, mode="r|") as saved_image:
+        for member in saved_image:
+            if not member.isfile():
+                continue
+            file = saved_image.extractfile(member)
+            assert file is not None
+            try:
+                if member.size <= SMALL_MEMBER_SIZE:
+                    content = file.read()
+                    try:
+                        json_files[member.name] = json.loads(content)
+                        continue
+                    except ValueError:
+                        pass
+                    with tarfile.open(fileobj=io.BytesIO(content), mode="r:*") as layer:
+                        layers[member.name] = _read_layer(layer)
+                else:
+                    # The layers may be compressed, for example, with the containerd image store
+                    with tarfile.open(fileobj=file, mode="r|*") as layer:
+                        layers[member.name] = _read_layer(layer)
+            except tarfile.ReadError:
+                LOGGER.info(f"Skipping: {member.name}, it isn't a layer")
+    return layers, json_files
+
+
+def _format_instruction(created_by: str) -> str:
+    # For example, `/bin/sh -c #(nop)  ENV LANG=C.UTF-8` or `RUN /bin/bash -c ... # buildkit`
+    instruction = created_by.removesuffix("# buildkit").strip()
+    instruction = re.sub(r"^/bin/sh -c #\(nop\)\s*", "", instruction)
+    instruction = " ".join(instruction.split())
+    if len(instruction) > INSTRUCTION_MAX_LENGTH:
+        instruction = instruction[: INSTRUCTION_MAX_LENGTH - 3] + "..."
+    return instruction
+
+
+def _largest_dirs(layer: LayerFiles) -> list[tuple[str, int]]:
+    # Files are counted in the directories of the first two levels, for example, `/opt/conda`
+    dir_sizes: Counter[str] = Counter()
+    for path, size in layer.files.items():
+        dir_sizes["/" + "/".join(path.split("/")[:-1][:2])] += size
+    return [(path, size) for path, size in dir_sizes.most_common() if size > 0][
+        :LARGEST_DIRS_COUNT
+    ]
+
+
+def get_layer_stats(
+    layers: list[LayerFiles], instructions: list[str]
+) -> list[LayerStats]:
+    """Layers are ordered from the bottom one, as in the image config"""
+    visible: dict[str, int] = {}
+    stats = []
+    for layer, instruction in zip(layers, instructions, strict=True):
+        rewritten = 0
+        if layer.removed:
+            removed_prefixes = tuple(
+                path if path.endswith("/") else f"{path}/" for path in layer.removed
+            )
+            removed_paths = set(layer.removed)
+            for path in list(visible):
+                if path in removed_paths or path.startswith(removed_prefixes):
+                    rewritten += visible.pop(path)
+        for path, size in layer.files.items():
+            rewritten += visible.get(path, 0)
+            visible[path] = size
+        stats.append(
+            LayerStats(
+                instruction=instruction,
+                size=sum(layer.files.values()),
+                rewritten=rewritten,
+                largest_dirs=_largest_dirs(layer),
+            )
+        )
+    return stats
+
+
+def get_image_layer_stats(image: Image) -> list[LayerStats]:
+    layers, json_files = read_saved_image(image)
+    # `manifest.json` is written by `docker save` both in the legacy and in the OCI layout
+    image_manifest = json_files["manifest.json"][0]
+    config = json_files[image_manifest["Config"]]
+    instructions = [
+        _format_instruction(entry.get("created_by", ""))
+        for entry in config.get("history", [])
+        if not entry.get("empty_layer", False)
+    ]
+    layer_names = image_manifest["Layers"]
+    if len(instructions) != len(layer_names):
+        LOGGER.warning(
+            f"Image history doesn't match the layers of image: {image.id}, "
+            "the instructions are omitted"
+        )
+        instructions = [""] * len(layer_names)
+    return get_layer_stats([layers[name] for name in layer_names], instructions)
+
+
+def format_size(size: float) -> str:
+    # Decimal units, the same as `docker images`
+    for unit in ["B", "kB", "MB"]:
+        if size < 1000:
+            return f"{size:.3g}{unit}"
+        size /= 1000
+    return f"{size:.3g}GB"
+
+
+def image_layers_piece(stats: list[LayerStats]) -> MarkdownPiece:
+    total_size = sum(layer.size for layer in stats)
+    total_rewritten = sum(layer.rewritten for layer in stats)
+    summary = (
+        f"{len(stats)} layers, total size: {format_size(total_size)}, "
+        f"rewritten by the upper layers: {format_size(total_rewritten)}"
+    )
+    layers_table = tabulate(
+        [
+            [
+                index,
+                format_size(layer.size),
+                format_size(layer.rewritten) if layer.rewritten else "",
+                ", ".join(
+                    f"`{path}` {format_size(size)}" for path, size in layer.largest_dirs
+                ),
+                layer.instruction.replace("|", "\\|"),
+            ]
+            for index, layer in enumerate(stats, start=1)
+        ],
+        headers=["Layer", "Size", "Rewritten", "Largest directories", "Instruction"],
+        tablefmt="github",
+        disable_numparse=True,
+    )
+    return MarkdownPiece(title="## Image Layers", sections=[summary, layers_table])
+
+
+def image_layers_manifest(container: Container) -> MarkdownPiece:
+    """Reads the image of the container, so it doesn't need a running container"""
+    return image_layers_piece(get_image_layer_stats(container.image))
@@ -1,18 +1,38 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import re
+
 from docker.models.containers import Container
 
-from tagging.manifests.manifest_interface import MarkdownPiece
+from tagging.manifests.manifest_interface import MarkdownPiece, PackageRecord
 from tagging.utils.quoted_output import quoted_output
 
+PKG_STATUS_CMD = "julia -E 'import Pkg; Pkg.status()'"
+# For example, `  [7073ff75] IJulia v1.26.0`, there might be a status marker before the UUID
+PKG_STATUS_LINE = re.compile(r"\[[0-9a-f]{8}\] (\S+) v(\S+)")
+
+
+def parse_julia_pkg_status(output: str) -> list[PackageRecord]:
+    """Parses the `Pkg.status()` output, other lines are skipped"""
+    packages = []
+    for line in output.splitlines():
+        if match := PKG_STATUS_LINE.search(line):
+            name, version = match.groups()
+            packages.append(
+                PackageRecord(ecosystem="julia", name=name, version=version)
+            )
+    return packages
+
 
 def julia_packages_manifest(container: Container) -> MarkdownPiece:
+    pkg_status = quoted_output(container, PKG_STATUS_CMD)
     return MarkdownPiece(
         title="## Julia Packages",
         sections=[
             quoted_output(
                 container, "julia -E 'using InteractiveUtils; versioninfo()'"
             ),
-            quoted_output(container, "julia -E 'import Pkg; Pkg.status()'"),
+            pkg_status,
         ],
+        packages=parse_julia_pkg_status(pkg_status),
     )
@@ -1,15 +1,33 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 
 from docker.models.containers import Container
 
 
+@dataclass(frozen=True)
+class PackageRecord:
+    # One of: "conda", "pip", "apt", "r", "julia"
+    ecosystem: str
+    name: str
+    version: str
+    build: str = ""
+    channel: str = ""
+    arch: str = ""
+
+
 @dataclass(frozen=True)
 class MarkdownPiece:
     title: str
     sections: list[str]
+    # Structured data of the piece, written to the JSON manifest,
+    # the package list is the last section of a piece with packages
+    packages: list[PackageRecord] = field(default_factory=list)
+    # Ecosystems whose packages the piece doesn't list completely,
+    # they are skipped when the manifests are compared
+    skipped_ecosystems: list[str] = field(default_factory=list)
 
     def __post_init__(self) -> None:
         # All pieces are H2
@@ -18,5 +36,18 @@ class MarkdownPiece:
     def get_str(self) -> str:
         return "\n\n".join([self.title, *self.sections])
 
+    def info_sections(self) -> list[str]:
+        """Sections of the piece except the package list, e.g. `conda info`"""
+        return self.sections[:-1] if self.packages else self.sections
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "MarkdownPiece":
+        return MarkdownPiece(
+            title=data["title"],
+            sections=data["sections"],
+            packages=[PackageRecord(**package) for package in data["packages"]],
+            skipped_ecosystems=data.get("skipped_ecosystems", []),
+        )
+
 
 ManifestInterface = Callable[[Container], MarkdownPiece]
@@ -1,18 +1,116 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import json
+import re
+from typing import Any
+
 from docker.models.containers import Container
+from tabulate import tabulate
+
+from tagging.manifests.manifest_interface import MarkdownPiece, PackageRecord
+from tagging.utils.container_files import (
+    get_container_env,
+    iter_container_files,
+    read_container_file,
+)
+from tagging.utils.quoted_output import quoted_output, quoted_text
+
+INSTALLED_PACKAGES_CMD = "R --silent -e 'installed.packages(.Library)[, c(1,3)]'"
+# For example, `base       "base"       "4.4.1"`
+INSTALLED_PACKAGES_ROW = re.compile(r'^\S+\s+"([^"]+)"\s+"([^"]+)"$')
 
-from tagging.manifests.manifest_interface import MarkdownPiece
-from tagging.utils.quoted_output import quoted_output
+
+def parse_r_installed_packages(output: str) -> list[PackageRecord]:
+    """Parses the printed `installed.packages()` matrix of names and versions"""
+    packages = []
+    for line in output.splitlines():
+        if match := INSTALLED_PACKAGES_ROW.match(line.strip()):
+            name, version = match.groups()
+            packages.append(PackageRecord(ecosystem="r", name=name, version=version))
+    return packages
 
 
 def r_packages_manifest(container: Container) -> MarkdownPiece:
+    installed_packages = quoted_output(container, INSTALLED_PACKAGES_CMD)
     return MarkdownPiece(
         title="## R Packages",
         sections=[
             quoted_output(container, "R --version"),
-            quoted_output(
-                container, "R --silent -e 'installed.packages(.Library)[, c(1,3)]'"
-            ),
+            installed_packages,
+        ],
+        packages=parse_r_installed_packages(installed_packages),
+    )
+
+
+# This is the `.Library` of the R installed by conda, relative to `${CONDA_DIR}`
+R_LIBRARY_DIR = "lib/R/library"
+# For example, `lib/R/library/base/DESCRIPTION`
+R_DESCRIPTION_PATH = re.compile(rf"{R_LIBRARY_DIR}/[^/]+/DESCRIPTION")
+
+
+def _is_r_conda_metadata(name: str) -> bool:
+    # For example, `conda-meta/r-base-4.4.1-h1234567_0.json`,
+    # the base R packages are installed by `r-base`
+    return name.startswith("conda-meta/r-") and name.endswith(".json")
+
+
+def get_r_description_paths(conda_metadata: list[dict[str, Any]]) -> list[str]:
+    """The `DESCRIPTION` files of the R library, listed in the files of the conda packages"""
+    return sorted(
+        path
+        for package in conda_metadata
+        for path in package.get("files", [])
+        if R_DESCRIPTION_PATH.fullmatch(path)
+    )
+
+
+def _parse_description(description: str) -> PackageRecord:
+    fields = {}
+    for line in description.splitlines():
+        key, sep, value = line.partition(":")
+        if sep and not line[:1].isspace():
+            fields[key] = value.strip()
+    return PackageRecord(
+        ecosystem="r", name=fields["Package"], version=fields["Version"]
+    )
+
+
+def r_packages_snapshot_manifest(container: Container) -> MarkdownPiece:
+    """Reads the `DESCRIPTION` files of the R library instead of running `R`.
+    The R library is hundreds of MB, so the files are listed from the small conda metadata
+    of the R packages, and only the `DESCRIPTION` files are streamed out of the container.
+    All the R packages in the images are installed with conda"""
+    conda_dir = get_container_env(container)["CONDA_DIR"]
+    conda_metadata = [
+        json.loads(content)
+        for _, content in iter_container_files(
+            container, f"{conda_dir}/conda-meta", _is_r_conda_metadata
+        )
+    ]
+    packages = sorted(
+        (
+            _parse_description(
+                read_container_file(container, f"{conda_dir}/{path}").decode(
+                    errors="replace"
+                )
+            )
+            for path in get_r_description_paths(conda_metadata)
+        ),
+        key=lambda package: package.name,
+    )
+    # The version of the `base` package is the version of R itself
+    r_version = next(package.version for package in packages if package.name == "base")
+    packages_table = tabulate(
+        [[package.name, package.version] for package in packages],
+        headers=["Package", "Version"],
+        tablefmt="plain",
+        disable_numparse=True,
+    )
+    return MarkdownPiece(
+        title="## R Packages",
+        sections=[
+            f"R version {r_version}",
+            quoted_text(f"{conda_dir}/{R_LIBRARY_DIR}/*/DESCRIPTION", packages_table),
         ],
+        packages=packages,
     )
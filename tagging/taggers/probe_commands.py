@@ -0,0 +1,37 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from collections.abc import Callable
+
+from tagging.taggers.tagger_interface import TaggerInterface
+
+# Commands whose outputs the taggers parse, registered by the `probes` decorator
+# They are all run in a single exec before the tags are calculated,
+# and a tagger falls back to running its command if it's not listed here
+TAGGER_COMMANDS: dict[TaggerInterface, list[str]] = {}
+
+
+def program_version_cmd(program: str) -> str:
+    return f"{program} --version"
+
+
+def pip_show_cmd(package: str) -> str:
+    return f"pip show {package}"
+
+
+def probes(*cmds: str) -> Callable[[TaggerInterface], TaggerInterface]:
+    """Registers the commands the tagger runs, the tagger itself is not changed"""
+
+    def register(tagger: TaggerInterface) -> TaggerInterface:
+        TAGGER_COMMANDS[tagger] = list(cmds)
+        return tagger
+
+    return register
+
+
+def get_probe_commands(taggers: list[TaggerInterface]) -> list[str]:
+    # A dict keeps the order and removes the duplicates
+    return list(
+        dict.fromkeys(
+            cmd for tagger in taggers for cmd in TAGGER_COMMANDS.get(tagger, [])
+        )
+    )
@@ -2,14 +2,15 @@
 # Distributed under the terms of the Modified BSD License.
 from docker.models.containers import Container
 
-from tagging.utils.docker_runner import DockerRunner
+from tagging.taggers.probe_commands import probes
+from tagging.utils.version_probe import probed_output
 
+OS_RELEASE_CMD = "cat /etc/os-release"
 
+
+@probes(OS_RELEASE_CMD)
 def ubuntu_version_tagger(container: Container) -> str:
-    os_release = DockerRunner.exec_cmd(
-        container,
-        "cat /etc/os-release",
-    ).split("\n")
+    os_release = probed_output(container, OS_RELEASE_CMD).split("\n")
     for line in os_release:
         if line.startswith("VERSION_ID"):
             return "ubuntu-" + line.split("=")[1].strip('"')
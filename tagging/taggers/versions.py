@@ -2,62 +2,70 @@
 # Distributed under the terms of the Modified BSD License.
 from docker.models.containers import Container
 
-from tagging.utils.docker_runner import DockerRunner
+from tagging.taggers.probe_commands import pip_show_cmd, probes, program_version_cmd
+from tagging.utils.version_probe import probed_output
 
 
 def _get_program_version(container: Container, program: str) -> str:
-    return DockerRunner.exec_cmd(container, cmd=f"{program} --version")
+    return probed_output(container, cmd=program_version_cmd(program))
 
 
 def _get_pip_package_version(container: Container, package: str) -> str:
     PIP_VERSION_PREFIX = "Version: "
 
-    package_info = DockerRunner.exec_cmd(
-        container,
-        cmd=f"pip show {package}",
-    )
+    package_info = probed_output(container, cmd=pip_show_cmd(package))
     version_line = package_info.split("\n")[1]
     assert version_line.startswith(PIP_VERSION_PREFIX)
     return version_line[len(PIP_VERSION_PREFIX) :]
 
 
+@probes(program_version_cmd("python"))
 def python_tagger(container: Container) -> str:
     return "python-" + _get_program_version(container, "python").split()[1]
 
 
+@probes(program_version_cmd("python"))
 def python_major_minor_tagger(container: Container) -> str:
     full_version = python_tagger(container)
     return full_version[: full_version.rfind(".")]
 
 
+@probes(program_version_cmd("mamba"))
 def mamba_tagger(container: Container) -> str:
     return "mamba-" + _get_program_version(container, "mamba")
 
 
+@probes(program_version_cmd("conda"))
 def conda_tagger(container: Container) -> str:
     return "conda-" + _get_program_version(container, "conda").split()[1]
 
 
+@probes(program_version_cmd("jupyter-notebook"))
 def jupyter_notebook_tagger(container: Container) -> str:
     return "notebook-" + _get_program_version(container, "jupyter-notebook")
 
 
+@probes(program_version_cmd("jupyter-lab"))
 def jupyter_lab_tagger(container: Container) -> str:
     return "lab-" + _get_program_version(container, "jupyter-lab")
 
 
+@probes(program_version_cmd("jupyterhub"))
 def jupyter_hub_tagger(container: Container) -> str:
     return "hub-" + _get_program_version(container, "jupyterhub")
 
 
+@probes(program_version_cmd("R"))
 def r_tagger(container: Container) -> str:
     return "r-" + _get_program_version(container, "R").split()[2]
 
 
+@probes(program_version_cmd("julia"))
 def julia_tagger(container: Container) -> str:
     return "julia-" + _get_program_version(container, "julia").split()[2]
 
 
+@probes(pip_show_cmd("tensorflow"), pip_show_cmd("tensorflow-cpu"))
 def tensorflow_tagger(container: Container) -> str:
     try:
         return "tensorflow-" + _get_pip_package_version(container, "tensorflow")
@@ -65,10 +73,12 @@ def tensorflow_tagger(container: Container) -> str:
         return "tensorflow-" + _get_pip_package_version(container, "tensorflow-cpu")
 
 
+@probes(pip_show_cmd("torch"))
 def pytorch_tagger(container: Container) -> str:
     return "pytorch-" + _get_pip_package_version(container, "torch").split("+")[0]
 
 
+@probes(program_version_cmd("spark-submit"))
 def spark_tagger(container: Container) -> str:
     SPARK_VERSION_LINE_PREFIX = r"   /___/ .__/\_,_/_/ /_/\_\   version"
 
@@ -82,5 +92,6 @@ def spark_tagger(container: Container) -> str:
     return "spark-" + version_line.split(" ")[-1]
 
 
+@probes(program_version_cmd("java"))
 def java_tagger(container: Container) -> str:
     return "java-" + _get_program_version(container, "java").split()[1]
@@ -0,0 +1,23 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import threading
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from tagging.tests.fake_registry import FakeRegistry
+
+
+@pytest.fixture
+def fake_registry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[FakeRegistry]:
+    # No credentials are read from the docker config of the host
+    monkeypatch.setenv("DOCKER_CONFIG", str(tmp_path))
+    registry = FakeRegistry()
+    thread = threading.Thread(target=registry.serve_forever, daemon=True)
+    thread.start()
+    yield registry
+    registry.shutdown()
+    registry.server_close()
@@ -0,0 +1,34 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import io
+import tarfile
+from collections.abc import Iterator
+
+
+class FakeContainer:
+    """Container which only has the files, as a never started container,
+    and records the paths streamed out of it"""
+
+    name = "fake-container"
+
+    def __init__(self, files: dict[str, bytes], env: dict[str, str]):
+        self.files = files
+        self.attrs = {
+            "Config": {"Env": [f"{key}={value}" for key, value in env.items()]}
+        }
+        self.archived_paths: list[str] = []
+
+    def get_archive(self, path: str) -> tuple[Iterator[bytes], dict[str, str]]:
+        """The same as the Docker API, the archive names start with the base name of the path"""
+        self.archived_paths.append(path)
+        parent = path.rpartition("/")[0]
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            for file_path, content in self.files.items():
+                if file_path != path and not file_path.startswith(path + "/"):
+                    continue
+                member = tarfile.TarInfo(file_path.removeprefix(parent + "/"))
+                member.size = len(content)
+                archive.addfile(member, io.BytesIO(content))
+        data = buffer.getvalue()
+        return iter([data[:100], data[100:]]), {}
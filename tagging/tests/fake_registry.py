@@ -0,0 +1,110 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import hashlib
+import json
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from tagging.utils.registry_client import DOCKER_MANIFEST
+
+TOKEN = "fake-token"
+
+
+def digest_of(content: bytes) -> str:
+    return "sha256:" + hashlib.sha256(content).hexdigest()
+
+
+class FakeRegistry(ThreadingHTTPServer):
+    """Registry which challenges every request without the token,
+    and serves the manifests and the blobs from memory.
+    The manifests listed in `broken_manifests` are served as invalid JSON"""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeRegistryHandler)
+        self.manifests: dict[str, tuple[bytes, str]] = {}
+        self.blobs: dict[str, bytes] = {}
+        self.requests: Counter[str] = Counter()
+        self.broken_manifests: set[str] = set()
+
+    @property
+    def registry(self) -> str:
+        return f"127.0.0.1:{self.server_address[1]}"
+
+    def add_image(
+        self,
+        repository: str,
+        tag: str,
+        architecture: str,
+        layer_sizes: tuple[int, ...] = (),
+    ) -> str:
+        config = json.dumps({"architecture": architecture, "os": "linux"}).encode()
+        self.blobs[digest_of(config)] = config
+        manifest = json.dumps(
+            {
+                "schemaVersion": 2,
+                "mediaType": DOCKER_MANIFEST,
+                "config": {"digest": digest_of(config), "size": len(config)},
+                "layers": [
+                    {"digest": digest_of(str(index).encode()), "size": size}
+                    for index, size in enumerate(layer_sizes)
+                ],
+            }
+        ).encode()
+        digest = digest_of(manifest)
+        for reference in (tag, digest):
+            self.manifests[f"{repository}:{reference}"] = (manifest, DOCKER_MANIFEST)
+        return digest
+
+
+class FakeRegistryHandler(BaseHTTPRequestHandler):
+    server: FakeRegistry
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(
+        self, status: int, body: bytes = b"", headers: dict[str, str] | None = None
+    ) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _handle(self) -> None:
+        self.server.requests[f"{self.command} {self.path.partition('?')[0]}"] += 1
+        if self.path.startswith("/token"):
+            self._send(200, json.dumps({"token": TOKEN, "expires_in": 300}).encode())
+            return
+        if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            self.server.requests["401"] += 1
+            realm = f"http://{self.server.registry}/token"
+            challenge = f'Bearer realm="{realm}",service="fake"'
+            self._send(401, headers={"WWW-Authenticate": challenge})
+            return
+
+        # For example, `/v2/jupyter/base-notebook/manifests/latest`
+        repository, kind, reference = self.path.removeprefix("/v2/").rsplit("/", 2)
+        if kind == "blobs":
+            self._send(200, self.server.blobs[reference])
+            return
+        key = f"{repository}:{reference}"
+        if self.command == "PUT":
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            self.server.manifests[key] = (body, self.headers["Content-Type"])
+            self._send(201, headers={"Docker-Content-Digest": digest_of(body)})
+            return
+        if key in self.server.broken_manifests:
+            self._send(200, b"<html>Service unavailable</html>")
+            return
+        if key not in self.server.manifests:
+            self._send(404)
+            return
+        body, media_type = self.server.manifests[key]
+        headers = {"Content-Type": media_type, "Docker-Content-Digest": digest_of(body)}
+        self._send(200, body, headers)
+
+    do_GET = do_HEAD = do_PUT = _handle
@@ -0,0 +1,69 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest  # type: ignore
+
+from tagging.apps import apply_tags as apply_tags_module
+from tagging.apps.apply_tags import push_tags, record_push_telemetry
+from tagging.apps.config import Config
+from tagging.tests.fake_registry import FakeRegistry
+from tagging.utils.registry_client import RegistryClient
+
+REPOSITORY = "jupyter/base-notebook"
+
+
+def test_push_no_tags() -> None:
+    docker_client = Mock()
+    assert push_tags(docker_client, [], max_workers=8) == []
+    docker_client.images.push.assert_not_called()
+
+
+def _push_and_record(
+    fake_registry: FakeRegistry, tmp_path: Path, digest: str
+) -> dict[str, Any]:
+    docker_client = Mock()
+    docker_client.images.push.return_value = [
+        {"status": "Pushed", "id": "layer"},
+        {"status": f"x86_64-latest: digest: {digest} size: 1234"},
+    ]
+    tag = f"{fake_registry.registry}/{REPOSITORY}:x86_64-latest"
+    results = push_tags(docker_client, [tag], max_workers=8)
+    config = Config(image="base-notebook", variant="default", platform="x86_64")
+    record_push_telemetry(config, tmp_path, results, elapsed=12.3)
+    (telemetry_file,) = tmp_path.glob("*-telemetry.json")
+    telemetry: dict[str, Any] = json.loads(telemetry_file.read_text())
+    return telemetry
+
+
+@pytest.fixture
+def registry_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The shared client would keep the tokens of the previous tests
+    monkeypatch.setattr(apply_tags_module, "get_registry_client", RegistryClient)
+
+
+@pytest.mark.usefixtures("registry_client")
+def test_push_telemetry(fake_registry: FakeRegistry, tmp_path: Path) -> None:
+    digest = fake_registry.add_image(
+        REPOSITORY, "x86_64-latest", "amd64", layer_sizes=(1000, 234)
+    )
+    telemetry = _push_and_record(fake_registry, tmp_path, digest)
+    assert telemetry["phases"] == {"push": 12.3}
+    assert telemetry["sizes"] == {"registry_layers": 1234}
+
+
+@pytest.mark.parametrize("broken", [False, True])
+@pytest.mark.usefixtures("registry_client")
+def test_push_telemetry_without_manifest(
+    fake_registry: FakeRegistry, tmp_path: Path, broken: bool
+) -> None:
+    """The push succeeded, so failing to get the size only skips it"""
+    digest = "sha256:" + "0" * 64
+    if broken:
+        fake_registry.broken_manifests.add(f"{REPOSITORY}:{digest}")
+    telemetry = _push_and_record(fake_registry, tmp_path, digest)
+    assert telemetry["phases"] == {"push": 12.3}
+    assert telemetry["sizes"] == {}
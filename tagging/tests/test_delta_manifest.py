@@ -0,0 +1,101 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from tagging.apps import write_manifest as write_manifest_module
+from tagging.apps.config import Config
+from tagging.apps.expand_manifest import expand_manifest
+from tagging.apps.write_manifest import write_manifest
+from tagging.manifests.build_info import BuildInfo, BuildInfoConfig
+from tagging.manifests.manifest_interface import MarkdownPiece, PackageRecord
+from tagging.utils.get_prefix import get_file_prefix
+
+COMMIT_HASH_TAG = "0123456789ab"
+
+
+def _build_info(config: BuildInfoConfig) -> BuildInfo:
+    return BuildInfo(
+        build_timestamp=config.build_timestamp,
+        docker_image=f"{config.full_image()}:{COMMIT_HASH_TAG}",
+        image_id=f"sha256:{config.image}",
+        image_size="1GB",
+        image_size_bytes=10**9,
+        commit_hash=COMMIT_HASH_TAG,
+        commit_url=f"https://github.com/jupyter/docker-stacks/commit/{COMMIT_HASH_TAG}",
+        commit_message="Update images",
+    )
+
+
+def _pieces(image: str, packages: list[PackageRecord]) -> list[MarkdownPiece]:
+    return [
+        MarkdownPiece(
+            title="## Python Packages",
+            sections=[f"`mamba info` of {image}", "`mamba list` output"],
+            packages=packages,
+        ),
+        MarkdownPiece(title="## Image Layers", sections=[f"Layers of {image}"]),
+    ]
+
+
+def _write_manifest(
+    manifests_dir: Path, image: str, packages: list[PackageRecord]
+) -> str:
+    config = Config(
+        registry="quay.io",
+        owner="jupyter",
+        image=image,
+        variant="default",
+        manifests_dir=manifests_dir,
+        repository="jupyter/docker-stacks",
+        delta_manifests=True,
+    )
+    filename = f"{get_file_prefix(config.variant)}-{image}-{COMMIT_HASH_TAG}"
+    write_manifest(
+        config,
+        ["python-3.13"],
+        _pieces(image, packages),
+        filename=filename,
+        commit_hash_tag=COMMIT_HASH_TAG,
+    )
+    return filename
+
+
+def test_child_delta_manifest_keeps_its_own_sections(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(write_manifest_module, "get_build_info", _build_info)
+    python = PackageRecord(ecosystem="conda", name="python", version="3.13.0")
+    _write_manifest(tmp_path, "docker-stacks-foundation", [python])
+    jupyterlab = PackageRecord(ecosystem="conda", name="jupyterlab", version="4.4.0")
+    filename = _write_manifest(tmp_path, "base-notebook", [python, jupyterlab])
+
+    manifest = (tmp_path / f"{filename}.md").read_text()
+    assert "## Parent Image" in manifest
+    assert "## Image Layers\n\nLayers of base-notebook" in manifest
+    assert "`mamba info` of base-notebook" in manifest
+    # The package list is replaced with the package changes
+    assert "`mamba list` output" not in manifest
+    assert "| conda       | added    | jupyterlab | 4.4.0     |" in manifest
+
+    json_manifest = json.loads((tmp_path / f"{filename}.json").read_text())
+    assert [package["name"] for package in json_manifest["packages"]] == ["jupyterlab"]
+
+
+def test_expanded_delta_manifest_has_all_sections(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(write_manifest_module, "get_build_info", _build_info)
+    python = PackageRecord(ecosystem="conda", name="python", version="3.13.0")
+    _write_manifest(tmp_path, "docker-stacks-foundation", [python])
+    jupyterlab = PackageRecord(ecosystem="conda", name="jupyterlab", version="4.4.0")
+    filename = _write_manifest(tmp_path, "base-notebook", [python, jupyterlab])
+
+    manifest = expand_manifest(tmp_path / f"{filename}.json", output_json=False)
+    assert "## Parent Image" not in manifest
+    assert "## Python Packages\n\n`mamba info` of base-notebook\n\n| Name" in manifest
+    assert "| python     | 3.13.0    |" in manifest
+    assert "| jupyterlab | 4.4.0     |" in manifest
+    assert manifest.endswith("## Image Layers\n\nLayers of base-notebook\n")
@@ -0,0 +1,132 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from tagging.apps.diff_manifests import diff_manifests, version_key
+from tagging.manifests.manifest_interface import PackageRecord
+from tagging.utils.load_manifest import load_manifest
+
+OLD_MANIFEST = """\
+# Build manifest for image: base-notebook:1111111
+
+## Build Info
+
+- Docker image size: 1.2 GB
+
+## Python Packages
+
+`mamba list`:
+
+```text
+  Name        Version  Build         Channel
+  jupyterlab  4.2.5    pyhd8ed1ab_0  conda-forge
+  notebook    7.2.2    pyhd8ed1ab_0  conda-forge
+  openssl     3.4.0    hb9d3cd8_0    conda-forge
+  tornado     6.4.2    py312_0       conda-forge
+```
+
+## Apt Packages
+
+`apt list --installed`:
+
+```text
+Listing...
+adduser/noble,now 3.137ubuntu1 all [installed]
+```
+"""
+
+NEW_MANIFEST = """\
+# Build manifest for image: base-notebook:2222222
+
+## Build Info
+
+- Docker image size: 1.25 GB
+
+## Python Packages
+
+`mamba list`:
+
+```text
+  Name        Version  Build         Channel
+  jupyterlab  4.10.0   pyhd8ed1ab_0  conda-forge
+  notebook    7.2.2    pyhd8ed1ab_0  conda-forge
+  openssl     3.3.2    hb9d3cd8_0    conda-forge
+  pandas      2.2.3    py312_0       conda-forge
+```
+
+## Apt Packages
+
+`apt list --installed`:
+
+```text
+Listing...
+adduser/noble,now 3.137ubuntu1 all [installed]
+```
+"""
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        ("1.9", "1.10"),
+        ("1.9.9", "1.10.0"),
+        ("4.2.5", "4.10.0"),
+        ("2.0.0rc1", "2.0.0"),
+        ("1.0", "1.0.1"),
+        ("3.137ubuntu1", "3.137ubuntu2"),
+        ("2.39-0ubuntu8.2", "2.39-0ubuntu8.10"),
+        ("1.26.0", "1.26.0+1"),
+    ],
+)
+def test_version_key_order(old: str, new: str) -> None:
+    assert version_key(old) < version_key(new)
+
+
+def test_version_key_ties() -> None:
+    # `1.0` and `1-0` have the same parts, the versions themselves break the tie
+    assert version_key("1.0") != version_key("1-0")
+    assert version_key("1.0") == version_key("1.0")
+
+
+def _package(name: str, version: str, build: str) -> PackageRecord:
+    return PackageRecord(
+        ecosystem="conda",
+        name=name,
+        version=version,
+        build=build,
+        channel="conda-forge",
+    )
+
+
+def test_diff_markdown_manifests(tmp_path: Path) -> None:
+    old_file = tmp_path / "old.md"
+    old_file.write_text(OLD_MANIFEST)
+    new_file = tmp_path / "new.md"
+    new_file.write_text(NEW_MANIFEST)
+
+    diff = diff_manifests(
+        load_manifest(old_file),
+        load_manifest(new_file),
+        old_name=old_file.name,
+        new_name=new_file.name,
+    )
+
+    assert diff.image_size_delta == 50 * 10**6
+    # Markdown manifests don't list the tags
+    assert diff.added_tags == diff.removed_tags == []
+    assert diff.added == [_package("pandas", "2.2.3", "py312_0")]
+    assert diff.removed == [_package("tornado", "6.4.2", "py312_0")]
+    assert diff.upgraded == [
+        (
+            _package("jupyterlab", "4.2.5", "pyhd8ed1ab_0"),
+            _package("jupyterlab", "4.10.0", "pyhd8ed1ab_0"),
+        )
+    ]
+    assert diff.downgraded == [
+        (
+            _package("openssl", "3.4.0", "hb9d3cd8_0"),
+            _package("openssl", "3.3.2", "hb9d3cd8_0"),
+        )
+    ]
@@ -0,0 +1,29 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from pathlib import Path
+
+from tagging.utils.digest_ledger import DigestLedger
+
+TAG = "quay.io/jupyter/base-notebook:x86_64-latest"
+DIGEST = "sha256:" + "1" * 64
+
+
+def test_digest_of_local_image(tmp_path: Path) -> None:
+    DigestLedger(tmp_path, "0123456789ab").record_tag_digest(TAG, DIGEST, "image-1")
+
+    ledger = DigestLedger(tmp_path, "0123456789ab")
+    assert ledger.get_tag_digest(TAG, "image-1") == DIGEST
+    # The image was rebuilt, or it doesn't exist locally
+    assert ledger.get_tag_digest(TAG, "image-2") is None
+    assert ledger.get_tag_digest(TAG) is None
+
+
+def test_digests_of_other_commits_are_dropped(tmp_path: Path) -> None:
+    DigestLedger(tmp_path, "0123456789ab").record_platform_digest(
+        "x86_64-default-base-notebook", DIGEST
+    )
+
+    ledger = DigestLedger(tmp_path, "ba9876543210")
+    assert ledger.get_platform_digest("x86_64-default-base-notebook") is None
+    ledger.record_tag_digest(TAG, DIGEST)
+    assert "x86_64-default-base-notebook" not in ledger.path.read_text()
@@ -0,0 +1,111 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import io
+import tarfile
+
+import pytest  # type: ignore
+
+from tagging.manifests.image_layers import LayerFiles, _read_layer, get_layer_stats
+
+
+def _layer_archive(members: dict[str, int | None]) -> tarfile.TarFile:
+    """Files with their sizes, directories have no size"""
+    content = io.BytesIO()
+    with tarfile.open(fileobj=content, mode="w") as archive:
+        for name, size in members.items():
+            member = tarfile.TarInfo(name)
+            if size is None:
+                member.type = tarfile.DIRTYPE
+                archive.addfile(member)
+            else:
+                member.size = size
+                archive.addfile(member, io.BytesIO(b"\0" * size))
+    content.seek(0)
+    return tarfile.open(fileobj=content, mode="r")
+
+
+def test_read_layer() -> None:
+    with _layer_archive(
+        {
+            "opt/": None,
+            "opt/conda/bin/python": 100,
+            "./home/jovyan/.bashrc": 10,
+            "tmp/.wh.build": 0,
+            ".wh.setup.sh": 0,
+            "home/jovyan/work/.wh..wh..opq": 0,
+        }
+    ) as archive:
+        layer = _read_layer(archive)
+    assert layer == LayerFiles(
+        files={"opt/conda/bin/python": 100, "home/jovyan/.bashrc": 10},
+        removed=["tmp/build", "setup.sh", "home/jovyan/work/"],
+    )
+
+
+@pytest.mark.parametrize(
+    "layers,rewritten",
+    [
+        # Only new files
+        ([LayerFiles({"a/x": 10}), LayerFiles({"a/y": 20})], [0, 0]),
+        # `fix-permissions` writes the same files again
+        (
+            [
+                LayerFiles({"opt/conda/x": 10, "opt/conda/y": 20}),
+                LayerFiles({"opt/conda/x": 10}),
+            ],
+            [0, 10],
+        ),
+        # A deleted file, and a deleted directory with all its files
+        (
+            [
+                LayerFiles({"tmp/build/a": 10, "tmp/build/b": 20, "tmp/buildx": 5}),
+                LayerFiles(removed=["tmp/build"]),
+            ],
+            [0, 30],
+        ),
+        # An opaque directory hides the lower files, but not the files of its own layer
+        (
+            [
+                LayerFiles({"home/jovyan/work/a": 10, "home/jovyan/.bashrc": 1}),
+                LayerFiles({"home/jovyan/work/b": 20}, removed=["home/jovyan/work/"]),
+                LayerFiles({"home/jovyan/work/b": 20}),
+            ],
+            [0, 10, 20],
+        ),
+        # The deleted files are only counted once
+        (
+            [
+                LayerFiles({"tmp/a": 10}),
+                LayerFiles(removed=["tmp/a"]),
+                LayerFiles(removed=["tmp/a"]),
+            ],
+            [0, 10, 0],
+        ),
+    ],
+)
+def test_layer_stats_rewritten(layers: list[LayerFiles], rewritten: list[int]) -> None:
+    stats = get_layer_stats(layers, [f"RUN step {i}" for i in range(len(layers))])
+    assert [layer.rewritten for layer in stats] == rewritten
+    assert [layer.size for layer in stats] == [
+        sum(layer.files.values()) for layer in layers
+    ]
+
+
+def test_layer_stats_largest_dirs() -> None:
+    (stats,) = get_layer_stats(
+        [
+            LayerFiles(
+                {
+                    "opt/conda/lib/libpython.so": 300,
+                    "opt/conda/bin/python": 100,
+                    "usr/lib/libc.so": 200,
+                    "etc/passwd": 1,
+                    "etc/link": 0,
+                    "README": 0,
+                }
+            )
+        ],
+        ["RUN install"],
+    )
+    assert stats.size == 601
+    assert stats.largest_dirs == [("/opt/conda", 400), ("/usr/lib", 200), ("/etc", 1)]
@@ -0,0 +1,140 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from collections.abc import Callable
+
+import pytest  # type: ignore
+
+from tagging.manifests.apt_packages import APT_LIST_CMD, parse_apt_list
+from tagging.manifests.conda_environment import MAMBA_LIST_CMD, parse_mamba_list
+from tagging.manifests.julia_packages import PKG_STATUS_CMD, parse_julia_pkg_status
+from tagging.manifests.manifest_interface import PackageRecord
+from tagging.manifests.r_packages import (
+    INSTALLED_PACKAGES_CMD,
+    parse_r_installed_packages,
+)
+from tagging.utils.quoted_output import quoted_text
+
+MAMBA_LIST = """\
+List of packages in environment: "/opt/conda"
+
+  Name           Version  Build         Channel
+────────────────────────────────────────────────────
+  _libgcc_mutex  0.1      conda_forge   conda-forge
+  jupyterlab     4.3.4    pyhd8ed1ab_0  conda-forge
+  nbgitpuller    1.2.1    pypi_0        pypi"""
+
+CONDA_LIST = """\
+# packages in environment at /opt/conda:
+#
+# Name                    Version                   Build  Channel
+_libgcc_mutex             0.1                 conda_forge    conda-forge
+local-package             1.0                    py_0"""
+
+APT_LIST = """\
+Listing...
+adduser/noble,now 3.137ubuntu1 all [installed]
+libc6/noble-updates,now 2.39-0ubuntu8.3 amd64 [installed,automatic]"""
+
+R_INSTALLED_PACKAGES = """\
+> installed.packages(.Library)[, c(1,3)]
+        Package   Version
+base    "base"    "4.4.1"
+ggplot2 "ggplot2" "3.5.1"
+>"""
+
+JULIA_PKG_STATUS = """\
+Status `~/.julia/environments/v1.11/Project.toml`
+  [7073ff75] IJulia v1.26.0
+⌃ [91a5bcdd] Plots v1.40.9
+  [8ba89e20] Distributed
+Info Packages marked with ⌃ have new versions available and may be upgradable.
+nothing"""
+
+
+@pytest.mark.parametrize(
+    "parser,output,expected",
+    [
+        (
+            parse_mamba_list,
+            quoted_text(MAMBA_LIST_CMD, MAMBA_LIST),
+            [
+                PackageRecord(
+                    ecosystem="conda",
+                    name="_libgcc_mutex",
+                    version="0.1",
+                    build="conda_forge",
+                    channel="conda-forge",
+                ),
+                PackageRecord(
+                    ecosystem="conda",
+                    name="jupyterlab",
+                    version="4.3.4",
+                    build="pyhd8ed1ab_0",
+                    channel="conda-forge",
+                ),
+                PackageRecord(
+                    ecosystem="pip",
+                    name="nbgitpuller",
+                    version="1.2.1",
+                    build="pypi_0",
+                    channel="pypi",
+                ),
+            ],
+        ),
+        (
+            parse_mamba_list,
+            CONDA_LIST,
+            [
+                PackageRecord(
+                    ecosystem="conda",
+                    name="_libgcc_mutex",
+                    version="0.1",
+                    build="conda_forge",
+                    channel="conda-forge",
+                ),
+                PackageRecord(
+                    ecosystem="conda", name="local-package", version="1.0", build="py_0"
+                ),
+            ],
+        ),
+        (parse_mamba_list, "", []),
+        (
+            parse_apt_list,
+            quoted_text(APT_LIST_CMD, APT_LIST),
+            [
+                PackageRecord(
+                    ecosystem="apt", name="adduser", version="3.137ubuntu1", arch="all"
+                ),
+                PackageRecord(
+                    ecosystem="apt",
+                    name="libc6",
+                    version="2.39-0ubuntu8.3",
+                    arch="amd64",
+                ),
+            ],
+        ),
+        (
+            parse_r_installed_packages,
+            quoted_text(INSTALLED_PACKAGES_CMD, R_INSTALLED_PACKAGES),
+            [
+                PackageRecord(ecosystem="r", name="base", version="4.4.1"),
+                PackageRecord(ecosystem="r", name="ggplot2", version="3.5.1"),
+            ],
+        ),
+        (
+            parse_julia_pkg_status,
+            quoted_text(PKG_STATUS_CMD, JULIA_PKG_STATUS),
+            # The standard libraries are listed without a version
+            [
+                PackageRecord(ecosystem="julia", name="IJulia", version="1.26.0"),
+                PackageRecord(ecosystem="julia", name="Plots", version="1.40.9"),
+            ],
+        ),
+    ],
+)
+def test_parse_packages(
+    parser: Callable[[str], list[PackageRecord]],
+    output: str,
+    expected: list[PackageRecord],
+) -> None:
+    assert parser(output) == expected
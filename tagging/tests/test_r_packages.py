@@ -0,0 +1,51 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+
+from tagging.manifests.manifest_interface import PackageRecord
+from tagging.manifests.r_packages import r_packages_snapshot_manifest
+from tagging.tests.fake_container import FakeContainer
+
+CONDA_DIR = "/opt/conda"
+
+
+def _conda_metadata(files: list[str]) -> bytes:
+    return json.dumps({"files": files}).encode()
+
+
+def test_snapshot_reads_only_descriptions() -> None:
+    library = f"{CONDA_DIR}/lib/R/library"
+    container = FakeContainer(
+        {
+            f"{CONDA_DIR}/conda-meta/r-base-4.4.1-h1234567_0.json": _conda_metadata(
+                ["bin/R", "lib/R/library/base/DESCRIPTION", "lib/R/library/base/R/base"]
+            ),
+            f"{CONDA_DIR}/conda-meta/r-ggplot2-3.5.1-r44_0.json": _conda_metadata(
+                ["lib/R/library/ggplot2/DESCRIPTION", "lib/R/library/ggplot2/NEWS.md"]
+            ),
+            f"{CONDA_DIR}/conda-meta/python-3.13.0-h1234567_0.json": _conda_metadata(
+                ["bin/python3.13"]
+            ),
+            f"{library}/base/DESCRIPTION": b"Package: base\nVersion: 4.4.1\n",
+            f"{library}/base/R/base": b"\0" * 1000,
+            f"{library}/ggplot2/DESCRIPTION": (
+                b"Package: ggplot2\nVersion: 3.5.1\nDescription: A system\n"
+                b"    for declaratively creating graphics: based on\n"
+            ),
+        },
+        env={"CONDA_DIR": CONDA_DIR},
+    )
+
+    piece = r_packages_snapshot_manifest(container)
+
+    assert piece.packages == [
+        PackageRecord(ecosystem="r", name="base", version="4.4.1"),
+        PackageRecord(ecosystem="r", name="ggplot2", version="3.5.1"),
+    ]
+    assert piece.sections[0] == "R version 4.4.1"
+    # The R library itself is never streamed
+    assert container.archived_paths == [
+        f"{CONDA_DIR}/conda-meta",
+        f"{library}/base/DESCRIPTION",
+        f"{library}/ggplot2/DESCRIPTION",
+    ]
@@ -0,0 +1,63 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+
+import pytest  # type: ignore
+
+from tagging.tests.fake_registry import FakeRegistry, digest_of
+from tagging.utils.registry_client import (
+    DOCKER_MANIFEST_LIST,
+    ManifestNotFoundError,
+    RegistryClient,
+)
+
+
+def test_token_is_reused(fake_registry: FakeRegistry) -> None:
+    digest = fake_registry.add_image("jupyter/base-notebook", "latest", "amd64")
+    client = RegistryClient()
+    image = f"{fake_registry.registry}/jupyter/base-notebook:latest"
+
+    assert client.get_digest(image) == digest
+    assert client.get_digest(image) == digest
+    # Only the first request is challenged, the second one sends the cached token
+    assert fake_registry.requests["GET /token"] == 1
+    assert fake_registry.requests["401"] == 1
+    assert (
+        fake_registry.requests["HEAD /v2/jupyter/base-notebook/manifests/latest"] == 3
+    )
+
+
+def test_missing_manifest(fake_registry: FakeRegistry) -> None:
+    client = RegistryClient()
+    with pytest.raises(ManifestNotFoundError):
+        client.get_digest(f"{fake_registry.registry}/jupyter/base-notebook:missing")
+
+
+def test_create_manifest_list(fake_registry: FakeRegistry) -> None:
+    amd64_digest = fake_registry.add_image(
+        "jupyter/base-notebook", "x86_64-latest", "amd64"
+    )
+    arm64_digest = fake_registry.add_image(
+        "jupyter/base-notebook", "aarch64-latest", "arm64"
+    )
+    client = RegistryClient()
+    repository = f"{fake_registry.registry}/jupyter/base-notebook"
+
+    manifest_list, digest = client.create_manifest_list(
+        [f"{repository}:x86_64-latest", f"{repository}:aarch64-latest"],
+        [f"{repository}:latest", f"{repository}:python-3.13"],
+    )
+
+    manifests = json.loads(manifest_list)
+    assert manifests["mediaType"] == DOCKER_MANIFEST_LIST
+    assert [
+        (descriptor["digest"], descriptor["platform"]["architecture"])
+        for descriptor in manifests["manifests"]
+    ] == [(amd64_digest, "amd64"), (arm64_digest, "arm64")]
+    assert digest == digest_of(manifest_list.encode())
+    for tag in ("latest", "python-3.13"):
+        assert fake_registry.manifests[f"jupyter/base-notebook:{tag}"] == (
+            manifest_list.encode(),
+            DOCKER_MANIFEST_LIST,
+        )
+    assert client.get_digest(f"{repository}:latest") == digest
@@ -0,0 +1,48 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import os
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from tagging.utils.results_cache import ResultsCache
+
+
+def test_store_and_load(tmp_path: Path) -> None:
+    cache = ResultsCache(tmp_path)
+    key = cache.key("sha256:image", "tags")
+    assert cache.load(key) is None
+    cache.store(key, ["latest", "python-3.13"])
+    assert cache.load(key) == ["latest", "python-3.13"]
+    assert cache.key("sha256:other-image", "tags") != key
+
+
+def test_entry_evicted_by_another_run(tmp_path: Path) -> None:
+    cache = ResultsCache(tmp_path)
+    key = cache.key("sha256:image")
+    cache.store(key, "value")
+    (tmp_path / f"{key}.json").unlink()
+    assert cache.load(key) is None
+    assert not (tmp_path / f"{key}.json").exists()
+
+
+def test_eviction_skips_missing_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ResultsCache(tmp_path, max_size=10)
+    cache.store(cache.key("sha256:old"), "x" * 8)
+    old_path = next(tmp_path.glob("*.json"))
+    os.utime(old_path, (0, 0))
+
+    # Another run evicts the entry between `glob` and `stat`
+    glob = Path.glob
+
+    def glob_and_evict(self: Path, pattern: str):  # type: ignore
+        paths = list(glob(self, pattern))
+        old_path.unlink(missing_ok=True)
+        return paths
+
+    monkeypatch.setattr(Path, "glob", glob_and_evict)
+    key = cache.key("sha256:new")
+    cache.store(key, "y" * 8)
+    assert cache.load(key) == "y" * 8
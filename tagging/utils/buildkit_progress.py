@@ -0,0 +1,53 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import re
+from dataclasses import dataclass
+
+# BuildKit plain progress, for example, `#7 [stage-1 4/9] RUN mamba install ...`
+STEP_LINE = re.compile(
+    r"^#(?P<id>\d+) \[(?P<stage>[^\]]*\d+/\d+)\] (?P<instruction>.+)$"
+)
+# For example, `#7 CACHED`, `#7 DONE 123.4s` or `#7 ERROR: process ... did not complete`
+STATUS_LINE = re.compile(
+    r"^#(?P<id>\d+) (?P<status>CACHED|DONE|ERROR)(?: (?P<time>[\d.]+)s)?"
+)
+
+
+@dataclass
+class BuildStep:
+    step: str
+    instruction: str
+    cached: bool = False
+    # Seconds, None for the cached steps and unfinished steps
+    duration: float | None = None
+    failed: bool = False
+
+
+def parse_build_steps(build_output: list[str]) -> list[BuildStep]:
+    """Dockerfile steps of the BuildKit plain progress output, in the order they started"""
+    steps: dict[str, BuildStep] = {}
+    for line in build_output:
+        line = line.rstrip("\n")
+        if match := STEP_LINE.match(line):
+            if match["id"] not in steps:
+                steps[match["id"]] = BuildStep(
+                    step=match["stage"], instruction=match["instruction"]
+                )
+        elif (match := STATUS_LINE.match(line)) and match["id"] in steps:
+            step = steps[match["id"]]
+            if match["status"] == "CACHED":
+                step.cached = True
+            elif match["status"] == "DONE":
+                step.duration = float(match["time"])
+            else:
+                step.failed = True
+    return list(steps.values())
+
+
+def get_pull_duration(steps: list[BuildStep]) -> float:
+    """BuildKit pulls the base images in the `FROM` steps"""
+    return sum(
+        step.duration or 0.0
+        for step in steps
+        if step.instruction.startswith("FROM ") and not step.cached
+    )
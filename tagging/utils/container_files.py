@@ -0,0 +1,64 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import io
+import logging
+import tarfile
+from collections.abc import Callable, Iterable, Iterator
+
+from docker.models.containers import Container
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ChunksReader(io.RawIOBase):
+    """Read-only file object over an iterable of byte chunks,
+    so `tarfile` can stream an archive without storing it"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:  # type: ignore[override]
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = chunk
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def get_container_env(container: Container) -> dict[str, str]:
+    """Environment of the container, which is known even if it was never started"""
+    env: list[str] = container.attrs["Config"]["Env"] or []
+    return dict(variable.split("=", 1) for variable in env)
+
+
+def iter_container_files(
+    container: Container, path: str, select: Callable[[str], bool]
+) -> Iterator[tuple[str, bytes]]:
+    """Streams the regular files under the path out of the container
+    and yields the contents of the ones whose archive name is selected.
+    Works with stopped containers as well, as it doesn't run anything inside them"""
+    LOGGER.info(f"Streaming: {path} from container: {container.name}")
+    chunks, _ = container.get_archive(path)
+    reader = io.BufferedReader(ChunksReader(chunks))
+    with tarfile.open(fileobj=reader, mode="r|") as archive:
+        for member in archive:
+            if not member.isfile() or not select(member.name):
+                continue
+            file = archive.extractfile(member)
+            assert file is not None
+            yield member.name, file.read()
+
+
+def read_container_file(container: Container, path: str) -> bytes:
+    """Streams a single regular file out of the container"""
+    for _, content in iter_container_files(container, path, lambda _: True):
+        return content
+    raise FileNotFoundError(f"{path} is not a regular file in: {container.name}")
@@ -0,0 +1,37 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import logging
+
+import plumbum
+import requests
+
+from tagging.utils.get_manifest_digest import use_registry_client
+from tagging.utils.registry_client import RegistryError, get_registry_client
+
+docker = plumbum.local["docker"]
+
+LOGGER = logging.getLogger(__name__)
+
+
+def create_manifest_list(
+    source_tags: list[str], target_tags: list[str], *, push_to_registry: bool
+) -> tuple[str, str | None]:
+    """The same as `docker buildx imagetools create`, which is also used as a fallback.
+    One manifest list is created and pushed under all the target tags.
+    Returns the output and the digest of the pushed manifest list, if it's known.
+    Without `push_to_registry`, only returns the manifest list"""
+    if use_registry_client():
+        try:
+            return get_registry_client().create_manifest_list(
+                source_tags, target_tags, dry_run=not push_to_registry
+            )
+        except (RegistryError, requests.RequestException) as e:
+            LOGGER.warning(f"Registry client failed, falling back to buildx: {e}")
+
+    args = ["buildx", "imagetools", "create", *source_tags]
+    for target_tag in target_tags:
+        args += ["--tag", target_tag]
+    if not push_to_registry:
+        args.append("--dry-run")
+    LOGGER.info(f"Running command: {' '.join(args)}")
+    return str(docker[args]()), None
@@ -0,0 +1,211 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+import logging
+import textwrap
+from pathlib import Path
+from typing import Any
+
+from tabulate import tabulate
+
+from tagging.manifests.build_info import BuildInfo, build_info_piece
+from tagging.manifests.manifest_interface import MarkdownPiece
+from tagging.utils.get_prefix import DEFAULT_VARIANT, get_file_prefix
+
+LOGGER = logging.getLogger(__name__)
+
+PARENT_IMAGE_TITLE = "## Parent Image"
+ECOSYSTEM_TITLES = {
+    "conda": "Conda",
+    "pip": "Pip",
+    "apt": "Apt",
+    "r": "R",
+    "julia": "Julia",
+}
+
+PackageKey = tuple[str, str]
+
+
+def _index_packages(packages: list[dict[str, str]]) -> dict[PackageKey, dict[str, str]]:
+    return {(package["ecosystem"], package["name"]): package for package in packages}
+
+
+def find_parent_manifest(
+    parent_image: str | None,
+    *,
+    variant: str,
+    manifests_dir: Path,
+    commit_hash_tag: str,
+) -> Path | None:
+    """JSON manifest of the parent image, built from the same commit"""
+    if parent_image is None:
+        return None
+    # Variant images might be built on top of the default variant of their parent
+    for parent_variant in dict.fromkeys([variant, DEFAULT_VARIANT]):
+        file_prefix = get_file_prefix(parent_variant)
+        path = manifests_dir / f"{file_prefix}-{parent_image}-{commit_hash_tag}.json"
+        if path.exists():
+            return path
+    LOGGER.warning(f"Manifest of the parent image: {parent_image} not found")
+    return None
+
+
+def expand_json_manifest(path: Path) -> dict[str, Any]:
+    """Returns the full JSON manifest, delta manifests are applied on top of
+    their expanded parent manifests, which are in the same directory"""
+    json_manifest: dict[str, Any] = json.loads(path.read_text())
+    if "parent" not in json_manifest:
+        return json_manifest
+
+    parent_path = path.parent / f"{json_manifest['parent']['manifest']}.json"
+    parent_manifest = expand_json_manifest(parent_path)
+    packages = _index_packages(parent_manifest["packages"])
+    for removed in json_manifest["removed_packages"]:
+        del packages[(removed["ecosystem"], removed["name"])]
+    packages.update(_index_packages(json_manifest["packages"]))
+
+    json_manifest["packages"] = list(packages.values())
+    del json_manifest["parent"]
+    del json_manifest["removed_packages"]
+    return json_manifest
+
+
+def get_delta_json_manifest(
+    json_manifest: dict[str, Any],
+    parent_manifest: Path,
+    expanded_parent: dict[str, Any],
+) -> dict[str, Any]:
+    """Keeps only the packages which differ from the expanded parent manifest"""
+    parent_packages = _index_packages(expanded_parent["packages"])
+    packages = _index_packages(json_manifest["packages"])
+    return {
+        **json_manifest,
+        "parent": {
+            "image": expanded_parent["build_info"]["docker_image"],
+            "image_id": expanded_parent["build_info"]["image_id"],
+            "manifest": parent_manifest.stem,
+        },
+        "packages": [
+            package
+            for key, package in packages.items()
+            if parent_packages.get(key) != package
+        ],
+        "removed_packages": [
+            {"ecosystem": ecosystem, "name": name}
+            for ecosystem, name in parent_packages
+            if (ecosystem, name) not in packages
+        ],
+    }
+
+
+def parent_image_piece(delta_json_manifest: dict[str, Any]) -> MarkdownPiece:
+    parent = delta_json_manifest["parent"]
+    parent_info = textwrap.dedent(f"""\
+        - Parent image: `{parent["image"]}`
+        - Parent image ID: `{parent["image_id"]}`
+        - Parent manifest: [{parent["manifest"]}](./{parent["manifest"]}.md)""")
+    return MarkdownPiece(title=PARENT_IMAGE_TITLE, sections=[parent_info])
+
+
+def package_changes_piece(
+    delta_json_manifest: dict[str, Any], expanded_parent: dict[str, Any]
+) -> MarkdownPiece:
+    parent_packages = _index_packages(expanded_parent["packages"])
+    rows = []
+    for package in delta_json_manifest["packages"]:
+        parent_package = parent_packages.get((package["ecosystem"], package["name"]))
+        change = "added" if parent_package is None else "changed"
+        parent_version = "" if parent_package is None else parent_package["version"]
+        rows.append(
+            [
+                package["ecosystem"],
+                change,
+                package["name"],
+                package["version"],
+                parent_version,
+            ]
+        )
+    for removed in delta_json_manifest["removed_packages"]:
+        parent_package = parent_packages[(removed["ecosystem"], removed["name"])]
+        rows.append(
+            [
+                removed["ecosystem"],
+                "removed",
+                removed["name"],
+                "",
+                parent_package["version"],
+            ]
+        )
+    if not rows:
+        return MarkdownPiece(
+            title="## Package Changes",
+            sections=["Packages are the same as in the parent image."],
+        )
+    changes_table = tabulate(
+        sorted(rows),
+        headers=["Ecosystem", "Change", "Name", "Version", "Parent version"],
+        tablefmt="github",
+        disable_numparse=True,
+    )
+    return MarkdownPiece(
+        title="## Package Changes",
+        sections=[
+            "Only the packages which differ from the parent image are listed.",
+            changes_table,
+        ],
+    )
+
+
+def _get_pieces(json_manifest: dict[str, Any]) -> list[dict[str, Any]]:
+    if "pieces" in json_manifest:
+        pieces: list[dict[str, Any]] = json_manifest["pieces"]
+        return pieces
+    # Older JSON manifests only have the packages, one piece per ecosystem is rendered
+    return [
+        {"title": f"## {title} Packages", "sections": [], "ecosystems": [ecosystem]}
+        for ecosystem, title in ECOSYSTEM_TITLES.items()
+    ]
+
+
+def _packages_table(packages: list[dict[str, str]]) -> str:
+    return tabulate(
+        [
+            [
+                package["name"],
+                package["version"],
+                package["build"],
+                package["channel"],
+                package["arch"],
+            ]
+            for package in packages
+        ],
+        headers=["Name", "Version", "Build", "Channel", "Architecture"],
+        tablefmt="github",
+        disable_numparse=True,
+    )
+
+
+def render_expanded_manifest(json_manifest: dict[str, Any]) -> str:
+    """Renders the Markdown manifest of an expanded JSON manifest.
+    It has all the sections of the regular manifest, but each package list
+    is a table of the package records instead of the output of the command"""
+    build_info = BuildInfo(**json_manifest["build_info"])
+    commit_hash_tag = build_info.docker_image.rpartition(":")[2]
+    markdown_pieces = [
+        f"# Build manifest for image: {json_manifest['image']}:{commit_hash_tag}",
+        build_info_piece(build_info).get_str(),
+    ]
+    for piece in _get_pieces(json_manifest):
+        sections = list(piece["sections"])
+        packages = [
+            package
+            for package in json_manifest["packages"]
+            if package["ecosystem"] in piece["ecosystems"]
+        ]
+        if packages:
+            sections.append(_packages_table(packages))
+        if sections:
+            markdown_pieces.append(
+                MarkdownPiece(title=piece["title"], sections=sections).get_str()
+            )
+    return "\n\n".join(markdown_pieces) + "\n"
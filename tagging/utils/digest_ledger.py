@@ -0,0 +1,115 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import fcntl
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import docker
+
+LOGGER = logging.getLogger(__name__)
+
+LEDGER_FILENAME = "digests.json"
+
+
+def get_local_image_id(docker_client: docker.DockerClient, tag: str) -> str | None:
+    """The ID of the local image with this tag, if it exists"""
+    try:
+        image_id: str = docker_client.images.get(tag).id
+        return image_id
+    except docker.errors.ImageNotFound:
+        return None
+
+
+class DigestLedger:
+    """Digests of the tags and the platform images pushed in this run,
+    stored next to the tags files, so the other apps don't inspect the registry again.
+
+    `tags` maps a full tag to its digest,
+    `platforms` maps a tags file name without extension (e.g., `x86_64-default-base-notebook`)
+    to the digest of that platform image.
+    Each entry also records the commit hash tag and the ID of the local image it was pushed from, if any.
+    The tags directory persists between local runs, so the entries of other commits are ignored and dropped,
+    and an entry is only used when its image ID matches the local image.
+    The file is locked while it's updated, so concurrent apps don't lose each other's records.
+    """
+
+    def __init__(self, tags_dir: Path, commit_hash_tag: str):
+        self.path = tags_dir / LEDGER_FILENAME
+        self.commit_hash_tag = commit_hash_tag
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {"tags": {}, "platforms": {}}
+        data: dict[str, dict[str, Any]] = json.loads(self.path.read_text())
+        # Entries of other commits, or in an older format, are dropped
+        return {
+            kind: {
+                key: entry
+                for key, entry in data.get(kind, {}).items()
+                if isinstance(entry, dict)
+                and entry.get("commit_hash_tag") == self.commit_hash_tag
+            }
+            for kind in ("tags", "platforms")
+        }
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.with_suffix(".lock")
+        with self._lock, lock_path.open("w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _get(self, kind: str, key: str, image_id: str | None) -> str | None:
+        entry = self._read()[kind].get(key)
+        if entry is None:
+            return None
+        if entry["image_id"] != image_id:
+            LOGGER.info(
+                f"Ignoring digest: {entry['digest']} for: {key}, "
+                f"recorded for image: {entry['image_id']}, local image: {image_id}"
+            )
+            return None
+        digest: str = entry["digest"]
+        return digest
+
+    def _record(self, kind: str, key: str, digest: str, image_id: str | None) -> None:
+        with self._locked():
+            data = self._read()
+            data[kind][key] = {
+                "digest": digest,
+                "commit_hash_tag": self.commit_hash_tag,
+                "image_id": image_id,
+            }
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True))
+            tmp_path.replace(self.path)
+        LOGGER.info(f"Recorded digest: {digest} for: {key}")
+
+    def get_tag_digest(self, tag: str, image_id: str | None = None) -> str | None:
+        return self._get("tags", tag, image_id)
+
+    def record_tag_digest(
+        self, tag: str, digest: str, image_id: str | None = None
+    ) -> None:
+        self._record("tags", tag, digest, image_id)
+
+    def get_platform_digest(
+        self, platform_image: str, image_id: str | None = None
+    ) -> str | None:
+        return self._get("platforms", platform_image, image_id)
+
+    def record_platform_digest(
+        self, platform_image: str, digest: str, image_id: str | None = None
+    ) -> None:
+        self._record("platforms", platform_image, digest, image_id)
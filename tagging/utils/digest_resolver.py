@@ -0,0 +1,72 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import logging
+import threading
+
+from tagging.utils.digest_ledger import DigestLedger
+from tagging.utils.get_manifest_digest import get_manifest_digest
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_platform_tag(merged_tag: str, platform: str) -> str:
+    image, _, tag = merged_tag.rpartition(":")
+    return f"{image}:{platform}-{tag}"
+
+
+def get_digest_ref(tag: str, digest: str) -> str:
+    image = tag.rpartition(":")[0]
+    return f"{image}@{digest}"
+
+
+def get_representative_tags(
+    local_platforms_per_tag: dict[str, set[str]],
+) -> dict[str, str]:
+    """All tags of a platform image point to the same digest,
+    so the first tag of each platform represents all of them"""
+    representative_tags: dict[str, str] = {}
+    for merged_tag, local_platforms in local_platforms_per_tag.items():
+        for platform in sorted(local_platforms):
+            representative_tags.setdefault(
+                platform, get_platform_tag(merged_tag, platform)
+            )
+    return representative_tags
+
+
+class DigestResolver:
+    """Resolves the digests of tags in the registry.
+    Each tag is inspected at most once per run, failures are not cached.
+    With a ledger, the digests pushed by the other apps are used,
+    and the digests pushed by this app are recorded
+    """
+
+    def __init__(self, ledger: DigestLedger | None = None) -> None:
+        self.ledger = ledger
+        self._digests: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _known_digest(self, tag: str, image_id: str | None) -> str | None:
+        with self._lock:
+            digest = self._digests.get(tag)
+        if digest is None and self.ledger is not None:
+            digest = self.ledger.get_tag_digest(tag, image_id)
+        return digest
+
+    def get_digest(self, tag: str, image_id: str | None = None) -> str:
+        """`image_id` is the ID of the local image with this tag, if it exists"""
+        digest = self._known_digest(tag, image_id)
+        if digest is not None:
+            LOGGER.info(f"Using known digest: {digest} for tag: {tag}")
+            return digest
+        digest = get_manifest_digest(tag)
+        # An inspected digest might belong to an older image, so it's not recorded to the ledger
+        with self._lock:
+            self._digests[tag] = digest
+        return digest
+
+    def record_digest(self, tag: str, digest: str) -> None:
+        """Records the digest of a tag pushed by this app"""
+        with self._lock:
+            self._digests[tag] = digest
+        if self.ledger is not None:
+            self.ledger.record_tag_digest(tag, digest)
@@ -6,28 +6,52 @@ from types import TracebackType
 import docker
 from docker.models.containers import Container
 
+from tagging.utils.shell_session import ShellSessionPool
+
 LOGGER = logging.getLogger(__name__)
 
 
 class DockerRunner:
+    # Shell sessions of the running containers, keyed by the container id
+    _shell_sessions: dict[str, ShellSessionPool] = {}
+    # Outputs of the probed commands, keyed by the container id and then by the command
+    probe_results: dict[str, dict[str, tuple[int, str]]] = {}
+
     def __init__(
         self,
         image_name: str,
         docker_client: docker.DockerClient | None = None,
         command: str = "sleep infinity",
+        *,
+        shell_session: bool = False,
+        start: bool = True,
     ):
+        """When `shell_session` is enabled, `exec_cmd` runs the commands
+        in long-lived shells instead of creating a Docker exec per command.
+        Sequential commands share one shell, concurrent ones get a shell per thread.
+        When `start` is disabled, the container is only created,
+        so its files can be read, but no commands can be run"""
+        assert start or not shell_session, "Shell session needs a running container"
         self.container: Container | None = None
         self.image_name: str = image_name
         self.command: str = command
+        self.shell_session: bool = shell_session
+        self.start: bool = start
         self.docker_client: docker.DockerClient = docker_client or docker.from_env()
 
     def __enter__(self) -> Container:
         LOGGER.info(f"Creating a container for the image: {self.image_name} ...")
         default_kwargs = {"detach": True, "tty": True}
-        self.container = self.docker_client.containers.run(
+        containers = self.docker_client.containers
+        create_container = containers.run if self.start else containers.create
+        self.container = create_container(
             image=self.image_name, command=self.command, **default_kwargs
         )
         LOGGER.info(f"Container {self.container.name} created")
+        if self.shell_session:
+            DockerRunner._shell_sessions[self.container.id] = ShellSessionPool(
+                self.container
+            )
         return self.container
 
     def __exit__(
@@ -37,6 +61,10 @@ class DockerRunner:
         exc_tb: TracebackType | None,
     ) -> None:
         assert self.container is not None
+        session = DockerRunner._shell_sessions.pop(self.container.id, None)
+        if session is not None:
+            session.close()
+        DockerRunner.probe_results.pop(self.container.id, None)
         LOGGER.info(f"Removing container {self.container.name} ...")
         self.container.remove(force=True)
         LOGGER.info(f"Container {self.container.name} removed")
@@ -44,10 +72,15 @@ class DockerRunner:
     @staticmethod
     def exec_cmd(container: Container, cmd: str) -> str:
         LOGGER.info(f"Running cmd: `{cmd}` on container: {container.name}")
-        exec_result = container.exec_run(cmd)
+        session = DockerRunner._shell_sessions.get(container.id)
+        if session is None:
+            exec_result = container.exec_run(cmd)
+            exit_code, raw_output = exec_result.exit_code, exec_result.output
+        else:
+            exit_code, raw_output = session.run(cmd)
         # The annotation is needed because the docker package is not typed
-        output: str = exec_result.output.decode().rstrip()
-        if exec_result.exit_code != 0:
+        output: str = raw_output.decode().rstrip()
+        if exit_code != 0:
             LOGGER.error(f"Command output:\n{output}")
             raise AssertionError(f"Command: `{cmd}` failed")
         else:
@@ -1,8 +1,10 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 import logging
+import os
 
 import plumbum
+import requests
 from tenacity import (
     retry,
     retry_if_not_exception_type,
@@ -10,6 +12,12 @@ from tenacity import (
     wait_exponential,
 )
 
+from tagging.utils.registry_client import (
+    ManifestNotFoundError,
+    RegistryError,
+    get_registry_client,
+)
+
 docker = plumbum.local["docker"]
 
 LOGGER = logging.getLogger(__name__)
@@ -17,8 +25,9 @@ LOGGER = logging.getLogger(__name__)
 MANIFEST_NOT_FOUND_ERRORS = ("manifest unknown", "name unknown", "not found")
 
 
-class ManifestNotFoundError(RuntimeError):
-    """Raised when the registry definitively reports that a manifest doesn't exist"""
+def use_registry_client() -> bool:
+    """`TAGGING_REGISTRY_CLIENT=buildx` makes the registry operations use buildx only"""
+    return os.environ.get("TAGGING_REGISTRY_CLIENT", "native") != "buildx"
 
 
 @retry(
@@ -30,6 +39,13 @@ class ManifestNotFoundError(RuntimeError):
 )
 def get_manifest_digest(tag: str) -> str:
     LOGGER.info(f"Inspecting manifest for tag: {tag}")
+    if use_registry_client():
+        try:
+            native_digest = get_registry_client().get_digest(tag)
+            LOGGER.info(f"Manifest for tag: {tag} has digest: {native_digest}")
+            return native_digest
+        except (RegistryError, requests.RequestException) as e:
+            LOGGER.warning(f"Registry client failed, falling back to buildx: {e}")
     retcode, stdout, stderr = docker[
         "buildx", "imagetools", "inspect", tag, "--format", "{{.Manifest.Digest}}"
     ].run(retcode=None)
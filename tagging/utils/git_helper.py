@@ -19,6 +19,11 @@ class GitHelper:
     def commit_message() -> str:
         return str(git["log", -1, "--pretty=%B"]()).strip()
 
+    @staticmethod
+    def changed_files(base_ref: str) -> list[str]:
+        """Files changed since the common ancestor of the base ref and HEAD"""
+        return str(git["diff", "--name-only", f"{base_ref}...HEAD"]()).splitlines()
+
 
 if __name__ == "__main__":
     print("Git hash:", GitHelper.commit_hash())
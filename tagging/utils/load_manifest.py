@@ -0,0 +1,141 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import functools
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from tagging.manifests.apt_packages import (
+    APT_LIST_CMD,
+    DPKG_STATUS_FILE,
+    parse_apt_list,
+)
+from tagging.manifests.conda_environment import MAMBA_LIST_CMD, parse_mamba_list
+from tagging.manifests.julia_packages import PKG_STATUS_CMD, parse_julia_pkg_status
+from tagging.manifests.manifest_interface import PackageRecord
+from tagging.manifests.r_packages import (
+    INSTALLED_PACKAGES_CMD,
+    parse_r_installed_packages,
+)
+from tagging.utils.delta_manifest import PARENT_IMAGE_TITLE, expand_json_manifest
+
+LOGGER = logging.getLogger(__name__)
+
+# For example, "`mamba list`:\n\n```text\n...\n```"
+QUOTED_BLOCK = re.compile(
+    r"^`(?P<source>[^`\n]+)`:\n\n```text\n(?P<output>.*?)\n```$",
+    re.MULTILINE | re.DOTALL,
+)
+TITLE_LINE = re.compile(r"^# Build manifest for image: (\S+):\S+$", re.MULTILINE)
+IMAGE_SIZE_LINE = re.compile(
+    r"^- Docker image size: ([\d.]+) ?([kMGT]?B)$", re.MULTILINE | re.IGNORECASE
+)
+# `docker images` uses decimal units
+SIZE_UNITS = {"B": 1, "KB": 10**3, "MB": 10**6, "GB": 10**9, "TB": 10**12}
+
+
+@dataclass(frozen=True)
+class LoadedManifest:
+    image: str
+    image_size_bytes: int | None
+    # None for Markdown manifests, they only have the commit hash tag
+    tags: list[str] | None
+    # Keyed by (ecosystem, name)
+    packages: dict[tuple[str, str], PackageRecord]
+    # Ecosystems which the manifest doesn't list completely
+    skipped_ecosystems: frozenset[str] = frozenset()
+
+
+def _index_packages(
+    packages: list[PackageRecord],
+) -> dict[tuple[str, str], PackageRecord]:
+    return {(package.ecosystem, package.name): package for package in packages}
+
+
+def _parse_plain_table(
+    output: str, ecosystem: str, fields: list[str]
+) -> list[PackageRecord]:
+    """Parses the tables written by the snapshot manifests, the header is skipped"""
+    packages = []
+    for line in output.splitlines()[1:]:
+        values = dict(zip(fields, line.split()))
+        packages.append(PackageRecord(ecosystem=ecosystem, **values))
+    return packages
+
+
+def _parse_quoted_block(source: str, output: str) -> list[PackageRecord]:
+    if source == MAMBA_LIST_CMD or source.endswith("/conda-meta/*.json"):
+        # The snapshot table has the same columns as `mamba list`
+        return parse_mamba_list(output)
+    if source == APT_LIST_CMD:
+        return parse_apt_list(output)
+    if source == DPKG_STATUS_FILE:
+        return _parse_plain_table(output, "apt", ["name", "version", "arch"])
+    if source == INSTALLED_PACKAGES_CMD:
+        return parse_r_installed_packages(output)
+    if source.endswith("/*/DESCRIPTION"):
+        return _parse_plain_table(output, "r", ["name", "version"])
+    if source == PKG_STATUS_CMD:
+        return parse_julia_pkg_status(output)
+    return []
+
+
+def _load_markdown_manifest(content: str) -> LoadedManifest:
+    title = TITLE_LINE.search(content)
+    assert title, "Build manifest title not found"
+    image_size = IMAGE_SIZE_LINE.search(content)
+    image_size_bytes = (
+        None
+        if image_size is None
+        else round(float(image_size[1]) * SIZE_UNITS[image_size[2].upper()])
+    )
+
+    packages = []
+    skipped_ecosystems = set()
+    for block in QUOTED_BLOCK.finditer(content):
+        packages += _parse_quoted_block(block["source"], block["output"])
+        if block["source"].endswith("/conda-meta/*.json"):
+            # The snapshot manifest doesn't list the packages installed with `pip`
+            skipped_ecosystems.add("pip")
+
+    return LoadedManifest(
+        image=title[1],
+        image_size_bytes=image_size_bytes,
+        tags=None,
+        packages=_index_packages(packages),
+        skipped_ecosystems=frozenset(skipped_ecosystems),
+    )
+
+
+def _load_json_manifest(path: Path) -> LoadedManifest:
+    json_manifest: dict[str, Any] = expand_json_manifest(path)
+    return LoadedManifest(
+        image=json_manifest["image"],
+        image_size_bytes=json_manifest["build_info"]["image_size_bytes"],
+        tags=json_manifest["tags"],
+        packages=_index_packages(
+            [PackageRecord(**package) for package in json_manifest["packages"]]
+        ),
+        skipped_ecosystems=frozenset(json_manifest.get("skipped_ecosystems", [])),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_manifest(path: Path, mtime_ns: int, size: int) -> LoadedManifest:
+    LOGGER.info(f"Parsing manifest: {path}")
+    if path.suffix == ".json":
+        return _load_json_manifest(path)
+    content = path.read_text()
+    if f"\n{PARENT_IMAGE_TITLE}\n" in content:
+        # Delta manifests only list the changes, the full list is in JSON manifests
+        return _load_json_manifest(path.with_suffix(".json"))
+    return _load_markdown_manifest(content)
+
+
+def load_manifest(path: Path) -> LoadedManifest:
+    """Loads a Markdown or JSON manifest, delta manifests are expanded.
+    Parsed files are cached until they are modified"""
+    stat = path.stat()
+    return _load_manifest(path.resolve(), stat.st_mtime_ns, stat.st_size)
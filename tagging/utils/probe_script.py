@@ -0,0 +1,36 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+"""This script is copied into a container and run with the container's Python.
+
+It runs all the commands from the JSON file passed as the only argument
+and prints their exit codes and outputs as a single-line JSON document.
+It only uses the standard library, as it can't rely on any other package.
+"""
+
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def run_command(cmd: str) -> dict[str, int | str]:
+    result = subprocess.run(
+        cmd,
+        shell=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    return {
+        "exit_code": result.returncode,
+        "output": result.stdout.decode(errors="replace"),
+    }
+
+
+if __name__ == "__main__":
+    commands: list[str] = json.loads(Path(sys.argv[1]).read_text())
+    # The commands are independent, so slow ones (like starting a JVM) can overlap
+    with ThreadPoolExecutor() as executor:
+        results = dict(zip(commands, executor.map(run_command, commands)))
+    print(json.dumps(results))
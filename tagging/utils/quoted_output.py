@@ -16,9 +16,13 @@ def quoted_output(container: Container, cmd: str) -> str:
 
     assert cmd_output, f"Command `{cmd}` returned empty output"
 
+    return quoted_text(cmd, cmd_output)
+
+
+def quoted_text(source: str, text: str) -> str:
     return textwrap.dedent(f"""\
-        `{cmd}`:
+        `{source}`:
 
         ```text
         {{output}}
-        ```""").format(output=cmd_output)
+        ```""").format(output=text)
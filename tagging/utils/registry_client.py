@@ -0,0 +1,325 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import base64
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LOGGER = logging.getLogger(__name__)
+
+DOCKER_HUB_REGISTRY = "registry-1.docker.io"
+# The key of Docker Hub credentials in the docker config
+DOCKER_HUB_AUTH_KEY = "https://index.docker.io/v1/"
+
+OCI_INDEX = "application/vnd.oci.image.index.v1+json"
+OCI_MANIFEST = "application/vnd.oci.image.manifest.v1+json"
+DOCKER_MANIFEST_LIST = "application/vnd.docker.distribution.manifest.list.v2+json"
+DOCKER_MANIFEST = "application/vnd.docker.distribution.manifest.v2+json"
+INDEX_MEDIA_TYPES = (OCI_INDEX, DOCKER_MANIFEST_LIST)
+MANIFEST_MEDIA_TYPES = (OCI_INDEX, DOCKER_MANIFEST_LIST, OCI_MANIFEST, DOCKER_MANIFEST)
+
+REQUEST_TIMEOUT = 30
+# Registries without TLS, for example, a local `registry:2` container
+INSECURE_REGISTRY_HOSTS = ("localhost", "127.0.0.1")
+# For example, `Bearer realm="https://quay.io/v2/auth",service="quay.io"`
+CHALLENGE_PARAM = re.compile(r'(\w+)="([^"]*)"')
+
+
+class RegistryError(RuntimeError):
+    """Raised when the registry can't be used by this client"""
+
+
+class ManifestNotFoundError(RuntimeError):
+    """Raised when the registry definitively reports that a manifest doesn't exist"""
+
+
+@dataclass(frozen=True)
+class ImageReference:
+    registry: str
+    repository: str
+    # Tag or digest
+    reference: str
+
+    @staticmethod
+    def parse(image: str) -> "ImageReference":
+        """Parses references like `quay.io/jupyter/base-notebook:latest`
+        or `jupyter/base-notebook@sha256:...`"""
+        name, sep, reference = image.partition("@")
+        if not sep:
+            slash = name.rfind("/")
+            colon = name.rfind(":")
+            if colon > slash:
+                name, reference = name[:colon], name[colon + 1 :]
+            else:
+                reference = "latest"
+        registry, _, repository = name.partition("/")
+        # The first component is a registry only if it looks like a host
+        if not repository or not (
+            "." in registry or ":" in registry or registry == "localhost"
+        ):
+            registry, repository = "docker.io", name
+        if registry == "docker.io":
+            registry = DOCKER_HUB_REGISTRY
+            if "/" not in repository:
+                repository = f"library/{repository}"
+        return ImageReference(registry, repository, reference)
+
+
+def _read_docker_auths() -> dict[str, Any]:
+    docker_config_dir = Path(os.environ.get("DOCKER_CONFIG", Path.home() / ".docker"))
+    config_file = docker_config_dir / "config.json"
+    if not config_file.exists():
+        return {}
+    auths: dict[str, Any] = json.loads(config_file.read_text()).get("auths", {})
+    return auths
+
+
+class RegistryClient:
+    """Small client of the OCI Distribution API.
+
+    All the requests go through one session, so the connections are kept alive and reused.
+    Bearer tokens are cached per registry and scope until they expire.
+    Credentials are read from the `auths` of the docker config,
+    credential helpers are not supported, anonymous access is used instead.
+    Registries on localhost are accessed over plain HTTP.
+    """
+
+    def __init__(self, session: requests.Session | None = None):
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._auths = _read_docker_auths()
+        self._tokens: dict[tuple[str, str], tuple[str, float]] = {}
+        self._tokens_lock = threading.Lock()
+
+    def _base_url(self, registry: str) -> str:
+        host = registry.partition(":")[0]
+        scheme = "http" if host in INSECURE_REGISTRY_HOSTS else "https"
+        return f"{scheme}://{registry}/v2"
+
+    def _basic_auth(self, registry: str) -> tuple[str, str] | None:
+        auth_key = DOCKER_HUB_AUTH_KEY if registry == DOCKER_HUB_REGISTRY else registry
+        auth = self._auths.get(auth_key, {}).get("auth")
+        if auth is None:
+            return None
+        username, _, password = base64.b64decode(auth).decode().partition(":")
+        return username, password
+
+    def _cached_token(self, registry: str, scope: str) -> str | None:
+        with self._tokens_lock:
+            cached = self._tokens.get((registry, scope))
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+
+    def _fetch_token(
+        self, registry: str, challenge: str, scope: str, rejected: str | None
+    ) -> str:
+        """A token cached by another thread is reused, unless the registry rejected it"""
+        params = dict(CHALLENGE_PARAM.findall(challenge))
+        cached = self._cached_token(registry, scope)
+        if cached is not None and cached != rejected:
+            return cached
+
+        LOGGER.info(f"Fetching token for registry: {registry} scope: {scope}")
+        response = self.session.get(
+            params["realm"],
+            params={"service": params.get("service", registry), "scope": scope},
+            auth=self._basic_auth(registry),
+            timeout=REQUEST_TIMEOUT,
+        )
+        if not response.ok:
+            raise RegistryError(
+                f"Failed to get token for registry: {registry}, "
+                f"status: {response.status_code}"
+            )
+        body = response.json()
+        token: str = body.get("token") or body["access_token"]
+        # Refresh the token a bit earlier than it expires
+        expires_at = time.monotonic() + body.get("expires_in", 60) - 10
+        with self._tokens_lock:
+            self._tokens[(registry, scope)] = (token, expires_at)
+        return token
+
+    def _request(
+        self,
+        method: str,
+        image: ImageReference,
+        path: str,
+        *,
+        push: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        url = f"{self._base_url(image.registry)}/{image.repository}/{path}"
+        scope = f"repository:{image.repository}:{'pull,push' if push else 'pull'}"
+        headers = kwargs.pop("headers", {})
+        # A cached token is sent right away, so the registry doesn't need to challenge again
+        token = self._cached_token(image.registry, scope)
+        if token is not None:
+            headers = {**headers, "Authorization": f"Bearer {token}"}
+
+        # The second attempt is done with the credentials requested by the registry
+        for _ in range(2):
+            response = self.session.request(
+                method, url, headers=headers, timeout=REQUEST_TIMEOUT, **kwargs
+            )
+            if response.status_code != 401:
+                return response
+            challenge = response.headers.get("WWW-Authenticate", "")
+            if challenge.lower().startswith("bearer "):
+                token = self._fetch_token(image.registry, challenge, scope, token)
+                headers = {**headers, "Authorization": f"Bearer {token}"}
+            elif challenge.lower().startswith("basic "):
+                kwargs["auth"] = self._basic_auth(image.registry)
+            else:
+                break
+        raise RegistryError(f"Unauthorized request to: {url}")
+
+    def get_digest(self, image: str) -> str:
+        """Digest of the manifest (or the manifest list) the tag points to"""
+        reference = ImageReference.parse(image)
+        response = self._request(
+            "HEAD",
+            reference,
+            f"manifests/{reference.reference}",
+            headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)},
+        )
+        if response.status_code == 404:
+            raise ManifestNotFoundError(
+                f"Manifest for: {image} doesn't exist in the registry"
+            )
+        if not response.ok:
+            raise RegistryError(
+                f"Failed to inspect: {image}, status: {response.status_code}"
+            )
+        digest = response.headers.get("Docker-Content-Digest")
+        if digest is None:
+            raise RegistryError(f"Registry didn't return the digest of: {image}")
+        return digest
+
+    def get_manifest(self, image: str) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Returns the manifest and its descriptor"""
+        reference = ImageReference.parse(image)
+        response = self._request(
+            "GET",
+            reference,
+            f"manifests/{reference.reference}",
+            headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)},
+        )
+        if response.status_code == 404:
+            raise ManifestNotFoundError(
+                f"Manifest for: {image} doesn't exist in the registry"
+            )
+        if not response.ok:
+            raise RegistryError(
+                f"Failed to get manifest: {image}, status: {response.status_code}"
+            )
+        manifest: dict[str, Any] = response.json()
+        descriptor = {
+            "mediaType": manifest.get(
+                "mediaType", response.headers.get("Content-Type", OCI_MANIFEST)
+            ),
+            "digest": response.headers["Docker-Content-Digest"],
+            "size": len(response.content),
+        }
+        return manifest, descriptor
+
+    def _get_platform(self, image: str, manifest: dict[str, Any]) -> dict[str, str]:
+        """The platform of a single image is stored in its config blob"""
+        reference = ImageReference.parse(image)
+        response = self._request(
+            "GET", reference, f"blobs/{manifest['config']['digest']}"
+        )
+        if not response.ok:
+            raise RegistryError(
+                f"Failed to get config of: {image}, status: {response.status_code}"
+            )
+        image_config = response.json()
+        platform = {
+            "architecture": image_config["architecture"],
+            "os": image_config["os"],
+        }
+        if "variant" in image_config:
+            platform["variant"] = image_config["variant"]
+        return platform
+
+    def get_index_descriptors(self, image: str) -> list[dict[str, Any]]:
+        """Descriptors of the platform images of a tag, to be put into a manifest list.
+        The images of a manifest list are taken as is, including the attestations"""
+        manifest, descriptor = self.get_manifest(image)
+        if descriptor["mediaType"] in INDEX_MEDIA_TYPES:
+            descriptors: list[dict[str, Any]] = manifest["manifests"]
+            return descriptors
+        return [{**descriptor, "platform": self._get_platform(image, manifest)}]
+
+    def put_manifest(self, image: str, manifest: str, media_type: str) -> str:
+        reference = ImageReference.parse(image)
+        response = self._request(
+            "PUT",
+            reference,
+            f"manifests/{reference.reference}",
+            push=True,
+            data=manifest.encode(),
+            headers={"Content-Type": media_type},
+        )
+        if not response.ok:
+            raise RegistryError(
+                f"Failed to push manifest: {image}, "
+                f"status: {response.status_code}\n{response.text}"
+            )
+        digest: str = response.headers.get("Docker-Content-Digest", "")
+        LOGGER.info(f"Pushed manifest: {image} with digest: {digest}")
+        return digest
+
+    def create_manifest_list(
+        self,
+        source_images: list[str],
+        target_images: list[str],
+        *,
+        dry_run: bool = False,
+    ) -> tuple[str, str | None]:
+        """Pushes a manifest list of all the platform images of the sources under all the targets,
+        the sources should be in the same repository as the targets.
+        The manifest list is built once, and each target is a cheap manifest PUT.
+        Returns the manifest list and its digest, which is None with `dry_run`"""
+        descriptors: list[dict[str, Any]] = []
+        for source_image in source_images:
+            for descriptor in self.get_index_descriptors(source_image):
+                if descriptor["digest"] not in (d["digest"] for d in descriptors):
+                    descriptors.append(descriptor)
+        docker_media_types = (DOCKER_MANIFEST, DOCKER_MANIFEST_LIST)
+        media_type = (
+            DOCKER_MANIFEST_LIST
+            if all(d["mediaType"] in docker_media_types for d in descriptors)
+            else OCI_INDEX
+        )
+        manifest_list = json.dumps(
+            {"schemaVersion": 2, "mediaType": media_type, "manifests": descriptors},
+            indent=2,
+        )
+        if dry_run:
+            return manifest_list, None
+
+        digests = {
+            self.put_manifest(target_image, manifest_list, media_type)
+            for target_image in target_images
+        }
+        assert len(digests) == 1, f"Manifest list got different digests: {digests}"
+        return manifest_list, digests.pop()
+
+
+@functools.cache
+def get_registry_client() -> RegistryClient:
+    """Client shared by all the threads, so the connections and tokens are reused"""
+    return RegistryClient()
@@ -0,0 +1,99 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import functools
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+TAGGING_DIR = Path(__file__).parent.parent
+DEFAULT_MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+
+@functools.cache
+def get_code_hash() -> str:
+    """Hash of the tagging code, so changing a tagger or a manifest invalidates the cache"""
+    code_hash = hashlib.sha256()
+    for path in sorted(TAGGING_DIR.rglob("*.py")):
+        code_hash.update(str(path.relative_to(TAGGING_DIR)).encode())
+        code_hash.update(path.read_bytes())
+    return code_hash.hexdigest()
+
+
+class ResultsCache:
+    """On-disk cache of the values calculated by running commands in an image.
+
+    Entries are keyed by the image config digest (image ID) and the tagging code hash,
+    so they are reused only for the very same image and code.
+    The least recently used entries are evicted when the cache grows over `max_size` bytes.
+    The cache is disabled when `cache_dir` is None.
+    With `bypass`, nothing is read from the cache, but fresh values are still stored.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None,
+        *,
+        bypass: bool = False,
+        max_size: int = DEFAULT_MAX_CACHE_SIZE,
+    ):
+        self.cache_dir = cache_dir
+        self.bypass = bypass
+        self.max_size = max_size
+
+    def key(self, image_id: str, *parts: str) -> str:
+        if self.cache_dir is None:
+            return ""
+        key_hash = hashlib.sha256()
+        for part in (image_id, get_code_hash(), *parts):
+            key_hash.update(part.encode() + b"\0")
+        return key_hash.hexdigest()
+
+    def load(self, key: str) -> Any | None:
+        if self.cache_dir is None or self.bypass:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        # Concurrent runs share the cache, so an entry may be evicted at any moment
+        try:
+            value = json.loads(path.read_text())
+            # Touching the file marks it as recently used for the eviction
+            os.utime(path)
+        except FileNotFoundError:
+            LOGGER.info(f"Cache miss for key: {key}")
+            return None
+        LOGGER.info(f"Cache hit for key: {key}")
+        return value
+
+    def store(self, key: str, value: Any) -> None:
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.json"
+        # Write and rename, so a concurrent run never reads a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(value))
+        tmp_path.replace(path)
+        LOGGER.info(f"Stored cache entry for key: {key}")
+        self._evict()
+
+    def _evict(self) -> None:
+        assert self.cache_dir is not None
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            # The entry may have been evicted by a concurrent run
+            try:
+                entries.append((path.stat(), path))
+            except FileNotFoundError:
+                continue
+        entries.sort(key=lambda entry: entry[0].st_mtime)
+        total_size = sum(stat.st_size for stat, _ in entries)
+        for stat, path in entries:
+            if total_size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= stat.st_size
+            LOGGER.info(f"Evicted cache entry: {path.name}")
@@ -0,0 +1,110 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import logging
+import threading
+import uuid
+from collections.abc import Iterator
+from typing import Any
+
+from docker.models.containers import Container
+from docker.utils.socket import frames_iter
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ShellSession:
+    """A long-lived shell inside a running container.
+
+    Every command is sent to the same shell over a single attached socket,
+    so running a command doesn't need a new Docker exec.
+    The output of each command is framed by a unique marker line,
+    which also carries the exit code of the command.
+    """
+
+    def __init__(self, container: Container):
+        self.container: Container = container
+        api = container.client.api
+        exec_id = api.exec_create(
+            container.id, ["bash", "--noprofile", "--norc"], stdin=True
+        )["Id"]
+        self._socket: Any = api.exec_start(exec_id, socket=True)
+        self._frames: Iterator[tuple[int, bytes]] = frames_iter(self._socket, tty=False)
+        self._buffer = b""
+        self._lock = threading.Lock()
+        LOGGER.info(f"Shell session started on container: {container.name}")
+
+    def _send(self, data: bytes) -> None:
+        # The socket returned by docker-py is a read-only wrapper around the real one
+        getattr(self._socket, "_sock", self._socket).sendall(data)
+
+    def _read_until_marker(self, marker: bytes) -> tuple[int, bytes]:
+        # The marker is printed on a new line, followed by the exit code
+        start_marker = b"\n" + marker + b" "
+        while True:
+            start = self._buffer.find(start_marker)
+            if start != -1:
+                end = self._buffer.find(b"\n", start + len(start_marker))
+                if end != -1:
+                    output = self._buffer[:start]
+                    exit_code = int(self._buffer[start + len(start_marker) : end])
+                    self._buffer = self._buffer[end + 1 :]
+                    return exit_code, output
+            try:
+                # Both streams are kept, the same way `exec_run` merges them
+                _, data = next(self._frames)
+            except StopIteration:
+                raise RuntimeError(
+                    f"Shell session on container: {self.container.name} "
+                    "ended unexpectedly"
+                ) from None
+            self._buffer += data
+
+    def run(self, cmd: str) -> tuple[int, bytes]:
+        """Runs the command in a subshell and returns its exit code and output"""
+        marker = f"__tagging_{uuid.uuid4().hex}__"
+        # The subshell keeps the session state intact, and `/dev/null` stops
+        # the command from reading the following commands from stdin
+        script = f'( {cmd}\n) </dev/null 2>&1; printf "\\n{marker} %d\\n" "$?"\n'
+        with self._lock:
+            self._send(script.encode())
+            return self._read_until_marker(marker.encode())
+
+    def close(self) -> None:
+        with self._lock:
+            self._socket.close()
+        LOGGER.info(f"Shell session closed on container: {self.container.name}")
+
+
+class ShellSessionPool:
+    """Shell sessions of one container, so commands run from several threads
+    don't wait for each other.
+
+    A new session is only started when all the existing ones are busy,
+    so sequential commands all run in the same shell.
+    """
+
+    def __init__(self, container: Container):
+        self.container: Container = container
+        self._sessions: list[ShellSession] = []
+        self._idle_sessions: list[ShellSession] = []
+        self._lock = threading.Lock()
+
+    def run(self, cmd: str) -> tuple[int, bytes]:
+        with self._lock:
+            session = self._idle_sessions.pop() if self._idle_sessions else None
+        if session is None:
+            session = ShellSession(self.container)
+            with self._lock:
+                self._sessions.append(session)
+        result = session.run(cmd)
+        # A session which failed to run the command is not reused
+        with self._lock:
+            self._idle_sessions.append(session)
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+            self._idle_sessions.clear()
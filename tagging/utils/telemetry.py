@@ -0,0 +1,73 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import dataclasses
+import datetime
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from tagging.utils.buildkit_progress import BuildStep
+from tagging.utils.get_prefix import get_file_prefix_for_platform
+
+LOGGER = logging.getLogger(__name__)
+
+TELEMETRY_PHASES = ("pull", "build", "test", "push")
+
+
+def get_telemetry_path(
+    telemetry_dir: Path,
+    *,
+    platform: str,
+    variant: str,
+    image: str,
+    commit_hash_tag: str,
+) -> Path:
+    file_prefix = get_file_prefix_for_platform(platform=platform, variant=variant)
+    return telemetry_dir / f"{file_prefix}-{image}-{commit_hash_tag}-telemetry.json"
+
+
+def record_telemetry(
+    path: Path,
+    *,
+    image: str,
+    platform: str,
+    variant: str,
+    phases: dict[str, float] | None = None,
+    steps: list[BuildStep] | None = None,
+    sizes: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """Merges the new measurements into the telemetry file of an image build.
+    Phases are `pull`, `build`, `test` and `push`, in seconds,
+    sizes are in bytes: `uncompressed`, `archive_zstd` (the `docker save` output compressed with zstd)
+    and `registry_layers` (the compressed layers in the registry).
+    Each measurement is written by the step which makes it, so the file is updated several times
+    """
+    if path.exists():
+        telemetry: dict[str, Any] = json.loads(path.read_text())
+    else:
+        telemetry = {
+            "image": image,
+            "platform": platform,
+            "variant": variant,
+            "timestamp": datetime.datetime.now(datetime.UTC)
+            .isoformat(timespec="seconds")
+            .replace("+00:00", "Z"),
+            "phases": {},
+            "steps": [],
+            "sizes": {},
+        }
+    for phase, seconds in (phases or {}).items():
+        assert phase in TELEMETRY_PHASES, f"Unknown telemetry phase: {phase}"
+        telemetry["phases"][phase] = round(seconds, 1)
+    if steps is not None:
+        telemetry["steps"] = [dataclasses.asdict(step) for step in steps]
+    telemetry["sizes"].update(sizes or {})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(telemetry, indent=2) + "\n")
+    tmp_path.replace(path)
+    LOGGER.info(f"Telemetry recorded to: {path}")
+    return telemetry
@@ -0,0 +1,68 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import io
+import json
+import logging
+import tarfile
+from pathlib import Path
+
+from docker.models.containers import Container
+
+from tagging.utils.docker_runner import DockerRunner
+
+LOGGER = logging.getLogger(__name__)
+
+PROBE_SCRIPT = Path(__file__).parent / "probe_script.py"
+PROBE_DIR = "tagging-probe"
+PROBE_PARENT_DIR = "/tmp"
+
+
+def _add_file(archive: tarfile.TarFile, name: str, content: bytes) -> None:
+    info = tarfile.TarInfo(f"{PROBE_DIR}/{name}")
+    info.size = len(content)
+    info.mode = 0o644
+    archive.addfile(info, io.BytesIO(content))
+
+
+def _build_probe_archive(cmds: list[str]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        _add_file(archive, "probe.py", PROBE_SCRIPT.read_bytes())
+        _add_file(archive, "commands.json", json.dumps(cmds).encode())
+    return buffer.getvalue()
+
+
+def run_probe(container: Container, cmds: list[str]) -> None:
+    """Runs all the commands in a single exec and remembers their outputs,
+    so `probed_output` can serve them without running anything else"""
+    LOGGER.info(f"Probing container: {container.name} with commands: {cmds}")
+
+    assert container.put_archive(PROBE_PARENT_DIR, _build_probe_archive(cmds))
+    probe_dir = f"{PROBE_PARENT_DIR}/{PROBE_DIR}"
+    output = DockerRunner.exec_cmd(
+        container, f"python {probe_dir}/probe.py {probe_dir}/commands.json"
+    )
+    # The JSON document is printed on the last line
+    results = json.loads(output.splitlines()[-1])
+    # The results are dropped when `DockerRunner` removes the container
+    DockerRunner.probe_results[container.id] = {
+        cmd: (result["exit_code"], result["output"]) for cmd, result in results.items()
+    }
+
+    LOGGER.info(f"Container: {container.name} probed")
+
+
+def probed_output(container: Container, cmd: str) -> str:
+    """Returns the output of the probed command the same way as `DockerRunner.exec_cmd` does.
+    If the command wasn't probed, it is run in the container"""
+    results = DockerRunner.probe_results.get(container.id, {})
+    if cmd not in results:
+        return DockerRunner.exec_cmd(container, cmd)
+
+    exit_code, raw_output = results[cmd]
+    output = raw_output.rstrip()
+    if exit_code != 0:
+        LOGGER.error(f"Probed command: `{cmd}` output:\n{output}")
+        raise AssertionError(f"Command: `{cmd}` failed")
+    LOGGER.debug(f"Probed command: `{cmd}` output:\n{output}")
+    return output
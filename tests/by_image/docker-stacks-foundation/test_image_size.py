@@ -0,0 +1,39 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import logging
+from pathlib import Path
+
+import docker
+import pytest  # type: ignore
+
+from tests.hierarchy.image_size_budgets import (
+    CUDA_IMAGE_SIZE_BUDGETS,
+    IMAGE_SIZE_BUDGETS,
+)
+from tests.utils.image_size import ImageSize, check_image_size
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_image_size(
+    docker_client: docker.DockerClient, image_name: str, request: pytest.FixtureRequest
+) -> None:
+    """The image shouldn't grow much compared to the last published one,
+    and the image and its layers should fit the size budget"""
+    image = docker_client.images.get(image_name)
+    short_image_name = request.config.getoption("--image")
+    env = image.attrs["Config"]["Env"] or []
+    cuda_variant = any(
+        variable.startswith("NVIDIA_VISIBLE_DEVICES=") for variable in env
+    )
+    budgets = CUDA_IMAGE_SIZE_BUDGETS if cuda_variant else IMAGE_SIZE_BUDGETS
+    budget = budgets[short_image_name]
+
+    size_baseline = request.config.getoption("--size-baseline")
+    baseline = (
+        None if size_baseline is None else ImageSize.from_manifest(Path(size_baseline))
+    )
+    report = check_image_size(ImageSize.from_image(image), budget, baseline)
+    for warning in report.warnings:
+        LOGGER.warning(warning)
+    assert not report.errors, "\n".join(report.errors)
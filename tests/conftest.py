@@ -59,6 +59,11 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         required=True,
         help="Short image name",
     )
+    parser.addoption(
+        "--size-baseline",
+        default=None,
+        help="JSON manifest of the last published image, its size is compared with the tested image",
+    )
 
 
 @pytest.fixture(scope="session")
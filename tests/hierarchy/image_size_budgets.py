@@ -0,0 +1,43 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from dataclasses import dataclass
+
+MB = 1000**2
+GB = 1000**3
+
+
+@dataclass(frozen=True)
+class SizeBudget:
+    # Uncompressed size of the image, as reported by `docker image inspect`
+    image: int
+    # The largest layer of the image, including the layers of the parent images
+    layer: int
+
+
+# Every user pays the pull cost of a bigger image,
+# so a budget is only raised together with the change which needs it.
+# The budgets weren't measured: they are rough estimates, so exceeding them is only a warning,
+# while the growth over the last published image (`--size-baseline`) fails the tests.
+# To calibrate a budget, take `image_size_bytes` and the largest of `layers`
+# from the `build_info` of the published JSON manifests of the image and add about 20%.
+IMAGE_SIZE_BUDGETS = {
+    "docker-stacks-foundation": SizeBudget(image=450 * MB, layer=250 * MB),
+    "base-notebook": SizeBudget(image=1300 * MB, layer=700 * MB),
+    "minimal-notebook": SizeBudget(image=2 * GB, layer=700 * MB),
+    "scipy-notebook": SizeBudget(image=5 * GB, layer=3 * GB),
+    "r-notebook": SizeBudget(image=3500 * MB, layer=2 * GB),
+    "julia-notebook": SizeBudget(image=3500 * MB, layer=1500 * MB),
+    "tensorflow-notebook": SizeBudget(image=7 * GB, layer=3 * GB),
+    "pytorch-notebook": SizeBudget(image=7 * GB, layer=3 * GB),
+    "datascience-notebook": SizeBudget(image=8 * GB, layer=3 * GB),
+    "pyspark-notebook": SizeBudget(image=7 * GB, layer=3 * GB),
+    "all-spark-notebook": SizeBudget(image=8 * GB, layer=3 * GB),
+}
+# The CUDA variants install the GPU libraries, they are tested under the same image names
+CUDA_IMAGE_SIZE_BUDGETS = {
+    "tensorflow-notebook": SizeBudget(image=13 * GB, layer=7 * GB),
+    "pytorch-notebook": SizeBudget(image=17 * GB, layer=11 * GB),
+}
+
+# Growth over the last published image, which fails the check, a smaller growth is only logged
+MAX_SIZE_GROWTH = 200 * MB
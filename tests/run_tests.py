@@ -13,10 +13,15 @@ python3 = plumbum.local["python3"]
 LOGGER = logging.getLogger(__name__)
 
 
-def test_image(*, registry: str, owner: str, image: str) -> None:
+def test_image(
+    *, registry: str, owner: str, image: str, size_baseline: str | None = None
+) -> None:
     LOGGER.info(f"Testing image: {image}")
     test_dirs = get_test_dirs(image)
     LOGGER.info(f"Test dirs to be run: {test_dirs}")
+    size_baseline_args = (
+        [] if size_baseline is None else ["--size-baseline", size_baseline]
+    )
     (
         python3[
             "-m",
@@ -32,6 +37,7 @@ def test_image(*, registry: str, owner: str, image: str) -> None:
             owner,
             "--image",
             image,
+            *size_baseline_args,
         ]
         & plumbum.FG
     )
@@ -57,6 +63,10 @@ if __name__ == "__main__":
         required=True,
         help="Short image name",
     )
+    arg_parser.add_argument(
+        "--size-baseline",
+        help="JSON manifest of the last published image, the image size is compared with it",
+    )
     args = arg_parser.parse_args()
 
     test_image(**vars(args))
@@ -0,0 +1,135 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from docker.models.images import Image
+from tabulate import tabulate
+
+from tests.hierarchy.image_size_budgets import MAX_SIZE_GROWTH, SizeBudget
+
+BREAKDOWN_LAYERS_COUNT = 10
+
+
+@dataclass(frozen=True)
+class Layer:
+    created_by: str
+    size: int
+
+
+@dataclass(frozen=True)
+class ImageSize:
+    size: int
+    # Non-empty layers from the bottom one
+    layers: list[Layer]
+
+    @staticmethod
+    def from_image(image: Image) -> "ImageSize":
+        # The history is listed from the top layer, and includes the empty layers
+        return ImageSize(
+            size=image.attrs["Size"],
+            layers=[
+                Layer(created_by=entry["CreatedBy"], size=entry["Size"])
+                for entry in reversed(image.history())
+                if entry["Size"] > 0
+            ],
+        )
+
+    @staticmethod
+    def from_manifest(path: Path) -> "ImageSize":
+        """Reads the size recorded in the build info of a published JSON manifest"""
+        build_info = json.loads(path.read_text())["build_info"]
+        return ImageSize(
+            size=build_info["image_size_bytes"],
+            layers=[Layer(**layer) for layer in build_info.get("layers", [])],
+        )
+
+
+@dataclass
+class SizeReport:
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1000**2:,.1f} MB"
+
+
+def _short_instruction(created_by: str) -> str:
+    instruction = " ".join(created_by.removesuffix("# buildkit").split())
+    return instruction if len(instruction) <= 80 else instruction[:77] + "..."
+
+
+def get_layer_growth(current: ImageSize, baseline: ImageSize) -> list[tuple[str, int]]:
+    """Layers are matched by their instruction, the new ones grow by their whole size"""
+    growth: Counter[str] = Counter()
+    for layer in current.layers:
+        growth[layer.created_by] += layer.size
+    for layer in baseline.layers:
+        growth[layer.created_by] -= layer.size
+    return [
+        (created_by, size)
+        for created_by, size in sorted(
+            growth.items(), key=lambda item: abs(item[1]), reverse=True
+        )
+        if size != 0
+    ]
+
+
+def layers_breakdown(layers: list[tuple[str, int]]) -> str:
+    return tabulate(
+        [
+            [format_size(size), _short_instruction(created_by)]
+            for created_by, size in layers[:BREAKDOWN_LAYERS_COUNT]
+        ],
+        headers=["Size", "Instruction"],
+        tablefmt="plain",
+        disable_numparse=True,
+    )
+
+
+def check_image_size(
+    current: ImageSize, budget: SizeBudget, baseline: ImageSize | None
+) -> SizeReport:
+    # The budgets aren't measured, so only the growth over the last published image fails
+    report = SizeReport()
+    largest_layers = sorted(
+        ((layer.created_by, layer.size) for layer in current.layers),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    if current.size > budget.image:
+        report.warnings.append(
+            f"Image size: {format_size(current.size)} "
+            f"exceeds the budget: {format_size(budget.image)}, the largest layers:\n"
+            f"{layers_breakdown(largest_layers)}"
+        )
+    for created_by, size in largest_layers:
+        if size > budget.layer:
+            report.warnings.append(
+                f"Layer size: {format_size(size)} exceeds the layer budget: "
+                f"{format_size(budget.layer)}, layer: {_short_instruction(created_by)}"
+            )
+
+    if baseline is None:
+        return report
+    growth = current.size - baseline.size
+    message = (
+        f"Image size: {format_size(current.size)}, "
+        f"the last published image: {format_size(baseline.size)}, "
+        f"growth: {format_size(growth)}"
+    )
+    if baseline.layers:
+        message += (
+            f", the layers which changed:\n"
+            f"{layers_breakdown(get_layer_growth(current, baseline))}"
+        )
+    if growth > MAX_SIZE_GROWTH:
+        report.errors.append(
+            f"{message}\nThe growth exceeds: {format_size(MAX_SIZE_GROWTH)}"
+        )
+    elif growth > 0:
+        report.warnings.append(message)
+    return report
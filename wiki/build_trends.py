@@ -0,0 +1,97 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+import logging
+import statistics
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import tabulate
+
+LOGGER = logging.getLogger(__name__)
+
+# The number of the latest months shown in the trend tables
+TREND_MONTHS = 6
+TREND_VARIANT = "default"
+
+
+def format_minutes(seconds: float) -> str:
+    return f"{seconds / 60:.1f} min"
+
+
+def format_gigabytes(size: float) -> str:
+    return f"{size / 10**9:.2f} GB"
+
+
+TREND_METRICS: dict[
+    str, tuple[Callable[[dict[str, Any]], float | None], Callable[[float], str]]
+] = {
+    "Pull time": (lambda telemetry: telemetry["phases"].get("pull"), format_minutes),
+    "Build time": (lambda telemetry: telemetry["phases"].get("build"), format_minutes),
+    "Test time": (lambda telemetry: telemetry["phases"].get("test"), format_minutes),
+    "Image size": (
+        lambda telemetry: telemetry["sizes"].get("uncompressed"),
+        format_gigabytes,
+    ),
+    # CI measures the `docker save` archive, local pushes measure the layers in the registry,
+    # only the former is shown, so the medians are taken over the same kind of value
+    "Compressed image size (zstd)": (
+        lambda telemetry: telemetry["sizes"].get("archive_zstd"),
+        format_gigabytes,
+    ),
+}
+
+
+def update_telemetry_files(wiki_dir: Path, telemetry_dir: Path) -> None:
+    """Telemetry of each build is stored in the monthly telemetry file,
+    keyed by the name of the telemetry file, so the files can be added again"""
+    for telemetry_file in sorted(telemetry_dir.rglob("*-telemetry.json")):
+        telemetry = json.loads(telemetry_file.read_text())
+        year_month = telemetry["timestamp"][:7]
+        monthly_file = wiki_dir / "telemetry" / year_month[:4] / f"{year_month}.json"
+        monthly_telemetry = (
+            json.loads(monthly_file.read_text()) if monthly_file.exists() else {}
+        )
+        monthly_telemetry[telemetry_file.stem] = telemetry
+        monthly_file.parent.mkdir(parents=True, exist_ok=True)
+        monthly_file.write_text(json.dumps(monthly_telemetry, indent=1, sort_keys=True))
+        LOGGER.info(
+            f"Added telemetry: {telemetry_file.name} to: {monthly_file.relative_to(wiki_dir)}"
+        )
+
+
+def generate_trend_tables(wiki_dir: Path) -> str:
+    """Monthly medians of the build times and the sizes of each image and platform"""
+    monthly_files = sorted((wiki_dir / "telemetry").glob("*/*.json"))[-TREND_MONTHS:]
+    if not monthly_files:
+        return ""
+
+    months = [monthly_file.stem for monthly_file in monthly_files]
+    builds: dict[tuple[str, str], dict[str, list[dict[str, Any]]]] = {}
+    for year_month, monthly_file in zip(months, monthly_files):
+        for telemetry in json.loads(monthly_file.read_text()).values():
+            if telemetry["variant"] != TREND_VARIANT:
+                continue
+            key = (telemetry["image"], telemetry["platform"])
+            builds.setdefault(key, {}).setdefault(year_month, []).append(telemetry)
+
+    tables = "\n\n## Build Trends\n"
+    for title, (get_value, format_value) in TREND_METRICS.items():
+        rows = []
+        for (image, platform), monthly_builds in sorted(builds.items()):
+            row = [f"`{image}` ({platform})"]
+            for year_month in months:
+                values = [
+                    value
+                    for telemetry in monthly_builds.get(year_month, [])
+                    if (value := get_value(telemetry)) is not None
+                ]
+                row.append(format_value(statistics.median(values)) if values else "-")
+            rows.append(row)
+        if any(value != "-" for row in rows for value in row[1:]):
+            tables += f"\n### {title}\n\n"
+            tables += tabulate.tabulate(rows, ["Image", *months], tablefmt="github")
+            tables += "\n"
+    LOGGER.info("Generated build trend tables")
+    return tables.rstrip("\n")
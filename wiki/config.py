@@ -12,3 +12,5 @@ class Config:
 
     repository: str
     allow_no_files: bool
+
+    telemetry_dir: Path | None = None
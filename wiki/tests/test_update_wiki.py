@@ -0,0 +1,120 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import datetime
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest  # type: ignore
+
+from wiki import update_wiki as update_wiki_module
+from wiki.update_wiki import (
+    HOME_STATS_FILE,
+    Statistics,
+    YearFiles,
+    YearMonthFile,
+    calculate_monthly_stat,
+    get_monthly_commits,
+    get_monthly_stats,
+)
+
+MONTHLY_PAGE = """\
+# Images built during 2024-02
+
+| Date | Image | Links |
+| - | - | - |
+| `2024-02-10` | `quay.io/jupyter/base-notebook` `x86_64` | [Build manifest](./x86_64-base-notebook) |
+| `2024-02-10` | `quay.io/jupyter/base-notebook` `aarch64` | [Build manifest](./aarch64-base-notebook) |
+| `2024-02-10` | `quay.io/jupyter/scipy-notebook` `x86_64` | [Build manifest](./x86_64-scipy-notebook) |
+| `2024-02-03` | `quay.io/jupyter/base-notebook` `x86_64` | [Build manifest](./x86_64-base-notebook) |
+"""
+
+
+def _timestamp(date: str) -> int:
+    return int(datetime.datetime.fromisoformat(date).timestamp())
+
+
+class FakeGit:
+    """Returns the same `git log` output for any arguments"""
+
+    def __init__(self, commit_dates: list[str]):
+        self.output = "".join(f"{_timestamp(date)}\n" for date in commit_dates)
+
+    def __getitem__(self, args: Any) -> Callable[[], str]:
+        return lambda: self.output
+
+
+@pytest.mark.parametrize(
+    "commit_dates,expected",
+    [
+        ([], {}),
+        (
+            [
+                "2024-02-10T12:00:00+00:00",
+                "2024-02-01T08:00:00+00:00",
+                "2024-01-31T23:59:59+00:00",
+            ],
+            {"2024-02": 2, "2024-01": 1},
+        ),
+        # The months are UTC ones
+        (["2024-02-01T01:00:00+02:00"], {"2024-01": 1}),
+        # A commit exactly at midnight is also counted in the previous month
+        (["2024-02-01T00:00:00+00:00"], {"2024-02": 1, "2024-01": 1}),
+        # A commit below an older one isn't counted in its month,
+        # `git log --since` would stop before it
+        (
+            [
+                "2024-02-10T12:00:00+00:00",
+                "2024-01-20T12:00:00+00:00",
+                "2024-02-05T12:00:00+00:00",
+            ],
+            {"2024-02": 1, "2024-01": 1},
+        ),
+    ],
+)
+def test_monthly_commits(
+    monkeypatch: pytest.MonkeyPatch, commit_dates: list[str], expected: dict[str, int]
+) -> None:
+    monkeypatch.setattr(update_wiki_module, "git", FakeGit(commit_dates))
+    assert get_monthly_commits() == expected
+
+
+def test_calculate_monthly_stat() -> None:
+    assert calculate_monthly_stat(
+        YearMonthFile(month=2, content=MONTHLY_PAGE), "2024-02", {"2024-02": 7}
+    ) == Statistics(builds=2, images=4, commits=7)
+
+
+def test_monthly_stats_index(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    current_year_month = datetime.datetime.now(datetime.UTC).strftime("%Y-%m")
+    current_year, current_month = map(int, current_year_month.split("-"))
+    monthly_commits = {"2024-02": 7, current_year_month: 1}
+    monkeypatch.setattr(
+        update_wiki_module, "get_monthly_commits", lambda: monthly_commits
+    )
+    all_years = [
+        YearFiles(current_year, [YearMonthFile(month=current_month, content="")]),
+        YearFiles(2024, [YearMonthFile(month=2, content=MONTHLY_PAGE)]),
+    ]
+
+    assert get_monthly_stats(tmp_path, all_years) == {
+        current_year_month: Statistics(builds=0, images=0, commits=1),
+        "2024-02": Statistics(builds=2, images=4, commits=7),
+    }
+    index = json.loads((tmp_path / HOME_STATS_FILE).read_text())
+    assert index["2024-02"]["commits_final"]
+    assert not index[current_year_month]["commits_final"]
+
+    # Unchanged months are read from the index, and the commits of the current month are recounted
+    index["2024-02"]["statistics"]["builds"] = 100
+    (tmp_path / HOME_STATS_FILE).write_text(json.dumps(index))
+    monthly_commits = {"2024-02": 8, current_year_month: 2}
+    monthly_stats = get_monthly_stats(tmp_path, all_years)
+    assert monthly_stats["2024-02"] == Statistics(builds=100, images=4, commits=7)
+    assert monthly_stats[current_year_month].commits == 2
+
+    # A changed month is recalculated
+    all_years[1].files[0].content += MONTHLY_PAGE.splitlines()[-1] + "\n"
+    monthly_stats = get_monthly_stats(tmp_path, all_years)
+    assert monthly_stats["2024-02"] == Statistics(builds=3, images=5, commits=8)
@@ -2,7 +2,10 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 import argparse
+import dataclasses
 import datetime
+import hashlib
+import json
 import logging
 import shutil
 import textwrap
@@ -13,6 +16,7 @@ import plumbum
 import tabulate
 from dateutil import relativedelta
 
+from wiki.build_trends import generate_trend_tables, update_telemetry_files
 from wiki.config import Config
 from wiki.manifest_time import get_manifest_timestamp, get_manifest_year_month
 
@@ -20,6 +24,8 @@ git = plumbum.local["git"]
 
 LOGGER = logging.getLogger(__name__)
 THIS_DIR = Path(__file__).parent.resolve()
+# Statistics of each month, stored in the wiki repo, so only the changed months are recalculated
+HOME_STATS_FILE = "home-stats.json"
 
 
 @dataclass
@@ -35,8 +41,35 @@ class Statistics:
     commits: int
 
 
+def get_monthly_commits() -> dict[str, int]:
+    """Walks the first-parent history once and counts the commits of each UTC month.
+    The counts are the same as the ones of
+    `git log --first-parent --since <month>.midnight --until <next month>.midnight`"""
+    git_log = git["log", "--first-parent", "--format=%ct"]()
+    monthly_commits: dict[str, int] = {}
+    # `--since` stops the walk at the first commit older than the date,
+    # so a commit is only counted if no commit above it belongs to an earlier month
+    walk_min_timestamp = None
+    for line in git_log.splitlines():
+        timestamp = int(line)
+        if walk_min_timestamp is None or timestamp < walk_min_timestamp:
+            walk_min_timestamp = timestamp
+        commit_date = datetime.datetime.fromtimestamp(timestamp, datetime.UTC)
+        month_start = commit_date.replace(day=1, hour=0, minute=0, second=0)
+        if walk_min_timestamp >= month_start.timestamp():
+            year_month = f"{month_start:%Y-%m}"
+            monthly_commits[year_month] = monthly_commits.get(year_month, 0) + 1
+        # `--until` includes the commits made exactly at the midnight the next month starts
+        if commit_date == month_start:
+            previous_month_start = month_start - relativedelta.relativedelta(months=1)
+            if walk_min_timestamp >= previous_month_start.timestamp():
+                year_month = f"{previous_month_start:%Y-%m}"
+                monthly_commits[year_month] = monthly_commits.get(year_month, 0) + 1
+    return monthly_commits
+
+
 def calculate_monthly_stat(
-    year_month_file: YearMonthFile, year_month_date: datetime.date
+    year_month_file: YearMonthFile, year_month: str, monthly_commits: dict[str, int]
 ) -> Statistics:
     # Home.md defines `Builds` as "# of times build workflow finished"
     # Every workflow run adds one line per image per platform to the monthly page,
@@ -53,17 +86,7 @@ def calculate_monthly_stat(
     # with a "Build manifest" link to the monthly page
     images = year_month_file.content.count("Build manifest")
 
-    with plumbum.local.env(TZ="UTC"):
-        git_log = git[
-            "log",
-            "--oneline",
-            "--since",
-            f"{year_month_date}.midnight",
-            "--until",
-            f"{year_month_date + relativedelta.relativedelta(months=1)}.midnight",
-            "--first-parent",
-        ]()
-    commits = len(git_log.splitlines())
+    commits = monthly_commits.get(year_month, 0)
     return Statistics(builds=builds, images=images, commits=commits)
 
 
@@ -73,7 +96,49 @@ class YearFiles:
     files: list[YearMonthFile]
 
 
-def generate_home_wiki_tables(repository: str, all_years: list[YearFiles]) -> str:
+def get_monthly_stats(
+    wiki_dir: Path, all_years: list[YearFiles]
+) -> dict[str, Statistics]:
+    """Statistics of the months are loaded from the stats index in the wiki repo.
+    A month is recalculated if its file changed, and its commits are recounted
+    if the month wasn't over when they were counted"""
+    index_file = wiki_dir / HOME_STATS_FILE
+    old_index = json.loads(index_file.read_text()) if index_file.exists() else {}
+    current_year_month = datetime.datetime.now(datetime.UTC).strftime("%Y-%m")
+    monthly_commits = get_monthly_commits()
+
+    index = {}
+    monthly_stats = {}
+    recalculated = 0
+    for year_files in all_years:
+        for year_month_file in year_files.files:
+            year_month = f"{year_files.year}-{year_month_file.month:0>2}"
+            content_hash = hashlib.sha256(year_month_file.content.encode()).hexdigest()
+            entry = old_index.get(year_month)
+            if entry is None or entry["content_hash"] != content_hash:
+                month_stat = calculate_monthly_stat(
+                    year_month_file, year_month, monthly_commits
+                )
+                recalculated += 1
+            else:
+                month_stat = Statistics(**entry["statistics"])
+                if not entry["commits_final"]:
+                    month_stat.commits = monthly_commits.get(year_month, 0)
+            monthly_stats[year_month] = month_stat
+            index[year_month] = {
+                "content_hash": content_hash,
+                "commits_final": year_month < current_year_month,
+                "statistics": dataclasses.asdict(month_stat),
+            }
+
+    index_file.write_text(json.dumps(index, indent=1, sort_keys=True) + "\n")
+    LOGGER.info(f"Recalculated statistics of {recalculated} out of {len(index)} months")
+    return monthly_stats
+
+
+def generate_home_wiki_tables(
+    repository: str, all_years: list[YearFiles], monthly_stats: dict[str, Statistics]
+) -> str:
     tables = ""
 
     GITHUB_COMMITS_URL = (
@@ -92,7 +157,8 @@ def generate_home_wiki_tables(repository: str, all_years: list[YearFiles]) -> st
         for year_month_file in year_files.files:
             month = year_month_file.month
             year_month_date = datetime.date(year=year, month=month, day=1)
-            month_stat = calculate_monthly_stat(year_month_file, year_month_date)
+            year_month = f"{year}-{month:0>2}"
+            month_stat = monthly_stats[year_month]
 
             year_stat.builds += month_stat.builds
             year_stat.images += month_stat.images
@@ -103,7 +169,6 @@ def generate_home_wiki_tables(repository: str, all_years: list[YearFiles]) -> st
                 year_month_date,
                 year_month_date + relativedelta.relativedelta(day=31),
             )
-            year_month = f"{year}-{month:0>2}"
             year_table_rows.append(
                 [
                     f"[`{year_month}`](./{year_month})",
@@ -140,7 +205,9 @@ def write_home_wiki_page(wiki_dir: Path, repository: str) -> None:
                 ],
             )
         )
-    wiki_home_tables = generate_home_wiki_tables(repository, all_years)
+    monthly_stats = get_monthly_stats(wiki_dir, all_years)
+    wiki_home_tables = generate_home_wiki_tables(repository, all_years, monthly_stats)
+    trend_tables = generate_trend_tables(wiki_dir)
 
     wiki_home_content = (THIS_DIR / "Home.md").read_text()
     YEAR_MONTHLY_TABLES = "<!-- YEAR_MONTHLY_TABLES -->"
@@ -150,7 +217,7 @@ def write_home_wiki_page(wiki_dir: Path, repository: str) -> None:
         : wiki_home_content.find(YEAR_MONTHLY_TABLES) + len(YEAR_MONTHLY_TABLES)
     ]
     wiki_home_content = wiki_home_content.format(REPOSITORY=repository)
-    wiki_home_content += wiki_home_tables + "\n"
+    wiki_home_content += trend_tables + wiki_home_tables + "\n"
 
     (wiki_dir / "Home.md").write_text(wiki_home_content)
     LOGGER.info("Updated Home page")
@@ -227,6 +294,8 @@ def update_wiki(config: Config) -> None:
         build_history_line = build_history_line_file.read_text()
         update_monthly_wiki_page(config.wiki_dir, build_history_line)
 
+    if config.telemetry_dir is not None:
+        update_telemetry_files(config.wiki_dir, config.telemetry_dir)
     write_home_wiki_page(config.wiki_dir, config.repository)
     remove_old_manifests(config.wiki_dir)
 
@@ -265,6 +334,11 @@ if __name__ == "__main__":
         action="store_true",
         help="Allow no manifest or history line files",
     )
+    arg_parser.add_argument(
+        "--telemetry-dir",
+        type=Path,
+        help="Directory with build telemetry files",
+    )
     args = arg_parser.parse_args()
 
     config = Config(**vars(args))